@@ -1,17 +1,24 @@
 import copy
 import ipaddress
+import zlib
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Tuple, Set
+import requests
 import selenium
 from entities.DomainName import DomainName
+from entities.SchemeUrl import SchemeUrl
 from entities.Url import Url
 from entities.resolvers.ScriptDependenciesResolver import ScriptDependenciesResolver
 from entities.MainFrameScript import MainFrameScript
 from entities.resolvers.DnsResolver import DnsResolver
 from entities.FirefoxHeadlessWebDriver import FirefoxHeadlessWebDriver
+from entities.HeadlessBrowserPool import HeadlessBrowserPool
+from entities.ResourceBlockingProfile import ResourceBlockingProfile
 from entities.resolvers.IpAsDatabase import IpAsDatabase
 from entities.resolvers.LandingResolver import LandingResolver
+from entities.LandingResultCache import LandingResultCache
+from entities.HstsPreloadList import HstsPreloadList
 from entities.resolvers.results.ASResolverResultForROVPageScraping import ASResolverResultForROVPageScraping
 from entities.resolvers.results.AutonomousSystemResolutionResults import AutonomousSystemResolutionResults
 from entities.resolvers.results.LandingSiteResult import LandingSiteResult
@@ -19,6 +26,9 @@ from entities.resolvers.results.MultipleMailDomainResolvingResult import Multipl
 from entities.resolvers.results.MultipleDnsZoneDependenciesResult import MultipleDnsZoneDependenciesResult
 from entities.resolvers.results.ScriptDependenciesResult import ScriptDependenciesResult
 from entities.resolvers.ROVPageScraper import ROVPageScraper
+from entities.ROVPageCache import ROVPageCache
+from entities.RowPrefixesTable import RowPrefixesTable
+from entities.resolvers.VrpDatabase import VrpDatabase
 from entities.error_log.ErrorLog import ErrorLog
 from entities.error_log.ErrorLogger import ErrorLogger
 from exceptions.AutonomousSystemNotFoundError import AutonomousSystemNotFoundError
@@ -29,6 +39,7 @@ from exceptions.NetworkNotFoundError import NetworkNotFoundError
 from exceptions.NotROVStateTypeError import NotROVStateTypeError
 from exceptions.TableEmptyError import TableEmptyError
 from exceptions.TableNotPresentError import TableNotPresentError
+from static_variables import INPUT_FOLDER_NAME, INPUT_VRP_DATABASE_FILE_NAMES
 from utils import file_utils, requests_utils, list_utils, datetime_utils
 
 
@@ -48,13 +59,16 @@ class ApplicationResolversWrapper:
     execute_script_resolving : bool
         Flag that set if script dependencies should be resolved.
     headless_browser_is_instantiated : bool
-        Boolean that indicates if the headless browser is instantiated in this wrapper object.
-    headless_browser : FirefoxHeadlessWebDriver
-        Instance of the FirefoxHeadlessWebDriver class.
+        Boolean that indicates if the headless browsers are instantiated in this wrapper object.
+    browser_pool : HeadlessBrowserPool
+        Instance of the HeadlessBrowserPool class: the headless browsers used in parallel for script resolving.
     script_resolver : ScriptDependenciesResolver
         Instance of the ScriptDependenciesResolver class.
     rov_page_scraper : ROVPageScraper
         Instance of the ROVPageScraper class.
+    vrp_database : VrpDatabase or None
+        Instance of the VrpDatabase class, if a VRP export is present in the input folder: in that case ROV states are
+        validated offline instead of scraped.
     dns_resolver : DnsResolver
         Instance of the DnsResolver class.
     landing_resolver : LandingResolver
@@ -80,7 +94,7 @@ class ApplicationResolversWrapper:
     total_rov_page_scraper_results : ASResolverResultForROVPageScraping
         Instance of ASResolverResultForROVPageScraping class for ROV page resolving result.
     """
-    def __init__(self, consider_tld: bool, execute_script_resolving: bool, execute_rov_scraping: bool, project_root_directory=Path.cwd(), take_snapshot=True):
+    def __init__(self, consider_tld: bool, execute_script_resolving: bool, execute_rov_scraping: bool, project_root_directory=Path.cwd(), take_snapshot=True, refresh_tsv_database_in_background=False, rov_cache_ttl_seconds=86400, landing_cache_ttl_seconds=86400, refresh_landing_cache=False, skip_hsts_http_probes=False, static_script_parsing=False, headless_browsers=4, blocked_resource_types=ResourceBlockingProfile.DEFAULT_BLOCKED_TYPES, blocked_hosts=()):
         """
         Initialize all components from scratch.
         Here is checked the presence of the geckodriver executable and the presence of the .tsv database.
@@ -105,6 +119,33 @@ class ApplicationResolversWrapper:
         :type project_root_directory: Path
         :param take_snapshot: Flag that sets if the DNS resolver should take temporary snapshots of its execution.
         :type take_snapshot: bool
+        :param refresh_tsv_database_in_background: Flag that sets if an outdated .tsv database should be used while the
+        latest one is downloaded in background (it will be used from the next execution). The download is never in
+        background when there is no .tsv database at all.
+        :type refresh_tsv_database_in_background: bool
+        :param rov_cache_ttl_seconds: The time-to-live (in seconds) of the prefixes tables in the ROV page cache; 0 means
+        that every page is revalidated.
+        :type rov_cache_ttl_seconds: float
+        :param landing_cache_ttl_seconds: The time-to-live (in seconds) of the redirection paths in the landing cache; 0
+        means that every path is revalidated.
+        :type landing_cache_ttl_seconds: float
+        :param refresh_landing_cache: Flag that sets if every site should be probed again, refreshing the landing cache.
+        :type refresh_landing_cache: bool
+        :param skip_hsts_http_probes: Flag that sets if the HTTP landing probes of the sites with a known HSTS policy
+        (HSTS preload list or header received via HTTPS) should be skipped.
+        :type skip_hsts_http_probes: bool
+        :param static_script_parsing: Flag that sets if the scripts of the landing pages should be read from their static
+        HTML when possible, loading only the other pages with a headless browser. Scripts added at runtime by external
+        bundles or loaders are missed by the static HTML.
+        :type static_script_parsing: bool
+        :param headless_browsers: The number of headless browsers that resolve script dependencies in parallel.
+        :type headless_browsers: int
+        :param blocked_resource_types: The types of the resources that the headless browsers don't download (any of
+        'image', 'font', 'media' and 'stylesheet'); documents and scripts are always downloaded.
+        :type blocked_resource_types: Iterable[str]
+        :param blocked_hosts: The host names (e.g. of tracking beacons) whose resources, except documents and scripts,
+        the headless browsers don't download.
+        :type blocked_hosts: Iterable[str]
         """
         self.execute_rov_scraping = execute_rov_scraping
         self.consider_tld = consider_tld
@@ -113,29 +154,69 @@ class ApplicationResolversWrapper:
         # if execute_rov_scraping or execute_script_resolving:
         if execute_script_resolving:
             try:
-                self.headless_browser = FirefoxHeadlessWebDriver(project_root_directory=project_root_directory)
+                blocking_profile = ResourceBlockingProfile(blocked_types=blocked_resource_types, blocked_hosts=blocked_hosts)
+                print(f"> Headless browsers resource blocking profile: {blocking_profile}")
+                self.browser_pool = HeadlessBrowserPool(lambda: FirefoxHeadlessWebDriver(project_root_directory=project_root_directory, blocking_profile=blocking_profile), size=headless_browsers)
             except (FileWithExtensionNotFoundError, selenium.common.exceptions.WebDriverException) as e:
                 print(f"!!! {str(e)} !!!")
                 raise Exception
             self.headless_browser_is_instantiated = True
-        if execute_script_resolving:
-            self.script_resolver = ScriptDependenciesResolver(self.headless_browser)
         if execute_rov_scraping:
             #self.rov_page_scraper = ROVPageScraper(self.headless_browser)
-            self.rov_page_scraper = ROVPageScraper()
+            self.rov_page_scraper = ROVPageScraper(cache=ROVPageCache(project_root_directory=project_root_directory, ttl_seconds=rov_cache_ttl_seconds))
+        self.vrp_database = None
+        if execute_rov_scraping:
+            for filename in INPUT_VRP_DATABASE_FILE_NAMES:
+                try:
+                    file = file_utils.search_for_filename_in_subdirectory(INPUT_FOLDER_NAME, filename, project_root_directory)[0]
+                except FilenameNotFoundError:
+                    continue
+                try:
+                    self.vrp_database = VrpDatabase(str(file))
+                    print(f"> {len(self.vrp_database)} VRPs loaded from {filename}: ROV states are validated offline.")
+                    break
+                except (ValueError, OSError) as e:
+                    print(f"!!! {str(e)} !!! VRP export {filename} is ignored.")
         self.dns_resolver = DnsResolver(self.consider_tld)
-        self.landing_resolver = LandingResolver(self.dns_resolver)
+        hsts_preload_list = None
+        if skip_hsts_http_probes:
+            try:
+                hsts_preload_list = HstsPreloadList.load(project_root_directory=project_root_directory)
+                print(f"> {len(hsts_preload_list)} HSTS preloaded host names loaded.")
+            except (ValueError, OSError) as e:
+                print(f"!!! {str(e)} !!! Only HSTS policies received via HTTPS are considered.")
+        self.landing_resolver = LandingResolver(self.dns_resolver, cache=LandingResultCache(project_root_directory=project_root_directory, ttl_seconds=landing_cache_ttl_seconds), force_refresh=refresh_landing_cache, hsts_preload_list=hsts_preload_list, skip_hsts_http_probes=skip_hsts_http_probes)
+        if execute_script_resolving:
+            if static_script_parsing:
+                # the HTML of the landing pages is downloaded through the connections of the landing probes
+                self.script_resolver = ScriptDependenciesResolver(browser_pool=self.browser_pool, session=self.landing_resolver.session)
+            else:
+                self.script_resolver = ScriptDependenciesResolver(browser_pool=self.browser_pool)
         try:
             self.dns_resolver.cache.load_csv_from_output_folder(take_snapshot=take_snapshot, project_root_directory=project_root_directory)
         except (ValueError, FilenameNotFoundError, OSError) as exc:
             print(f"!!! {str(exc)} !!!")
         tsv_db_is_updated = file_utils.is_tsv_database_updated(project_root_directory=project_root_directory)
+        try:
+            file_utils.search_for_file_type_in_subdirectory(INPUT_FOLDER_NAME, ".tsv", project_root_directory)
+            tsv_db_is_present = True
+        except FileWithExtensionNotFoundError:
+            tsv_db_is_present = False
         if tsv_db_is_updated:
             print("> .tsv database file is up-to-date.")
+        elif refresh_tsv_database_in_background and tsv_db_is_present:
+            print("> Latest .tsv database is downloading in background, current one is used.")
+            requests_utils.refresh_tsv_database_in_background(project_root_directory=project_root_directory)
         else:
             print("> Latest .tsv database (~25 MB) is downloading and extracting... ", end='')
-            requests_utils.download_latest_tsv_database(project_root_directory=project_root_directory)
-            print("DONE.")
+            try:
+                is_modified = requests_utils.download_latest_tsv_database(project_root_directory=project_root_directory)
+            except (requests.exceptions.RequestException, zlib.error, OSError) as e:
+                if not tsv_db_is_present:
+                    raise
+                print(f"!!! {str(e)} !!! Current .tsv database is used.")
+            else:
+                print("DONE." if is_modified else "not modified.")
         try:
             self.ip_as_database = IpAsDatabase(project_root_directory=project_root_directory)
         except (FileWithExtensionNotFoundError, OSError) as e:
@@ -221,7 +302,9 @@ class ApplicationResolversWrapper:
 
         reformat = ASResolverResultForROVPageScraping(self.total_ip_as_db_results)
 
-        if self.execute_rov_scraping:
+        if self.execute_rov_scraping and self.vrp_database is not None:
+            self.total_rov_page_scraper_results = self.do_rov_offline_validation(reformat)
+        elif self.execute_rov_scraping:
             self.total_rov_page_scraper_results = self.do_rov_page_scraping(reformat)
         else:
             self.total_rov_page_scraper_results = reformat
@@ -298,12 +381,14 @@ class ApplicationResolversWrapper:
         This method executes IP-AS resolving. It considers as input the results from DNS resolving (parameter
         dns_results), the landing resolving results (parameter landing_results) and the mail domain resolving (results
         saved in the self object) if flag do_mail_domains is set to True.
+        Every distinct IP address is resolved only once, all together in a single batched lookup, and then the result
+        is associated to every server that resolves to such IP address.
 
         :param dns_results: The DNS resolving result.
         :type dns_results: MultipleDnsZoneDependenciesResult
-        :param landing_results: The DNS resolving result.
+        :param landing_results: The landing resolving result.
         :type landing_results: Dict[Url, LandingSiteResult]
-        :param do_mail_domains: The DNS resolving result.
+        :param do_mail_domains: Flag that sets if the mail domain resolving results should be considered.
         :type do_mail_domains: bool
         :return: The resolving results.
         :rtype: AutonomousSystemResolutionResults
@@ -311,101 +396,78 @@ class ApplicationResolversWrapper:
         print("\n\nSTART IP-AS RESOLVER")
         start_execution_time = datetime.now()
         results = AutonomousSystemResolutionResults()
-        for index_domain, domain in enumerate(dns_results.zone_dependencies_per_domain_name.keys()):
-            print(f"Handling domain[{index_domain+1}/{len(dns_results.zone_dependencies_per_domain_name.keys())}]: {domain}")
-            for index_zone, zone in enumerate(dns_results.zone_dependencies_per_domain_name[domain]):
-                print(f"--> Handling zone[{index_zone+1}/{len(dns_results.zone_dependencies_per_domain_name[domain])}]: {zone.name}")
-                for i, nameserver_path in enumerate(zone.name_servers):
-                    nameserver = nameserver_path.get_qname()
-                    for ip in nameserver_path.get_resolution().values:
-                        try:
-                            entry = self.ip_as_database.resolve_range(ip)
-                        except (AutonomousSystemNotFoundError, ValueError) as e:
-                            results.add_no_as_result(ip, nameserver)
-                            print(f"!!! {str(e)} !!!")
-                            continue
-                        try:
-                            ip_range_tsv, networks = entry.get_network_of_ip(ip)
-                            print(f"----> for {ip.compressed} ({nameserver}) found AS{str(entry.as_number)}: [{entry.start_ip_range.compressed} - {entry.end_ip_range.compressed}]. IP range tsv: {ip_range_tsv.compressed}")
-                            results.add_complete_result(ip, nameserver, entry, ip_range_tsv)
-                        except ValueError as exc:
-                            print(f"----> for {ip.compressed} ({nameserver}) found AS record: [{str(entry)}]")
-                            self.error_logger.add_entry(ErrorLog(exc, ip.compressed, f"Impossible to compute belonging network from AS{str(entry.as_number)} IP range [{entry.start_ip_range.compressed} - {entry.end_ip_range.compressed}]"))
-                            results.add_no_ip_range_tsv_result(ip, nameserver, entry)
-        print()
-        for i, site in enumerate(landing_results.keys()):
-            print(f"Handling site[{i+1}/{len(landing_results.keys())}]: {site}")
-            https_result = landing_results[site].https
-            http_result = landing_results[site].http
-            if https_result is not None:
-                for ip in https_result.a_path.get_resolution().values:
-                    try:
-                        entry = self.ip_as_database.resolve_range(ip)
-                        try:
-                            ip_range_tsv, networks = entry.get_network_of_ip(ip)
-                            print(f"----> for {ip.compressed} [HTTPS] ({https_result.server}) found AS{str(entry.as_number)}: [{entry.start_ip_range.compressed} - {entry.end_ip_range.compressed}]. IP range tsv: {ip_range_tsv.compressed}")
-                            results.add_complete_result(ip, https_result.server, entry, ip_range_tsv)
-                        except ValueError as exc:
-                            print(f"----> for {ip.compressed} [HTTPS] ({https_result.server}) found AS record: [{str(entry)}]")
-                            self.error_logger.add_entry(ErrorLog(exc, ip.exploded, str(exc)))
-                            results.add_no_ip_range_tsv_result(ip, https_result.server, entry)
-                    except AutonomousSystemNotFoundError as e:
-                        self.error_logger.add_entry(ErrorLog(e, ip.exploded, str(e)))
-                        results.add_no_as_result(ip, https_result.server)
-                        print(f"----> for {ip.compressed} [HTTPS] ({https_result.server}) no AS found")
-            else:
-                print(f"--> [HTTPS] didn't land anywhere.")
-            if http_result is not None:
-                for ip in http_result.a_path.get_resolution().values:
-                    try:
-                        entry = self.ip_as_database.resolve_range(ip)
-                        try:
-                            ip_range_tsv, networks = entry.get_network_of_ip(ip)
-                            print(f"----> for {ip.compressed} [HTTP] ({http_result.server}) found AS{str(entry.as_number)}: [{entry.start_ip_range.compressed} - {entry.end_ip_range.compressed}]. IP range tsv: {ip_range_tsv.compressed}")
-                            results.add_complete_result(ip, http_result.server, entry, ip_range_tsv)
-                        except ValueError as exc:
-                            print(f"----> for {ip.compressed} [HTTP] ({http_result.server}) found AS record: [{str(entry)}]")
-                            self.error_logger.add_entry(ErrorLog(exc, ip.exploded, str(exc)))
-                            results.add_no_ip_range_tsv_result(ip, http_result.server, entry)
-                    except AutonomousSystemNotFoundError as e:
-                        self.error_logger.add_entry(ErrorLog(e, ip.exploded, str(e)))
-                        results.add_no_as_result(ip, http_result.server)
-                        print(f"----> for {ip.compressed} [HTTP] ({http_result.server}) no AS found")
-            else:
-                print(f"--> [HTTP] didn't land anywhere.")
+        servers_per_ip = self._extract_servers_per_ip_address(dns_results, landing_results, do_mail_domains)
+        ips = list(servers_per_ip.keys())
+        print(f"Resolving {len(ips)} distinct IP addresses...")
+        entries = self.ip_as_database.resolve_ranges(ips)
+        for i, (ip, entry) in enumerate(zip(ips, entries)):
+            servers = servers_per_ip[ip]
+            servers_string = ', '.join(map(lambda s: s.string, servers))
+            if entry is None:
+                e = AutonomousSystemNotFoundError(ip.exploded)
+                print(f"----> [{i+1}/{len(ips)}] for {ip.compressed} ({servers_string}) no AS found")
+                self.error_logger.add_entry(ErrorLog(e, ip.exploded, str(e)))
+                for server in servers:
+                    results.add_no_as_result(ip, server)
+                continue
+            try:
+                ip_range_tsv, networks = entry.get_network_of_ip(ip)
+                print(f"----> [{i+1}/{len(ips)}] for {ip.compressed} ({servers_string}) found AS{str(entry.as_number)}: [{entry.start_ip_range.compressed} - {entry.end_ip_range.compressed}]. IP range tsv: {ip_range_tsv.compressed}")
+                for server in servers:
+                    results.add_complete_result(ip, server, entry, ip_range_tsv)
+            except ValueError as exc:
+                print(f"----> [{i+1}/{len(ips)}] for {ip.compressed} ({servers_string}) found AS record: [{str(entry)}]")
+                self.error_logger.add_entry(ErrorLog(exc, ip.compressed, f"Impossible to compute belonging network from AS{str(entry.as_number)} IP range [{entry.start_ip_range.compressed} - {entry.end_ip_range.compressed}]"))
+                for server in servers:
+                    results.add_no_ip_range_tsv_result(ip, server, entry)
+        print(f"END IP-AS RESOLVER ({datetime_utils.compute_delta_and_stamp(start_execution_time)})")
+        return results
+
+    def _extract_servers_per_ip_address(self, dns_results: MultipleDnsZoneDependenciesResult, landing_results: Dict[Url, LandingSiteResult], do_mail_domains: bool) -> Dict[ipaddress.IPv4Address, List[DomainName]]:
+        """
+        This method extracts every distinct IP address to be resolved from the name servers of the DNS resolving
+        results, from the web servers of the landing results and (if flag do_mail_domains is set to True) from the mail
+        servers of the mail domain resolving results saved in the self object. Each IP address is associated with the
+        servers that resolve to it, in order of appearance and without duplicates.
+
+        :param dns_results: The DNS resolving result.
+        :type dns_results: MultipleDnsZoneDependenciesResult
+        :param landing_results: The landing resolving result.
+        :type landing_results: Dict[Url, LandingSiteResult]
+        :param do_mail_domains: Flag that sets if the mail domain resolving results should be considered.
+        :type do_mail_domains: bool
+        :return: A dictionary that associates each IP address with its servers.
+        :rtype: Dict[ipaddress.IPv4Address, List[DomainName]]
+        """
+        servers_per_ip = dict()
+
+        def add_a_path(server: DomainName, a_path) -> None:
+            for ip in a_path.get_resolution().values:
+                try:
+                    servers = servers_per_ip[ip]
+                except KeyError:
+                    servers = list()
+                    servers_per_ip[ip] = servers
+                list_utils.append_with_no_duplicates(servers, server)
+
+        for domain in dns_results.zone_dependencies_per_domain_name.keys():
+            for zone in dns_results.zone_dependencies_per_domain_name[domain]:
+                for nameserver_path in zone.name_servers:
+                    add_a_path(nameserver_path.get_qname(), nameserver_path)
+        for site in landing_results.keys():
+            for scheme_result in (landing_results[site].https, landing_results[site].http):
+                if scheme_result is not None:
+                    add_a_path(scheme_result.server, scheme_result.a_path)
         if do_mail_domains:
-            print()
-            for i, mail_domain in enumerate(self.mail_domains_results.dependencies.keys()):
-                print(f"Handling mail_domain[{i+1}/{len(self.mail_domains_results.dependencies.keys())}]: {mail_domain}")
+            for mail_domain in self.mail_domains_results.dependencies.keys():
                 mail_domain_results = self.mail_domains_results.dependencies[mail_domain]
                 if mail_domain_results is not None:
                     for mail_server in mail_domain_results.mail_servers_paths.keys():
                         if mail_domain_results.mail_servers_paths[mail_server] is None:
                             print(f"No access path for mail server: {mail_server}")
                         else:
-                            for ip in mail_domain_results.mail_servers_paths[mail_server].get_resolution().values:
-                                try:
-                                    entry = self.ip_as_database.resolve_range(ip)
-                                except (AutonomousSystemNotFoundError, ValueError) as e:
-                                    results.add_no_as_result(ip, mail_server)
-                                    print(f"!!! {str(e)} !!!")
-                                    continue
-                                try:
-                                    ip_range_tsv, networks = entry.get_network_of_ip(ip)
-                                    print(
-                                        f"----> for {ip.compressed} ({mail_server}) found AS{str(entry.as_number)}: [{entry.start_ip_range.compressed} - {entry.end_ip_range.compressed}]. IP range tsv: {ip_range_tsv.compressed}")
-                                    results.add_complete_result(ip, mail_server, entry, ip_range_tsv)
-                                except ValueError as exc:
-                                    print(f"----> for {ip.compressed} ({mail_server}) found AS record: [{str(entry)}]")
-                                    self.error_logger.add_entry(ErrorLog(exc, ip.compressed,
-                                                                         f"Impossible to compute belonging network from AS{str(entry.as_number)} IP range [{entry.start_ip_range.compressed} - {entry.end_ip_range.compressed}]"))
-                                    results.add_no_ip_range_tsv_result(ip, mail_server, entry)
-                else:
-                    pass
-        else:
-            pass
-        print(f"END IP-AS RESOLVER ({datetime_utils.compute_delta_and_stamp(start_execution_time)})")
-        return results
+                            add_a_path(mail_server, mail_domain_results.mail_servers_paths[mail_server])
+        return servers_per_ip
 
     def do_set_None_for_script_dependencies_resolving(self) -> Dict[Url, ScriptDependenciesResult]:
         """
@@ -423,51 +485,71 @@ class ApplicationResolversWrapper:
     def do_script_dependencies_resolving(self) -> Dict[Url, ScriptDependenciesResult]:
         """
         This method executes web sites script dependencies resolving.
-        It takes the landing web site resolution results saved in this object.
+        It takes the landing web site resolution results saved in this object. Many results (the HTTPS and HTTP
+        schemes of a web site, or different web sites) often land on the same page: every distinct landing URL is
+        loaded only once, then its scripts are associated with all the web sites and schemes that land on it. The
+        distinct landing URLs whose scripts can't be read from their static HTML are dispatched across the headless
+        browsers of the pool, that load them in parallel.
 
         :return: The resolving results.
         :rtype: Dict[Url, ScriptDependenciesResult]
         """
         print("\n\nSTART SCRIPT DEPENDENCIES RESOLVER")
         start_execution_time = datetime.now()
+        landing_urls = self._extract_distinct_landing_urls(self.landing_web_sites_results)
+        scripts_per_landing_url = dict()
+        search_results = self.script_resolver.search_multiple_script_application_dependencies(list(landing_urls.values()))
+        for j, (landing_url, scripts, error) in enumerate(search_results):
+            print(f"Script dependencies of landing page[{j+1}/{len(landing_urls.keys())}]: {landing_url}")
+            if error is None:
+                for i, script in enumerate(scripts):
+                    print(f"script[{i + 1}/{len(scripts)}]: integrity={script.integrity}, src={script.src}")
+            else:
+                print(f"!!! {str(error)} !!!")
+                self.error_logger.add_entry(ErrorLog(error, landing_url.string, str(error)))
+            scripts_per_landing_url[landing_url.string] = scripts
+            print('')
         script_dependencies_result = dict()
-        for j, website in enumerate(self.landing_web_sites_results.keys()):
-            print(f"Searching script dependencies for website[{j+1}/{len(self.landing_web_sites_results.keys())}]: {website}")
+        for website in self.landing_web_sites_results.keys():
             https_result = self.landing_web_sites_results[website].https
             http_result = self.landing_web_sites_results[website].http
-
-            print(f"******* via HTTPS *******")
-            if https_result is None:
-                print(f"--> No landing possible")
-                https_scripts = None
-            else:
-                try:
-                    https_scripts = self.script_resolver.search_script_application_dependencies(https_result.url)
-                    for i, script in enumerate(https_scripts):
-                        print(f"script[{i + 1}/{len(https_scripts)}]: integrity={script.integrity}, src={script.src}")
-                    script_dependencies_result[website] = ScriptDependenciesResult(https_scripts, None)
-                except selenium.common.exceptions.WebDriverException as e:
-                    print(f"!!! {str(e)} !!!")
-                    https_scripts = None
-                    self.error_logger.add_entry(ErrorLog(e, https_result.url.string, str(e)))
-            print(f"******* via HTTP *******")
-            if http_result is None:
-                print(f"--> No landing possible")
-                http_scripts = None
-            else:
-                try:
-                    http_scripts = self.script_resolver.search_script_application_dependencies(http_result.url)
-                    for i, script in enumerate(http_scripts):
-                        print(f"script[{i+1}/{len(http_scripts)}]: integrity={script.integrity}, src={script.src}")
-                except selenium.common.exceptions.WebDriverException as e:
-                    print(f"!!! {str(e)} !!!")
-                    http_scripts = None
-                    self.error_logger.add_entry(ErrorLog(e, http_result.url.string, str(e)))
+            https_scripts = scripts_per_landing_url[https_result.url.string] if https_result is not None else None
+            http_scripts = scripts_per_landing_url[http_result.url.string] if http_result is not None else None
             script_dependencies_result[website] = ScriptDependenciesResult(https_scripts, http_scripts)
-            print('')
         print(f"END SCRIPT DEPENDENCIES RESOLVER ({datetime_utils.compute_delta_and_stamp(start_execution_time)})")
         return script_dependencies_result
 
+    def do_rov_offline_validation(self, reformat: ASResolverResultForROVPageScraping) -> ASResolverResultForROVPageScraping:
+        """
+        This method validates offline (RFC 6811), with the VRP export, the routes of the IpAsDatabase resolution results
+        (reformatted): the IP range of the .tsv database as prefix and the Autonomous System as origin. All the routes
+        are validated in one vectorized pass. The rows have the span of the prefix and the number of covering VRPs as
+        ROAS; the visibility is not known offline, so it is 0.
+
+        :param reformat: A ASResolverResultForROVPageScraping object.
+        :type reformat: ASResolverResultForROVPageScraping
+        :return: The ASResolverResultForROVPageScraping parameter object updated with new data.
+        :rtype: ASResolverResultForROVPageScraping
+        """
+        print("\n\nSTART ROV OFFLINE VALIDATION")
+        start_execution_time = datetime.now()
+        values = list()
+        for as_number in reformat.results.keys():
+            for ip_address in reformat.results[as_number].keys():
+                value = reformat.results[as_number][ip_address]
+                if value.ip_range_tsv is None:
+                    value.insert_rov_entry(None)
+                else:
+                    values.append((as_number, ip_address, value))
+        results = self.vrp_database.validate(list(map(lambda t: t[2].ip_range_tsv, values)), list(map(lambda t: t[0], values)))
+        for (as_number, ip_address, value), (rov_state, covering_vrps) in zip(values, results):
+            country_code = value.entry_as_database.country_code if len(value.entry_as_database.country_code) == 2 else 'ZZ'
+            row = RowPrefixesTable.from_values(as_number, value.ip_range_tsv, value.ip_range_tsv.num_addresses, country_code, 0, rov_state, str(covering_vrps))
+            value.insert_rov_entry(row)
+            print(f"--> for {ip_address}: ({value.server}) found row: {str(row)}")
+        print(f"END ROV OFFLINE VALIDATION ({datetime_utils.compute_delta_and_stamp(start_execution_time)})")
+        return reformat
+
     def do_rov_page_scraping(self, reformat: ASResolverResultForROVPageScraping) -> ASResolverResultForROVPageScraping:
         """
         This method executes the ROVPage scraping from the IpAsDatabase resolution results (reformatted).
@@ -479,11 +561,12 @@ class ApplicationResolversWrapper:
         """
         print("\n\nSTART ROV PAGE SCRAPING")
         start_execution_time = datetime.now()
+        self.rov_page_scraper.prefetch_as_pages(reformat.results.keys())
         for i, as_number in enumerate(reformat.results.keys()):
             print(f"Loading page [{i+1}/{len(reformat.results.keys())}] for AS{as_number}")
             try:
                 self.rov_page_scraper.load_as_page(as_number)
-            except (selenium.common.exceptions.WebDriverException, selenium.common.exceptions.TimeoutException) as exc:
+            except (selenium.common.exceptions.WebDriverException, selenium.common.exceptions.TimeoutException, requests.exceptions.RequestException) as exc:
                 print(f"!!! {str(exc)} !!!")
                 for ip_address in reformat.results[as_number].keys():
                     reformat.results[as_number][ip_address].insert_rov_entry(None)
@@ -498,7 +581,7 @@ class ApplicationResolversWrapper:
             for ip_address in reformat.results[as_number].keys():
                 server = reformat.results[as_number][ip_address].server
                 try:
-                    row = self.rov_page_scraper.get_network_if_present(ipaddress.ip_address(ip_address))  # non gestisco ValueError perché non può accadere qua
+                    row = self.rov_page_scraper.get_network_if_present(ipaddress.ip_address(ip_address), as_number)  # non gestisco ValueError perché non può accadere qua
                     reformat.results[as_number][ip_address].insert_rov_entry(row)
                     print(f"--> for {ip_address}: ({server}) found row: {str(row)}")
                 except (TableNotPresentError, TableEmptyError, NetworkNotFoundError) as exc:
@@ -548,6 +631,24 @@ class ApplicationResolversWrapper:
                             domain_names.add(dn)
         return list(domain_names)
 
+    @staticmethod
+    def _extract_distinct_landing_urls(landing_results: Dict[Url, LandingSiteResult]) -> Dict[str, SchemeUrl]:
+        """
+        This method extracts the distinct landing URLs of landing results (every scheme of every site), in order of
+        appearance.
+
+        :param landing_results: The landing resolving result.
+        :type landing_results: Dict[Url, LandingSiteResult]
+        :return: A dictionary that associates the string of each distinct landing URL with the URL.
+        :rtype: Dict[str, SchemeUrl]
+        """
+        landing_urls = dict()
+        for site in landing_results.keys():
+            for scheme_result in (landing_results[site].https, landing_results[site].http):
+                if scheme_result is not None and scheme_result.url.string not in landing_urls:
+                    landing_urls[scheme_result.url.string] = scheme_result.url
+        return landing_urls
+
     def _extract_domain_names_from_landing_script_sites_results(self) -> List[DomainName]:
         """
         This method extracts domain names from the landing script site resolution results (saved in this object state).
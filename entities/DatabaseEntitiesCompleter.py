@@ -1,11 +1,13 @@
 import ipaddress
 from datetime import datetime
 from typing import List, Set, Tuple, Union
+import requests
 import selenium
 from entities.ApplicationResolversWrapper import ApplicationResolversWrapper
 from entities.DomainName import DomainName
 from entities.Url import Url
 from entities.EntryIpAsDatabase import EntryIpAsDatabase
+from entities.RowPrefixesTable import RowPrefixesTable
 from entities.resolvers.results.ASResolverResultForROVPageScraping import ASResolverResultForROVPageScraping
 from entities.resolvers.results.AutonomousSystemResolutionResults import AutonomousSystemResolutionResults
 from exceptions.AutonomousSystemNotFoundError import AutonomousSystemNotFoundError
@@ -22,7 +24,7 @@ from persistence import helper_autonomous_system, helper_ip_range_tsv, helper_ip
     helper_script_site, helper_paths, helper_network_numbers, helper_rov, helper_prefixes_table, \
     helper_script_hosted_on, helper_application_results
 from persistence.BaseModel import IpAddressDependsAssociation, WebSiteLandsAssociation, ScriptWithdrawAssociation, \
-    ScriptSiteLandsAssociation, MailDomainComposedAssociation, AccessAssociation, db, ScriptSiteEntity
+    ScriptSiteLandsAssociation, MailDomainComposedAssociation, AccessAssociation, db, ScriptSiteEntity, AutonomousSystemEntity
 from utils import datetime_utils, string_utils
 
 
@@ -307,7 +309,8 @@ class DatabaseEntitiesCompleter:
 
     def do_complete_unresolved_ip_address_depends_association(self, iadas: List[IpAddressDependsAssociation]) -> int:
         """
-        Method that tries to complete unresolved IpAddressDependsAssociation entities.
+        Method that tries to complete unresolved IpAddressDependsAssociation entities. The ROV states come from the
+        same source of the main execution: the VRP export if loaded (offline validation), otherwise the ROV pages.
 
         :param iadas: List of IpAddressDependsAssociation entities.
         :type iadas: List[IpAddressDependsAssociation]
@@ -363,33 +366,60 @@ class DatabaseEntitiesCompleter:
                 ip_address_depends_dict[ip_address] = iada
         with db.atomic():
             reformat = ASResolverResultForROVPageScraping(results)
+            if self.resolvers_wrapper.vrp_database is not None:
+                # same source of ROV states as the main execution
+                self.resolvers_wrapper.do_rov_offline_validation(reformat)
+                for as_number in reformat.results.keys():
+                    for ip_address in reformat.results[as_number].keys():
+                        row = reformat.results[as_number][ip_address].entry_rov_page
+                        if row is None:
+                            print(f"--> for {ip_address} no row found..")
+                            continue
+                        self.__insert_rov_row__(row, ase_dict[as_number], ip_address_depends_dict[ip_address])
+                        resolved = resolved + 1
+                print(f"END UNRESOLVED IP ADDRESS DEPENDENCIES RESOLUTION")
+                return resolved
+            self.resolvers_wrapper.rov_page_scraper.prefetch_as_pages(reformat.results.keys())
             for i, as_number in enumerate(reformat.results.keys()):
                 print(f"Loading page [{i + 1}/{len(reformat.results.keys())}] for AS{as_number}")
                 try:
                     self.resolvers_wrapper.rov_page_scraper.load_as_page(as_number)
-                except (selenium.common.exceptions.WebDriverException, TableNotPresentError, TableEmptyError,
-                        NetworkNotFoundError, NotROVStateTypeError):
+                except (selenium.common.exceptions.WebDriverException, requests.exceptions.RequestException,
+                        TableNotPresentError, TableEmptyError, NetworkNotFoundError, NotROVStateTypeError, ValueError):
                     print(f"Can't load AS{as_number} page..")
                     continue
                 for ip_address in reformat.results[as_number].keys():
                     try:
-                        row = self.resolvers_wrapper.rov_page_scraper.get_network_if_present(ip_address)
+                        row = self.resolvers_wrapper.rov_page_scraper.get_network_if_present(ip_address, as_number)
                     except (selenium.common.exceptions.WebDriverException, TableNotPresentError, TableEmptyError, NetworkNotFoundError):
                         print(f"--> for {ip_address} no row found..")
                         continue
                     print(f"--> for {ip_address}: found row: {str(row)}")
-                    irre = helper_ip_range_rov.insert(row.prefix)
-                    re = helper_rov.insert(row)
-                    ase = ase_dict[as_number]
-                    helper_prefixes_table.insert(irre, re, ase)
-                    q = IpAddressDependsAssociation\
-                        .update(ip_range_tsv=ip_address_depends_dict[ip_address].ip_range_tsv, ip_range_rov=irre)\
-                        .where(IpAddressDependsAssociation.ip_address == ip_address_depends_dict[ip_address].ip_address)
-                    q.execute()
+                    self.__insert_rov_row__(row, ase_dict[as_number], ip_address_depends_dict[ip_address])
                     resolved = resolved + 1
             print(f"END UNRESOLVED IP ADDRESS DEPENDENCIES RESOLUTION")
             return resolved
 
+    def __insert_rov_row__(self, row: RowPrefixesTable, ase: AutonomousSystemEntity, iada: IpAddressDependsAssociation) -> None:
+        """
+        Method that inserts a row of the prefixes table (scraped or validated offline) and completes the IP address
+        dependency with it.
+
+        :param row: The row of the prefixes table.
+        :type row: RowPrefixesTable
+        :param ase: The Autonomous System entity.
+        :type ase: AutonomousSystemEntity
+        :param iada: The IP address dependency to complete.
+        :type iada: IpAddressDependsAssociation
+        """
+        irre = helper_ip_range_rov.insert(row.prefix)
+        re = helper_rov.insert(row)
+        helper_prefixes_table.insert(irre, re, ase)
+        q = IpAddressDependsAssociation\
+            .update(ip_range_tsv=iada.ip_range_tsv, ip_range_rov=irre)\
+            .where(IpAddressDependsAssociation.ip_address == iada.ip_address)
+        q.execute()
+
     def __do_tsv_database_resolving__(self, ip_address: ipaddress.IPv4Address) -> Tuple[EntryIpAsDatabase, ipaddress.IPv4Network]:
         """
         Method that performs the .tsv database resolving in a 'compact' way, without any prints and handling all
@@ -1,32 +1,134 @@
-from typing import List
-from utils import domain_name_utils, string_utils
-from utils.domain_name_utils import eliminate_trailing_point
+import weakref
+from typing import List, Tuple
+from utils import domain_name_utils
 
 
 class DomainName:
     """
     Class that represents a domain name with some helpful functionalities.
+    Objects are interned: instantiating a DomainName returns the one canonical object associated with the standardized
+    version of the input string, so two equal domain names are always the same object. Everything that depends only on
+    the standardized string (labels, subdomains, hash) is computed only once. The interning table holds weak references,
+    so a domain name no longer used anywhere is garbage collected. Since an object is shared by all its holders, any
+    attribute assignment or deletion raises AttributeError.
 
     ...
 
     Attributes
     ----------
-    input_string : str
-        The string used as input when instancing the object.
     string : str
         The standardized version of the input string. Standardized (for the application project) means 2 things:
             - every char is rendered lowercase
             - a trailing point is inserted (if it is not present)
+    labels : Tuple[str]
+        The labels of the domain name (after the '@' character, if present) from the leftmost to the rightmost.
     """
-    def __init__(self, string: str):
+    __slots__ = ('string', '_is_tld_', '_labels_', '_ancestors_', '__weakref__')
+    _interned: 'weakref.WeakValueDictionary[str, DomainName]' = weakref.WeakValueDictionary()
+
+    def __new__(cls, string: str):
         """
-        Instantiate the object.
+        Returns the canonical object associated with the standardized version of the input string, instantiating it if
+        it is the first time that such domain name is encountered.
 
         :param string: The input string.
         :type string: str
+        :return: The canonical DomainName object.
+        :rtype: DomainName
+        """
+        if isinstance(string, DomainName):
+            return string
+        standardized = domain_name_utils.canonicalize(string)
+        try:
+            return cls._interned[standardized]
+        except KeyError:
+            obj = super().__new__(cls)
+            object.__setattr__(obj, 'string', standardized)
+            object.__setattr__(obj, '_is_tld_', domain_name_utils.is_tld(standardized))
+            object.__setattr__(obj, '_labels_', None)
+            object.__setattr__(obj, '_ancestors_', None)
+            return cls._interned.setdefault(standardized, obj)
+
+    def __setattr__(self, name: str, value) -> None:
+        """
+        Interned objects are immutable: every assignment raises.
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"DomainName objects are immutable: can't set attribute '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        """
+        Interned objects are immutable: every deletion raises.
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"DomainName objects are immutable: can't delete attribute '{name}'")
+
+    @property
+    def labels(self) -> Tuple[str]:
+        """
+        The labels of the domain name (after the '@' character, if present) from the leftmost to the rightmost. They are
+        computed only once.
+
+        :return: The labels.
+        :rtype: Tuple[str]
+        """
+        if self._labels_ is None:
+            to_be_elaborated = self.string.split('@')[-1]
+            if to_be_elaborated == '.':
+                labels = tuple()
+            else:
+                labels = tuple(to_be_elaborated.split('.')[0:-1])
+            object.__setattr__(self, '_labels_', labels)
+        return self._labels_
+
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        """
+        Pickle support: the object is re-interned when loaded.
+
+        :return: The class and the standardized string.
+        :rtype: Tuple[type, Tuple[str]]
         """
-        self.input_string = string
-        self.string = domain_name_utils.standardize_for_application(string)
+        return DomainName, (self.string,)
+
+    def __copy__(self) -> 'DomainName':
+        """
+        Interned objects are never copied.
+
+        :return: The self object.
+        :rtype: DomainName
+        """
+        return self
+
+    def __deepcopy__(self, memo) -> 'DomainName':
+        """
+        Interned objects are never copied.
+
+        :return: The self object.
+        :rtype: DomainName
+        """
+        return self
+
+    def _compute_ancestors(self) -> Tuple['DomainName']:
+        """
+        Auxiliary method that computes (once) every domain name from the root to the domain name after the '@'
+        character (if present) of the self object, in this order.
+
+        :return: The tuple of domain names.
+        :rtype: Tuple[DomainName]
+        """
+        if self._ancestors_ is None:
+            ancestors = [DomainName('.')]
+            current_domain = '.'
+            for i, label in enumerate(reversed(self.labels)):
+                if i == 0:
+                    current_domain = label + '.'
+                else:
+                    current_domain = label + '.' + current_domain
+                ancestors.append(DomainName(current_domain))
+            object.__setattr__(self, '_ancestors_', tuple(ancestors))
+        return self._ancestors_
 
     def parse_subdomains(self, root_included: bool, tld_included: bool, self_included: bool) -> List['DomainName']:
         """
@@ -42,34 +144,18 @@ class DomainName:
         :return: The list of sub-domain names
         :rtype: List[DomainName]
         """
-        if '@' in self.string:
-            split = self.string.split('@')
-            to_be_elaborated = split[-1]
-        else:
-            to_be_elaborated = self.string
         # limit case
         if root_included and self_included and self.string == '.':
             return [self]
-        list_split = to_be_elaborated.split(".")
-        to_be_elaborated = DomainName(to_be_elaborated)
-        list_split.pop(len(list_split) - 1)
-        subdomains = list()
-        current_domain = "."
-        subdomains.append(DomainName(current_domain))
-        is_first = True
-        for el in reversed(list_split):
-            if is_first:
-                current_domain = el + "."
-                is_first = False
-            else:
-                current_domain = el + "." + current_domain
-            subdomains.append(DomainName(current_domain))
-        if not root_included:
-            subdomains.pop(0)
+        ancestors = self._compute_ancestors()
+        if root_included:
+            subdomains = list(ancestors)
+        else:
+            subdomains = list(ancestors[1:])
         if not tld_included:
-            subdomains = list(filter(lambda dn: not dn.is_tld(), subdomains))
-        if not self_included:
-            subdomains.remove(to_be_elaborated)
+            subdomains = [dn for dn in subdomains if not dn.is_tld()]
+        if not self_included and ancestors[-1] in subdomains:
+            subdomains.remove(ancestors[-1])
         return subdomains
 
     def construct_http_url(self, as_https: bool) -> str:
@@ -81,7 +167,7 @@ class DomainName:
         :return: The URL string.
         :rtype: str
         """
-        temp = eliminate_trailing_point(self.string)
+        temp = self.string[:-1]
         if temp.startswith("www."):
             if as_https:
                 return "https://" + temp + "/"
@@ -110,21 +196,7 @@ class DomainName:
         :return: True or False.
         :rtype: bool
         """
-        if self.string == '.':
-            return True
-        point_count = self.string.count('.')
-        if point_count == 0:
-            return True
-        elif point_count == 1:
-            split_domain_name = self.string.split('.')
-            if split_domain_name[0] != '' and split_domain_name[1] == '':
-                return True
-            elif split_domain_name[0] == '' and split_domain_name[1] != '':
-                return True
-            else:
-                return False
-        else:
-            return False
+        return self._is_tld_
 
     def __str__(self) -> str:
         """
@@ -144,9 +216,9 @@ class DomainName:
         :rtype: bool
         """
         if isinstance(other, DomainName):
-            return string_utils.equals_ignore_case(eliminate_trailing_point(self.string), eliminate_trailing_point(other.string))
+            return self is other
         elif isinstance(other, str):
-            return string_utils.equals_ignore_case(eliminate_trailing_point(self.string), eliminate_trailing_point(other))
+            return self.string[:-1] == domain_name_utils.eliminate_trailing_point(other.casefold())
         else:
             return False
 
@@ -171,7 +243,7 @@ class DomainName:
     def __hash__(self) -> int:
         """
         This method returns the hash of this object. Should be defined alongside the __eq__ method with the same
-        returning value from 2 objects.
+        returning value from 2 objects. It is the hash of the standardized string, which the string object caches.
 
         :return: Hash of this object.
         :rtype: int
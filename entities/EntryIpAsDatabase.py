@@ -1,10 +1,13 @@
+import bisect
 import ipaddress
 from typing import List, Tuple
 
 
 class EntryIpAsDatabase:
     """
-    This class represent an entry in the database as describe in https://iptoasn.com/g.
+    This class represent an entry in the database as describe in https://iptoasn.com/g. The range and AS number of an
+    entry can't be modified once it is built, since they are hashed at that time. The CIDR decomposition of the range is
+    computed at the first request and kept ordered, so the network of an IP address is found with a binary search.
 
     ...
 
@@ -21,6 +24,8 @@ class EntryIpAsDatabase:
     as_description : str
         Should be the Autonomous System brief description.
     """
+    __slots__ = ('start_ip_range', 'end_ip_range', 'as_number', 'country_code', 'as_description', '_hash_', '_networks_', '_network_starts_')
+
     def __init__(self, entries_inline: List[str]):
         """
         Instantiate a EntryIpAsDatabase object from a list of string follow format described in
@@ -43,41 +48,95 @@ class EntryIpAsDatabase:
 
         try:
             tmp = ipaddress.IPv4Address(string_start_ip_range)
-            self.start_ip_range = tmp
+            object.__setattr__(self, 'start_ip_range', tmp)
         except ValueError:
             raise
         try:
             tmp = ipaddress.IPv4Address(string_end_ip_range)
-            self.end_ip_range = tmp
+            object.__setattr__(self, 'end_ip_range', tmp)
         except ValueError:
             raise
         try:
             tmp = int(string_as_number)
-            self.as_number = tmp
+            object.__setattr__(self, 'as_number', tmp)
         except ValueError:
             raise
-        self.country_code = string_country_code
-        self.as_description = string_as_description
+        object.__setattr__(self, 'country_code', string_country_code)
+        object.__setattr__(self, 'as_description', string_as_description)
+        object.__setattr__(self, '_networks_', None)
+        object.__setattr__(self, '_network_starts_', None)
+        object.__setattr__(self, '_hash_', hash((self.as_number, self.start_ip_range, self.end_ip_range)))
+
+    @staticmethod
+    def from_values(start_ip_range: ipaddress.IPv4Address, end_ip_range: ipaddress.IPv4Address, as_number: int, country_code: str, as_description: str) -> 'EntryIpAsDatabase':
+        """
+        Static method that instantiates a EntryIpAsDatabase object from already parsed values.
+
+        :param start_ip_range: The start of the ip range.
+        :type start_ip_range: ipaddress.IPv4Address
+        :param end_ip_range: The end of the ip range.
+        :type end_ip_range: ipaddress.IPv4Address
+        :param as_number: The Autonomous System number.
+        :type as_number: int
+        :param country_code: The country code.
+        :type country_code: str
+        :param as_description: The Autonomous System brief description.
+        :type as_description: str
+        :return: The EntryIpAsDatabase object.
+        :rtype: EntryIpAsDatabase
+        """
+        entry = EntryIpAsDatabase.__new__(EntryIpAsDatabase)
+        object.__setattr__(entry, 'start_ip_range', start_ip_range)
+        object.__setattr__(entry, 'end_ip_range', end_ip_range)
+        object.__setattr__(entry, 'as_number', as_number)
+        object.__setattr__(entry, 'country_code', country_code)
+        object.__setattr__(entry, 'as_description', as_description)
+        object.__setattr__(entry, '_networks_', None)
+        object.__setattr__(entry, '_network_starts_', None)
+        object.__setattr__(entry, '_hash_', hash((as_number, start_ip_range, end_ip_range)))
+        return entry
+
+    def __setattr__(self, name: str, value) -> None:
+        """
+        The range and AS number are hashed by the constructor, so they can't change afterwards. The constructors and
+        the CIDR decomposition cache set the fields through object.__setattr__.
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"EntryIpAsDatabase objects are immutable: can't set attribute '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        """
+        Fields of an entry are never deleted.
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"EntryIpAsDatabase objects are immutable: can't delete attribute '{name}'")
 
     def get_all_networks(self) -> List[ipaddress.IPv4Network]:
         """
         Returns a list of networks from the summarized network range given the first and last IP addresses of the range
-        in the entry (self object).
+        in the entry (self object). The summarization is computed only once.
 
         :raise TypeError: If first or last are not IP addresses or are not of the same version.
         :raise ValueError: If last is not greater than first or if first address version is not 4 or 6
         :returns: A list of valid ipaddress.IPv4Network.
         :rtype: List[ipaddress.IPv4Network]
         """
-        try:
-            return list(ipaddress.summarize_address_range(self.start_ip_range, self.end_ip_range))
-        except (TypeError, ValueError):
-            raise
+        if self._networks_ is None:
+            try:
+                networks = tuple(ipaddress.summarize_address_range(self.start_ip_range, self.end_ip_range))
+            except (TypeError, ValueError):
+                raise
+            object.__setattr__(self, '_network_starts_', tuple(map(lambda network: int(network.network_address), networks)))
+            object.__setattr__(self, '_networks_', networks)
+        return list(self._networks_)
 
     def get_network_of_ip(self, ip: ipaddress.IPv4Address) -> Tuple[ipaddress.IPv4Network, List[ipaddress.IPv4Network]]:
         """
         Return the network from the summarized network range given the first and last IP addresses of the range in the
-        entry (self object), and all the networks associated with such range.
+        entry (self object), and all the networks associated with such range. The networks are ordered, so the one
+        containing the ip address is found with a binary search.
 
         :param ip: Ip address.
         :type ip: ipaddress.IPv4Address
@@ -91,9 +150,9 @@ class EntryIpAsDatabase:
             networks = self.get_all_networks()
         except (TypeError, ValueError):
             raise
-        for network in networks:
-            if ip in network:
-                return network, networks
+        index = bisect.bisect_right(self._network_starts_, int(ip)) - 1
+        if index >= 0 and ip in networks[index]:
+            return networks[index], networks
         raise ValueError()
 
     def __str__(self) -> str:
@@ -126,4 +185,4 @@ class EntryIpAsDatabase:
         :return: Hash of this object.
         :rtype: int
         """
-        return hash((self.as_number, self.start_ip_range, self.end_ip_range))
+        return self._hash_
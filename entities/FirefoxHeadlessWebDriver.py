@@ -1,9 +1,16 @@
+import os
 import platform
+import signal
+import time
+from collections import Counter
 from pathlib import Path
+from typing import Optional
 import selenium
 from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.firefox.service import Service
 from seleniumwire import webdriver
+from entities.PageLoadStatistics import PageLoadStatistics
+from entities.ResourceBlockingProfile import ResourceBlockingProfile
 from exceptions.FilenameNotFoundError import FilenameNotFoundError
 from static_variables import INPUT_FOLDER_NAME, GECKODRIVER_FILENAME
 from utils import file_utils
@@ -13,6 +20,9 @@ class FirefoxHeadlessWebDriver:
     """
     This class creates an instance of a headless firefox web driver using geckodriver and a valid installation of
     Firefox.
+    If a resource blocking profile is set, the requests of the resources it blocks are intercepted (by seleniumwire)
+    and answered with a 403 response marked by the BLOCKED_TYPE_HEADER header (carrying the blocked type), so they are
+    never sent. Every page loaded with load_page is measured (see PageLoadStatistics).
 
     ...
 
@@ -26,10 +36,13 @@ class FirefoxHeadlessWebDriver:
         Object needed to run the headless browser.
     driver : seleniumwire.webdriver.Firefox
         Actual object of the web driver.
+    blocking_profile : ResourceBlockingProfile or None
+        The resources not downloaded, or None to download every resource.
     """
     time_out_in_seconds = 30
+    BLOCKED_TYPE_HEADER = 'X-Blocked-Resource-Type'
 
-    def __init__(self, project_root_directory=Path.cwd()):
+    def __init__(self, project_root_directory=Path.cwd(), blocking_profile=None):
         """
         Requires the project root directory (PRD) to find the geckodriver executable in the input sub-folder of the PRD.
         Path.cwd() returns the current working directory which depends upon the entry point of the application; in
@@ -41,6 +54,8 @@ class FirefoxHeadlessWebDriver:
 
         :param project_root_directory: The Path object pointing at the project root directory.
         :type project_root_directory: Path
+        :param blocking_profile: The resources not downloaded, or None to download every resource.
+        :type blocking_profile: ResourceBlockingProfile or None
         :raise FilenameNotFoundError: If the geckodriver executable is not found.
         :raise selenium.common.exceptions.WebDriverException: If there's a problem initializing the service object or
         the webdriver object.
@@ -54,6 +69,7 @@ class FirefoxHeadlessWebDriver:
         options = Options()
         options.headless = True
         self.options = options
+        self.blocking_profile: Optional[ResourceBlockingProfile] = blocking_profile
         try:
             self.service = Service(self.gecko_driver_path)
         except selenium.common.exceptions.WebDriverException:
@@ -63,6 +79,44 @@ class FirefoxHeadlessWebDriver:
         except selenium.common.exceptions.WebDriverException:
             raise
         self.driver.set_page_load_timeout(self.time_out_in_seconds)       # [s]
+        if self.blocking_profile is not None:
+            self.driver.request_interceptor = self.__intercept_request
+
+    def load_page(self, url_string: str) -> PageLoadStatistics:
+        """
+        Loads a page (the webdriver waits for its load event) and measures it from the requests recorded by
+        seleniumwire (the ones recorded for the previous page are discarded): the requests blocked by the interceptor
+        are recognized by their marked response and counted apart from the completed ones.
+
+        :param url_string: The URL of the page.
+        :type url_string: str
+        :raise selenium.common.exceptions.WebDriverException: There was a problem getting the response form the request.
+        :return: The statistics of the page load.
+        :rtype: PageLoadStatistics
+        """
+        del self.driver.requests
+        start = time.monotonic()
+        try:
+            self.driver.get(url_string)
+        except selenium.common.exceptions.WebDriverException:
+            raise
+        load_seconds = time.monotonic() - start
+        requests = 0
+        received_bytes = 0
+        blocked_requests = Counter()
+        for request in self.driver.requests:
+            if request.response is None:
+                continue
+            blocked_type = request.response.headers.get(FirefoxHeadlessWebDriver.BLOCKED_TYPE_HEADER)
+            if request.response.status_code == 403 and blocked_type is not None:
+                blocked_requests[blocked_type] = blocked_requests[blocked_type] + 1
+                continue
+            requests = requests + 1
+            try:
+                received_bytes = received_bytes + int(request.response.headers.get('Content-Length'))
+            except (TypeError, ValueError):
+                received_bytes = received_bytes + len(request.response.body)
+        return PageLoadStatistics(url_string, load_seconds, requests, received_bytes, dict(blocked_requests))
 
     def close(self) -> None:
         """
@@ -86,6 +140,52 @@ class FirefoxHeadlessWebDriver:
         except selenium.common.exceptions.WebDriverException:
             raise
         self.driver.set_page_load_timeout(self.time_out_in_seconds)  # [s]
+        if self.blocking_profile is not None:
+            self.driver.request_interceptor = self.__intercept_request
+
+    def is_alive(self) -> bool:
+        """
+        Health check: it returns if the webdriver answers to a trivial command, that is both geckodriver and Firefox
+        are running and the session is valid.
+
+        :return: True or False.
+        :rtype: bool
+        """
+        try:
+            return self.driver.execute_script('return 1;') == 1
+        except Exception:
+            return False
+
+    def kill(self) -> None:
+        """
+        Kills the Firefox and geckodriver processes without going through the webdriver, e.g. when a command is hung:
+        the pending command returns with an error. Afterwards the object is not usable anymore (close it).
+
+        """
+        pid = self.driver.capabilities.get('moz:processID')
+        if pid is not None:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        try:
+            self.service.process.kill()
+        except (AttributeError, OSError):
+            pass
+
+    def __intercept_request(self, request) -> None:
+        """
+        Request interceptor of seleniumwire (executed by its threads): the requests blocked by the blocking profile are
+        answered with a 403 response, without being sent; the response carries the blocked type in the
+        BLOCKED_TYPE_HEADER header.
+
+        :param request: The request.
+        :type request: seleniumwire.request.Request
+        """
+        blocked_type = self.blocking_profile.get_blocked_type(request.url, request.headers)
+        if blocked_type is None:
+            return
+        request.create_response(status_code=403, headers={FirefoxHeadlessWebDriver.BLOCKED_TYPE_HEADER: blocked_type})
 
     @staticmethod
     def geckodriver_filename() -> str:
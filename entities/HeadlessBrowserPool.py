@@ -0,0 +1,265 @@
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Iterable, Iterator, Tuple, Any
+from selenium.common.exceptions import TimeoutException
+from entities.FirefoxHeadlessWebDriver import FirefoxHeadlessWebDriver
+
+
+class HeadlessBrowserPool:
+    """
+    This class represents a pool of headless browsers that execute tasks (e.g. loading a page and reading its scripts)
+    in parallel: every browser is driven by its own thread, that takes the next task from a shared work queue.
+    After a failed task the browser of the thread is health-checked; a browser that crashed is closed and replaced by a
+    new one, built by the factory. A task that doesn't complete within the task timeout is considered hung: its browser
+    is killed (so the blocked call returns), the task fails with a TimeoutException and the browser is replaced before
+    the next task. If the factory fails, the task goes back to the work queue (so that the other threads can execute
+    it) and the thread retries after a growing delay; after max_factory_failures consecutive failures the thread is
+    retired. When the last thread is retired, the remaining tasks fail with the factory error.
+
+    ...
+
+    Attributes
+    ----------
+    browser_factory : Callable[[], FirefoxHeadlessWebDriver]
+        The function that instantiates a new browser.
+    size : int
+        The number of browsers (and threads).
+    task_timeout_seconds : float
+        The maximum duration (in seconds) of a task.
+    max_factory_failures : int
+        The number of consecutive factory failures after which a thread is retired.
+    factory_backoff_seconds : float
+        The delay before the first retry of the factory, doubled at every further retry.
+    browsers : List[FirefoxHeadlessWebDriver or None]
+        The browser of every thread (None if it has to be built).
+    """
+    def __init__(self, browser_factory: Callable[[], FirefoxHeadlessWebDriver], size=4, task_timeout_seconds=60, max_factory_failures=3, factory_backoff_seconds=2.0):
+        """
+        Instantiate the pool and all its browsers. If a browser can't be instantiated, the ones already instantiated
+        are closed.
+
+        :param browser_factory: The function that instantiates a new browser.
+        :type browser_factory: Callable[[], FirefoxHeadlessWebDriver]
+        :param size: The number of browsers (and threads).
+        :type size: int
+        :param task_timeout_seconds: The maximum duration (in seconds) of a task. It should be greater than the page
+        load timeout of the browsers plus the time a task waits for the page content.
+        :type task_timeout_seconds: float
+        :param max_factory_failures: The number of consecutive factory failures after which a thread is retired.
+        :type max_factory_failures: int
+        :param factory_backoff_seconds: The delay before the first retry of the factory, doubled at every further retry.
+        :type factory_backoff_seconds: float
+        :raise FilenameNotFoundError: If the geckodriver executable is not found.
+        :raise selenium.common.exceptions.WebDriverException: If a browser can't be instantiated.
+        """
+        self.browser_factory = browser_factory
+        self.size = size
+        self.task_timeout_seconds = task_timeout_seconds
+        self.max_factory_failures = max_factory_failures
+        self.factory_backoff_seconds = factory_backoff_seconds
+        self.browsers: List[Optional[FirefoxHeadlessWebDriver]] = list()
+        self.__lock = threading.Lock()
+        self.__tasks_start: List[Optional[float]] = [None] * size
+        self.__killed: List[bool] = [False] * size
+        self.__suspected: List[bool] = [False] * size
+        self.__running_threads = 0
+        try:
+            for _ in range(size):
+                self.browsers.append(browser_factory())
+        except Exception:
+            self.close()
+            raise
+
+    def map(self, function: Callable[[FirefoxHeadlessWebDriver, Any], Any], items: Iterable[Any]) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        This method executes a task for every item, calling the function with a browser of the pool and the item.
+        The results are yielded in the order of the items, as soon as available. Exceptions are silent: for every item
+        it is yielded the result (None if the task failed) and the exception raised (None if the task succeeded).
+
+        :param function: The task: a function that takes a browser and an item.
+        :type function: Callable[[FirefoxHeadlessWebDriver, Any], Any]
+        :param items: The items.
+        :type items: Iterable[Any]
+        :return: An iterator of (item, result, exception) tuples.
+        :rtype: Iterator[Tuple[Any, Any, Optional[Exception]]]
+        """
+        items = list(items)
+        tasks = queue.Queue()
+        for index, item in enumerate(items):
+            tasks.put((index, item))
+        results = queue.Queue()
+        threads = list()
+        self.__running_threads = self.size
+        for slot in range(self.size):
+            thread = threading.Thread(target=self.__work, args=(slot, function, tasks, results), name=f"browser-pool-{slot}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        completed = dict()
+        next_index = 0
+        while next_index < len(items):
+            try:
+                index, result, error = results.get(timeout=1)
+            except queue.Empty:
+                index = None
+            # checked at every pass: results of other threads may keep coming while a browser is hung
+            self.kill_hung_browsers()
+            if index is None:
+                continue
+            completed[index] = (result, error)
+            while next_index in completed:
+                result, error = completed.pop(next_index)
+                yield items[next_index], result, error
+                next_index = next_index + 1
+        for thread in threads:
+            thread.join()
+
+    def kill_hung_browsers(self) -> None:
+        """
+        This method kills the browsers whose current task exceeded the task timeout.
+
+        """
+        now = time.monotonic()
+        with self.__lock:
+            hung_slots = [slot for slot in range(self.size) if self.__tasks_start[slot] is not None and not self.__killed[slot] and now - self.__tasks_start[slot] > self.task_timeout_seconds]
+            hung_browsers = list()
+            for slot in hung_slots:
+                self.__killed[slot] = True
+                hung_browsers.append(self.browsers[slot])
+        for browser in hung_browsers:
+            browser.kill()
+
+    def close(self) -> None:
+        """
+        This method closes all the browsers of the pool. Errors are ignored.
+
+        """
+        for slot, browser in enumerate(self.browsers):
+            if browser is not None:
+                HeadlessBrowserPool.__close_quietly(browser)
+                self.browsers[slot] = None
+
+    def __get_healthy_browser(self, slot: int) -> FirefoxHeadlessWebDriver:
+        """
+        Auxiliary method that returns the browser of a thread, replacing it if it was killed or, after a failed task, if
+        it isn't alive. The health check is executed only after a failed task, since it costs a WebDriver command.
+
+        :param slot: The index of the thread.
+        :type slot: int
+        :raise FilenameNotFoundError: If the geckodriver executable is not found.
+        :raise selenium.common.exceptions.WebDriverException: If a new browser can't be instantiated.
+        :return: The browser.
+        :rtype: FirefoxHeadlessWebDriver
+        """
+        browser = self.browsers[slot]
+        with self.__lock:
+            killed = self.__killed[slot]
+            self.__killed[slot] = False
+        suspected = self.__suspected[slot]
+        self.__suspected[slot] = False
+        if browser is not None and not killed and (not suspected or browser.is_alive()):
+            return browser
+        if browser is not None:
+            print(f"!!! Headless browser {slot+1}/{self.size} is not responding: it is replaced !!!")
+            HeadlessBrowserPool.__close_quietly(browser)
+            self.browsers[slot] = None
+        self.browsers[slot] = self.browser_factory()
+        return self.browsers[slot]
+
+    def __work(self, slot: int, function: Callable[[FirefoxHeadlessWebDriver, Any], Any], tasks: queue.Queue, results: queue.Queue) -> None:
+        """
+        Auxiliary method executed by every thread: it executes the tasks of the work queue until it is empty.
+
+        :param slot: The index of the thread.
+        :type slot: int
+        :param function: The task.
+        :type function: Callable[[FirefoxHeadlessWebDriver, Any], Any]
+        :param tasks: The work queue of (index, item) tuples.
+        :type tasks: queue.Queue
+        :param results: The queue of (index, result, exception) tuples.
+        :type results: queue.Queue
+        """
+        factory_failures = 0
+        while True:
+            try:
+                index, item = tasks.get_nowait()
+            except queue.Empty:
+                with self.__lock:
+                    self.__running_threads = self.__running_threads - 1
+                return
+            try:
+                browser = self.__get_healthy_browser(slot)
+            except Exception as e:
+                factory_failures = factory_failures + 1
+                if self.__retire_if_factory_is_failing(slot, factory_failures, e, index, item, tasks, results):
+                    return
+                continue
+            factory_failures = 0
+            with self.__lock:
+                self.__tasks_start[slot] = time.monotonic()
+            try:
+                result, error = function(browser, item), None
+            except Exception as e:
+                result, error = None, e
+            with self.__lock:
+                self.__tasks_start[slot] = None
+                killed = self.__killed[slot]
+            if killed:
+                result, error = None, TimeoutException(f"Task exceeded {self.task_timeout_seconds} seconds: headless browser {slot+1}/{self.size} is killed.")
+            elif error is not None:
+                self.__suspected[slot] = True
+            results.put((index, result, error))
+
+    def __retire_if_factory_is_failing(self, slot: int, factory_failures: int, factory_error: Exception, index: int, item: Any, tasks: queue.Queue, results: queue.Queue) -> bool:
+        """
+        Auxiliary method executed by a thread whose browser couldn't be built: the task goes back to the work queue.
+        Then, if the factory failed max_factory_failures consecutive times, the thread is retired (and if it was the
+        last running thread, the remaining tasks fail with the factory error); otherwise the thread waits before
+        retrying.
+
+        :param slot: The index of the thread.
+        :type slot: int
+        :param factory_failures: The number of consecutive factory failures of the thread.
+        :type factory_failures: int
+        :param factory_error: The exception raised by the factory.
+        :type factory_error: Exception
+        :param index: The index of the task.
+        :type index: int
+        :param item: The item of the task.
+        :type item: Any
+        :param tasks: The work queue of (index, item) tuples.
+        :type tasks: queue.Queue
+        :param results: The queue of (index, result, exception) tuples.
+        :type results: queue.Queue
+        :return: True if the thread is retired, False otherwise.
+        :rtype: bool
+        """
+        tasks.put((index, item))
+        if factory_failures < self.max_factory_failures:
+            time.sleep(self.factory_backoff_seconds * 2 ** (factory_failures - 1))
+            return False
+        print(f"!!! Headless browser {slot+1}/{self.size} can't be instantiated ({str(factory_error)}): it is retired !!!")
+        with self.__lock:
+            self.__running_threads = self.__running_threads - 1
+            is_last = self.__running_threads == 0
+        if is_last:
+            while True:
+                try:
+                    index, item = tasks.get_nowait()
+                except queue.Empty:
+                    break
+                results.put((index, None, factory_error))
+        return True
+
+    @staticmethod
+    def __close_quietly(browser: FirefoxHeadlessWebDriver) -> None:
+        """
+        Auxiliary static method that closes a browser, ignoring errors (e.g. the browser already crashed).
+
+        :param browser: The browser.
+        :type browser: FirefoxHeadlessWebDriver
+        """
+        try:
+            browser.close()
+        except Exception:
+            pass
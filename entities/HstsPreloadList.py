@@ -0,0 +1,138 @@
+import json
+from pathlib import Path
+from typing import Dict, Optional
+from exceptions.FilenameNotFoundError import FilenameNotFoundError
+from static_variables import HSTS_PRELOAD_FILE_NAME, INPUT_FOLDER_NAME, RESOURCES_FOLDER_NAME
+from utils import file_utils
+
+
+class HstsPreloadList:
+    """
+    This class represents the HSTS preload list: the host names that browsers request only via HTTPS, without ever
+    receiving their Strict-Transport-Security header first. Every entry can include its subdomains; so a host name is
+    preloaded if it is an entry or if one of its ancestors (up to the top-level domain) is an entry that includes its
+    subdomains. A lookup costs a dictionary access for each label of the host name.
+    The list is read from files in the format of the Chromium source (transport_security_state_static.json: a JSON
+    object with the 'entries' list, with '//' comment lines); only the entries with 'force-https' mode are considered.
+
+    ...
+
+    Attributes
+    ----------
+    entries : Dict[str, bool]
+        The preloaded host names (lowercase, without trailing dot) and, for each of them, if the subdomains are
+        included.
+    """
+    __slots__ = ('entries',)
+    BUNDLED_FILEPATH = Path(__file__).parent.parent / RESOURCES_FOLDER_NAME / HSTS_PRELOAD_FILE_NAME
+
+    def __init__(self, entries: Optional[Dict[str, bool]] = None):
+        """
+        Instantiate a HstsPreloadList object.
+
+        :param entries: The preloaded host names and, for each of them, if the subdomains are included.
+        :type entries: Optional[Dict[str, bool]]
+        """
+        self.entries: Dict[str, bool] = dict()
+        if entries is not None:
+            for name, include_subdomains in entries.items():
+                self.add(name, include_subdomains)
+
+    def add(self, name: str, include_subdomains: bool) -> None:
+        """
+        This method adds an entry.
+
+        :param name: The host name.
+        :type name: str
+        :param include_subdomains: If the subdomains are included.
+        :type include_subdomains: bool
+        """
+        self.entries[HstsPreloadList.standardize(name)] = include_subdomains
+
+    def is_preloaded(self, host: str) -> bool:
+        """
+        This method checks if a host name is preloaded.
+
+        :param host: The host name (a trailing dot and a port are ignored).
+        :type host: str
+        :return: True or False.
+        :rtype: bool
+        """
+        standardized = HstsPreloadList.standardize(host)
+        if standardized in self.entries:
+            return True
+        index = standardized.find('.')
+        while index != -1:
+            if self.entries.get(standardized[index+1:], False):
+                return True
+            index = standardized.find('.', index+1)
+        return False
+
+    def load_json(self, filepath: str) -> None:
+        """
+        This method adds the entries of a file in the Chromium format.
+
+        :param filepath: The filepath.
+        :type filepath: str
+        :raise OSError: If the file can't be read.
+        :raise ValueError: If the file is not well-formed.
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            lines = filter(lambda line: not line.lstrip().startswith('//'), f.readlines())
+            f.close()
+        document = json.loads(''.join(lines))
+        if not isinstance(document, dict) or not isinstance(document.get('entries'), list):
+            raise ValueError(f"No 'entries' list in HSTS preload list: {filepath}")
+        for entry in document['entries']:
+            if isinstance(entry, dict) and isinstance(entry.get('name'), str) and entry.get('mode') == 'force-https':
+                self.add(entry['name'], entry.get('include_subdomains', False) is True)
+
+    def __len__(self) -> int:
+        """
+        The number of entries.
+
+        :return: The number of entries.
+        :rtype: int
+        """
+        return len(self.entries)
+
+    @staticmethod
+    def standardize(host: str) -> str:
+        """
+        Static method that returns the standardized version of a host name: lowercase, without port and trailing dot.
+
+        :param host: The host name.
+        :type host: str
+        :return: The standardized host name.
+        :rtype: str
+        """
+        return host.lower().split(':')[0].rstrip('.')
+
+    @staticmethod
+    def load(project_root_directory=Path.cwd()) -> 'HstsPreloadList':
+        """
+        Static method that loads the bundled list (the top-level domains preloaded as a whole, in the res folder) and
+        then, if present, the hsts_preload.json file of the input folder (e.g. the complete list of the Chromium
+        source).
+        Path.cwd() returns the current working directory which depends upon the entry point of the application; in
+        particular, if we start the application from the main.py file in the PRD, every time Path.cwd() is encountered
+        (even in methods belonging to files that are in sub-folders with respect to PRD) then the actual PRD is
+        returned. If the application is started from a file that belongs to the entities package, then Path.cwd() will
+        return the entities sub-folder with respect to the PRD. So to give a bit of modularity, the PRD parameter is set
+        to default as if the entry point is main.py file (which is the only entry point considered).
+
+        :param project_root_directory: The Path object pointing at the project root directory.
+        :type project_root_directory: Path
+        :raise OSError: If a file can't be read.
+        :raise ValueError: If a file is not well-formed.
+        :return: The HstsPreloadList object.
+        :rtype: HstsPreloadList
+        """
+        result = HstsPreloadList()
+        result.load_json(str(HstsPreloadList.BUNDLED_FILEPATH))
+        try:
+            file = file_utils.search_for_filename_in_subdirectory(INPUT_FOLDER_NAME, HSTS_PRELOAD_FILE_NAME, project_root_directory)[0]
+        except FilenameNotFoundError:
+            return result
+        result.load_json(str(file))
+        return result
@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from entities.RedirectionHop import RedirectionHop
+from static_variables import OUTPUT_FOLDER_NAME, OUTPUT_LANDING_CACHE_FILE_NAME
+from utils import file_utils
+
+
+class LandingResultCache:
+    """
+    This class represents an on-disk cache of the landing results (the redirection path, from which the landing URL, the
+    HSTS validity and the server are computed) of the sites, keyed by starting URL (site and scheme). It is saved as a
+    single JSON file in the output folder, so landings are reused across executions: every entry saves the hops of the
+    redirection path and the time (seconds since epoch) they were last probed or revalidated.
+    Only successful landings are saved. The methods are thread-safe.
+
+    ...
+
+    Attributes
+    ----------
+    filepath : str
+        The filepath of the cache file.
+    ttl_seconds : float
+        The time-to-live (in seconds) of an entry: before it the site is not requested at all.
+    entries : Dict[str, dict]
+        The entries, by starting URL.
+    is_modified : bool
+        If there are entries not yet saved on disk.
+    """
+    def __init__(self, project_root_directory=Path.cwd(), ttl_seconds=86400):
+        """
+        Instantiate a LandingResultCache object reading the cache file (if present).
+        Path.cwd() returns the current working directory which depends upon the entry point of the application; in
+        particular, if we start the application from the main.py file in the PRD, every time Path.cwd() is encountered
+        (even in methods belonging to files that are in sub-folders with respect to PRD) then the actual PRD is
+        returned. If the application is started from a file that belongs to the entities package, then Path.cwd() will
+        return the entities sub-folder with respect to the PRD. So to give a bit of modularity, the PRD parameter is set
+        to default as if the entry point is main.py file (which is the only entry point considered).
+
+        :param project_root_directory: The Path object pointing at the project root directory.
+        :type project_root_directory: Path
+        :param ttl_seconds: The time-to-live (in seconds) of an entry. Default is 1 day.
+        :type ttl_seconds: float
+        :raise OSError: If the output folder can't be created.
+        """
+        folder = project_root_directory / OUTPUT_FOLDER_NAME
+        folder.mkdir(parents=True, exist_ok=True)
+        self.filepath = f"{str(folder)}{os.sep}{OUTPUT_LANDING_CACHE_FILE_NAME}"
+        self.ttl_seconds = ttl_seconds
+        self.entries: Dict[str, dict] = dict()
+        for url_string, entry in file_utils.read_json(self.filepath).items():
+            if isinstance(entry, dict) and isinstance(entry.get('hops'), list) and len(entry['hops']) > 0 and isinstance(entry.get('last_checked'), (int, float)):
+                self.entries[url_string] = entry
+        self.is_modified = False
+        self.__lock = threading.Lock()
+
+    def get_hops(self, url_string: str) -> Optional[List[RedirectionHop]]:
+        """
+        This method returns the hops saved for a starting URL, whether fresh or not.
+
+        :param url_string: The starting URL (with scheme).
+        :type url_string: str
+        :return: The hops, or None if there is no (well-formed) entry.
+        :rtype: Optional[List[RedirectionHop]]
+        """
+        with self.__lock:
+            entry = self.entries.get(url_string)
+        if entry is None:
+            return None
+        try:
+            return list(map(RedirectionHop.from_list, entry['hops']))
+        except ValueError:
+            return None
+
+    def is_fresh(self, url_string: str) -> bool:
+        """
+        This method checks if the entry of a starting URL exists and its time-to-live isn't expired.
+
+        :param url_string: The starting URL (with scheme).
+        :type url_string: str
+        :return: True or False.
+        :rtype: bool
+        """
+        with self.__lock:
+            entry = self.entries.get(url_string)
+        return entry is not None and time.time() - entry['last_checked'] < self.ttl_seconds
+
+    def put(self, url_string: str, hops: List[RedirectionHop]) -> None:
+        """
+        This method saves (in memory, see save) the hops just probed for a starting URL.
+
+        :param url_string: The starting URL (with scheme).
+        :type url_string: str
+        :param hops: The hops.
+        :type hops: List[RedirectionHop]
+        """
+        entry = {
+            'last_checked': time.time(),
+            'hops': list(map(lambda hop: hop.to_list(), hops))
+        }
+        with self.__lock:
+            self.entries[url_string] = entry
+            self.is_modified = True
+
+    def touch(self, url_string: str) -> None:
+        """
+        This method renews the time-to-live of the entry of a starting URL, after it has been revalidated.
+
+        :param url_string: The starting URL (with scheme).
+        :type url_string: str
+        :raise KeyError: If there is no entry for the starting URL.
+        """
+        with self.__lock:
+            self.entries[url_string]['last_checked'] = time.time()
+            self.is_modified = True
+
+    def save(self) -> None:
+        """
+        This method writes (atomically) the cache file, if there are entries not yet saved.
+
+        :raise OSError: If the file can't be written.
+        """
+        with self.__lock:
+            if not self.is_modified:
+                return
+            file_utils.write_json_atomically(self.entries, self.filepath)
+            self.is_modified = False
+
+    def __len__(self) -> int:
+        """
+        The number of entries.
+
+        :return: The number of entries.
+        :rtype: int
+        """
+        return len(self.entries)
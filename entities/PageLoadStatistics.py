@@ -0,0 +1,69 @@
+from typing import Dict
+
+
+class PageLoadStatistics:
+    """
+    This class represents the statistics of a page load by a headless browser: its duration, the requests completed
+    with the bytes received and the requests blocked (by type, see ResourceBlockingProfile). Blocked requests are never
+    sent, so the bytes they would have cost are not known: the savings of a blocking profile are measured only by
+    comparing with page loads without it.
+
+    ...
+
+    Attributes
+    ----------
+    url : str
+        The URL of the page.
+    load_seconds : float
+        The duration (in seconds) of the page load.
+    requests : int
+        The number of requests completed.
+    received_bytes : int
+        The bytes received (bodies of the responses, as transferred).
+    blocked_requests : Dict[str, int]
+        The number of requests blocked, by type.
+    """
+    __slots__ = ('url', 'load_seconds', 'requests', 'received_bytes', 'blocked_requests')
+
+    def __init__(self, url: str, load_seconds: float, requests: int, received_bytes: int, blocked_requests: Dict[str, int]):
+        """
+        Initialize the object.
+
+        :param url: The URL of the page.
+        :type url: str
+        :param load_seconds: The duration (in seconds) of the page load.
+        :type load_seconds: float
+        :param requests: The number of requests completed.
+        :type requests: int
+        :param received_bytes: The bytes received.
+        :type received_bytes: int
+        :param blocked_requests: The number of requests blocked, by type.
+        :type blocked_requests: Dict[str, int]
+        """
+        self.url = url
+        self.load_seconds = load_seconds
+        self.requests = requests
+        self.received_bytes = received_bytes
+        self.blocked_requests = blocked_requests
+
+    def total_blocked_requests(self) -> int:
+        """
+        This method returns the number of requests blocked.
+
+        :return: The number of requests blocked.
+        :rtype: int
+        """
+        return sum(self.blocked_requests.values())
+
+    def __str__(self) -> str:
+        """
+        This method returns a human-readable string representation of this object.
+
+        :return: A human-readable string representation of this object.
+        :rtype: str
+        """
+        blocked = ', '.join(f"{count} {blocked_type}" for blocked_type, count in sorted(self.blocked_requests.items()))
+        result = f"{self.load_seconds:.2f}s, {self.requests} requests, {self.received_bytes / 1024:.1f} KiB received, {self.total_blocked_requests()} blocked"
+        if blocked:
+            result = result + f" ({blocked}; bytes saved not measured)"
+        return result
@@ -0,0 +1,163 @@
+import functools
+import socket
+from typing import Callable, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util import connection
+
+
+class PeerAddressHTTPConnection(HTTPConnection):
+    """
+    HTTP connection that records the address of the server as soon as the socket is connected, and stamps it on every
+    response as the peer_address attribute. If a host resolver is set, the socket is connected to the addresses it
+    returns (tried in order) instead of the ones of the OS resolver; the host name is still used for everything else
+    (Host header, SNI and certificate verification).
+
+    ...
+
+    Attributes
+    ----------
+    peer_address : Tuple[str, int] or None
+        The (IP address, port) couple of the server, or None if not connected.
+    host_resolver : Callable[[str], List[str]] or None
+        The function that returns the IP addresses of a host name (an empty list to use the OS resolver).
+    """
+    def __init__(self, *args, host_resolver=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.peer_address: Optional[Tuple[str, int]] = None
+        self.host_resolver: Optional[Callable[[str], List[str]]] = host_resolver
+
+    def _new_conn(self) -> socket.socket:
+        sock = PeerAddressHTTPConnection.new_socket(self)
+        self.peer_address = PeerAddressHTTPConnection.get_peer_address(sock)
+        return sock
+
+    def getresponse(self):
+        response = super().getresponse()
+        response.peer_address = self.peer_address
+        return response
+
+    @staticmethod
+    def new_socket(conn: HTTPConnection) -> socket.socket:
+        """
+        Static method that connects the socket of a connection (PeerAddressHTTPConnection or
+        PeerAddressHTTPSConnection) to the first address of its host resolver that accepts it. If there's no host
+        resolver, or it has no address for the host, the socket is connected as urllib3 does.
+
+        :param conn: The connection.
+        :type conn: HTTPConnection
+        :raise urllib3.exceptions.ConnectTimeoutError: If the last address tried timed out.
+        :raise urllib3.exceptions.NewConnectionError: If the last address tried refused the connection.
+        :raise urllib3.exceptions.NameResolutionError: If the OS resolver can't resolve the host.
+        :return: The connected socket.
+        :rtype: socket.socket
+        """
+        addresses = conn.host_resolver(conn.host) if conn.host_resolver is not None else None
+        if not addresses:
+            return HTTPConnection._new_conn(conn)
+        last_error = None
+        for address in addresses:
+            try:
+                return connection.create_connection((address, conn.port), conn.timeout, source_address=conn.source_address, socket_options=conn.socket_options)
+            except socket.timeout as e:
+                last_error = ConnectTimeoutError(conn, f"Connection to {conn.host} ({address}) timed out. (connect timeout={conn.timeout})")
+                last_error.__cause__ = e
+            except OSError as e:
+                last_error = NewConnectionError(conn, f"Failed to establish a new connection to {address}: {e}")
+                last_error.__cause__ = e
+        raise last_error
+
+    @staticmethod
+    def get_peer_address(sock) -> Optional[Tuple[str, int]]:
+        """
+        Static method that returns the (IP address, port) couple of the remote end of a socket.
+
+        :param sock: A connected socket.
+        :type sock: socket.socket
+        :return: The (IP address, port) couple or None if the socket isn't connected.
+        :rtype: Optional[Tuple[str, int]]
+        """
+        try:
+            return tuple(sock.getpeername()[0:2])
+        except (AttributeError, OSError):
+            return None
+
+
+class PeerAddressHTTPSConnection(HTTPSConnection):
+    """
+    HTTPS version of PeerAddressHTTPConnection.
+
+    ...
+
+    Attributes
+    ----------
+    peer_address : Tuple[str, int] or None
+        The (IP address, port) couple of the server, or None if not connected.
+    host_resolver : Callable[[str], List[str]] or None
+        The function that returns the IP addresses of a host name (an empty list to use the OS resolver).
+    """
+    def __init__(self, *args, host_resolver=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.peer_address: Optional[Tuple[str, int]] = None
+        self.host_resolver: Optional[Callable[[str], List[str]]] = host_resolver
+
+    def _new_conn(self) -> socket.socket:
+        sock = PeerAddressHTTPConnection.new_socket(self)
+        self.peer_address = PeerAddressHTTPConnection.get_peer_address(sock)
+        return sock
+
+    def getresponse(self):
+        response = super().getresponse()
+        response.peer_address = self.peer_address
+        return response
+
+
+class PeerAddressHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = PeerAddressHTTPConnection
+
+
+class PeerAddressHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = PeerAddressHTTPSConnection
+
+
+class PeerAddressHTTPAdapter(HTTPAdapter):
+    """
+    This class represents a transport adapter for requests.Session objects that records the address of the server of
+    every response: it is the peer_address attribute ((IP address, port) couple) of the raw urllib3 response
+    (response.raw.peer_address). The address is known even when the connection is already closed or released to the
+    pool (e.g. after a response without body), so there's no need to reach the socket through private attributes.
+    Requests through a proxy record the address of the proxy.
+    Optionally a host resolver can be set (e.g. one backed by the application DNS cache): connections are then opened
+    towards the addresses it returns, so the address connected is the one the application resolved.
+
+    ...
+
+    Attributes
+    ----------
+    host_resolver : Callable[[str], List[str]] or None
+        The function that returns the IP addresses of a host name (an empty list to use the OS resolver).
+    """
+    def __init__(self, host_resolver=None, **kwargs):
+        """
+        Instantiate the adapter.
+
+        :param host_resolver: The function that returns the IP addresses of a host name (an empty list to use the OS
+        resolver). None means that the OS resolver is always used.
+        :type host_resolver: Callable[[str], List[str]] or None
+        :param kwargs: The parameters of requests.adapters.HTTPAdapter (pool_connections, pool_maxsize, ...).
+        """
+        self.host_resolver = host_resolver
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        """
+        Initializes the pool manager of the adapter, making it use the connection pools defined above.
+
+        """
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': functools.partial(PeerAddressHTTPConnectionPool, host_resolver=self.host_resolver),
+            'https': functools.partial(PeerAddressHTTPSConnectionPool, host_resolver=self.host_resolver)
+        }
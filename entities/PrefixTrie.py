@@ -0,0 +1,122 @@
+import ipaddress
+from typing import Generic, TypeVar, Optional, List
+from exceptions.NetworkNotFoundError import NetworkNotFoundError
+
+
+T = TypeVar('T')
+
+
+class PrefixTrie(Generic[T]):
+    """
+    This class represents a binary trie of IPv4 prefixes over the integer representation of the addresses, used to
+    find the longest prefix that contains an IP address (longest-prefix-match). Every node is a list of 3 elements: the
+    child for bit 0, the child for bit 1 and the value saved for the prefix ending in such node (None if there is no
+    prefix). A lookup follows the bits of the address from the most significant one, so it visits at most 32 nodes
+    whatever the number of prefixes saved.
+    If the same prefix is inserted more than once, the first value is kept.
+
+    ...
+
+    Attributes
+    ----------
+    root : list
+        The root node (prefix 0.0.0.0/0).
+    size : int
+        The number of prefixes saved.
+    """
+    __slots__ = ('root', 'size')
+    MAX_PREFIX_LENGTH = 32
+
+    def __init__(self):
+        """
+        Instantiate an empty PrefixTrie object.
+
+        """
+        self.root = [None, None, None]
+        self.size = 0
+
+    def insert(self, network: ipaddress.IPv4Network, value: T) -> None:
+        """
+        Saves the value parameter for the network parameter.
+
+        :param network: The prefix.
+        :type network: ipaddress.IPv4Network
+        :param value: The value associated with the prefix; it can't be None.
+        :type value: T
+        :raise ValueError: If the value is None.
+        """
+        if value is None:
+            raise ValueError()
+        int_address = int(network.network_address)
+        node = self.root
+        for i in range(network.prefixlen):
+            bit = (int_address >> (PrefixTrie.MAX_PREFIX_LENGTH - 1 - i)) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+        if node[2] is None:
+            node[2] = value
+            self.size = self.size + 1
+
+    def longest_prefix_match(self, ip: ipaddress.IPv4Address) -> T:
+        """
+        Returns the value of the longest prefix saved that contains the ip address parameter.
+
+        :param ip: An ip v4 address.
+        :type ip: ipaddress.IPv4Address
+        :raise NetworkNotFoundError: If no prefix contains the ip address.
+        :return: The value of the matched prefix.
+        :rtype: T
+        """
+        result = self.get_longest_prefix_match(ip)
+        if result is None:
+            raise NetworkNotFoundError(ip.compressed)
+        return result
+
+    def get_longest_prefix_match(self, ip: ipaddress.IPv4Address) -> Optional[T]:
+        """
+        Returns the value of the longest prefix saved that contains the ip address parameter, or None.
+
+        :param ip: An ip v4 address.
+        :type ip: ipaddress.IPv4Address
+        :return: The value of the matched prefix or None.
+        :rtype: Optional[T]
+        """
+        int_address = int(ip)
+        node = self.root
+        result = node[2]
+        for i in range(PrefixTrie.MAX_PREFIX_LENGTH):
+            node = node[(int_address >> (PrefixTrie.MAX_PREFIX_LENGTH - 1 - i)) & 1]
+            if node is None:
+                break
+            if node[2] is not None:
+                result = node[2]
+        return result
+
+    def values(self) -> List[T]:
+        """
+        Returns all the values saved, ordered by prefix (network address and then prefix length).
+
+        :return: The list of values.
+        :rtype: List[T]
+        """
+        result = list()
+        stack = [self.root]
+        while len(stack) != 0:
+            node = stack.pop()
+            if node[2] is not None:
+                result.append(node[2])
+            if node[1] is not None:
+                stack.append(node[1])
+            if node[0] is not None:
+                stack.append(node[0])
+        return result
+
+    def __len__(self) -> int:
+        """
+        The number of prefixes saved.
+
+        :return: The number of prefixes.
+        :rtype: int
+        """
+        return self.size
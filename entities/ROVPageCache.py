@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from static_variables import OUTPUT_FOLDER_NAME, OUTPUT_ROV_PAGE_CACHE_FOLDER_NAME
+from utils import file_utils
+
+
+class ROVPageCache:
+    """
+    This class represents an on-disk cache of the prefixes tables scraped from the ROV pages, one JSON file per
+    autonomous system (AS<number>.json) in the rov_cache sub-folder of the output folder. Every file saves the prefixes
+    of the table, the time (seconds since epoch) the page was last fetched or revalidated, and the validators sent by
+    the server (ETag and Last-Modified headers) used to revalidate the page with a conditional request once the
+    time-to-live is expired.
+    Entries are read at the first request and then kept in memory. The methods are thread-safe.
+
+    ...
+
+    Attributes
+    ----------
+    folder : Path
+        The folder of the cache files.
+    ttl_seconds : float
+        The time-to-live (in seconds) of an entry: before it the page is not fetched at all.
+    entries : Dict[int, dict]
+        The entries already read, by AS number.
+    """
+    def __init__(self, project_root_directory=Path.cwd(), ttl_seconds=86400):
+        """
+        Instantiate a ROVPageCache object creating (if needed) the folder of the cache files.
+        Path.cwd() returns the current working directory which depends upon the entry point of the application; in
+        particular, if we start the application from the main.py file in the PRD, every time Path.cwd() is encountered
+        (even in methods belonging to files that are in sub-folders with respect to PRD) then the actual PRD is
+        returned. If the application is started from a file that belongs to the entities package, then Path.cwd() will
+        return the entities sub-folder with respect to the PRD. So to give a bit of modularity, the PRD parameter is set
+        to default as if the entry point is main.py file (which is the only entry point considered).
+
+        :param project_root_directory: The Path object pointing at the project root directory.
+        :type project_root_directory: Path
+        :param ttl_seconds: The time-to-live (in seconds) of an entry. Default is 1 day.
+        :type ttl_seconds: float
+        :raise OSError: If the folder can't be created.
+        """
+        self.folder = project_root_directory / OUTPUT_FOLDER_NAME / OUTPUT_ROV_PAGE_CACHE_FOLDER_NAME
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.entries: Dict[int, dict] = dict()
+        self.__lock = threading.Lock()
+
+    def __get_entry(self, as_number: int) -> Optional[dict]:
+        """
+        Auxiliary method that returns the entry of an autonomous system, reading it from disk at the first request.
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :return: The entry or None.
+        :rtype: Optional[dict]
+        """
+        with self.__lock:
+            try:
+                return self.entries[as_number]
+            except KeyError:
+                pass
+            entry = file_utils.read_json(self.__get_filepath(as_number))
+            if not isinstance(entry.get('prefixes'), list) or not isinstance(entry.get('last_checked'), (int, float)):
+                entry = None
+            self.entries[as_number] = entry
+            return entry
+
+    def __get_filepath(self, as_number: int) -> str:
+        """
+        Auxiliary method that returns the filepath of the entry of an autonomous system.
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :return: The filepath.
+        :rtype: str
+        """
+        return f"{str(self.folder)}{os.sep}AS{as_number}.json"
+
+    def is_fresh(self, as_number: int) -> bool:
+        """
+        This method checks if the entry of an autonomous system exists and its time-to-live isn't expired.
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :return: True or False.
+        :rtype: bool
+        """
+        entry = self.__get_entry(as_number)
+        return entry is not None and time.time() - entry['last_checked'] < self.ttl_seconds
+
+    def get_prefixes(self, as_number: int) -> List[str]:
+        """
+        This method returns the prefixes saved for an autonomous system.
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :raise KeyError: If there is no entry for the autonomous system.
+        :return: The prefixes.
+        :rtype: List[str]
+        """
+        entry = self.__get_entry(as_number)
+        if entry is None:
+            raise KeyError(as_number)
+        return list(entry['prefixes'])
+
+    def get_validators_headers(self, as_number: int) -> Dict[str, str]:
+        """
+        This method returns the headers of a conditional request (If-None-Match and If-Modified-Since) to revalidate the
+        entry of an autonomous system. It is empty if there is no entry or the server didn't send validators.
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :return: The headers.
+        :rtype: Dict[str, str]
+        """
+        entry = self.__get_entry(as_number)
+        headers = dict()
+        if entry is None:
+            return headers
+        if entry.get('etag') is not None:
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified') is not None:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, as_number: int, prefixes: List[str], etag=None, last_modified=None) -> None:
+        """
+        This method saves (also on disk) the prefixes of an autonomous system just fetched, with the validators of the
+        response.
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :param prefixes: The prefixes.
+        :type prefixes: List[str]
+        :param etag: The ETag header of the response.
+        :type etag: str or None
+        :param last_modified: The Last-Modified header of the response.
+        :type last_modified: str or None
+        :raise OSError: If the file can't be written.
+        """
+        entry = {
+            'as_number': as_number,
+            'last_checked': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'prefixes': list(prefixes)
+        }
+        with self.__lock:
+            self.entries[as_number] = entry
+            file_utils.write_json_atomically(entry, self.__get_filepath(as_number))
+
+    def touch(self, as_number: int) -> None:
+        """
+        This method renews the time-to-live of the entry of an autonomous system, after the server confirmed that the
+        page is not modified.
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :raise KeyError: If there is no entry for the autonomous system.
+        :raise OSError: If the file can't be written.
+        """
+        entry = self.__get_entry(as_number)
+        if entry is None:
+            raise KeyError(as_number)
+        self.put(as_number, entry['prefixes'], etag=entry.get('etag'), last_modified=entry.get('last_modified'))
@@ -9,7 +9,8 @@ from utils import resource_records_utils
 class RRecord:
     """
     This class represent a simple resource record. Semantically it represents only the data structures, not the fact
-    that is a real existent resource record.
+    that is a real existent resource record. A resource record is identified by its name and type: that hash is computed
+    in the constructor, and afterwards no attribute can be reassigned.
 
     ...
 
@@ -19,9 +20,10 @@ class RRecord:
         The name field of the resource record.
     type : TypesRR
         The type field of the resource record.
-    values : List[DomainName or ipaddress.IPv4Address]
+    values : Tuple[DomainName or ipaddress.IPv4Address]
         The values field of the resource record.
     """
+    __slots__ = ('name', 'type', 'values', '_hash_')
 
     def __init__(self, name: DomainName or str, type_rr: TypesRR, values: List[str]):
         """
@@ -35,12 +37,27 @@ class RRecord:
         :param values: The values as strings.
         :type values: List[str]
         """
-        if isinstance(name, str):
-            self.name = DomainName(name)
-        else:
-            self.name = name
-        self.type = type_rr
-        self.values = RRecord.construct_objects(type_rr, values)
+        object.__setattr__(self, 'name', DomainName(name))
+        object.__setattr__(self, 'type', type_rr)
+        object.__setattr__(self, 'values', tuple(RRecord.construct_objects(type_rr, values)))
+        object.__setattr__(self, '_hash_', hash((self.name, self.type)))
+
+    def __setattr__(self, name: str, value) -> None:
+        """
+        Resource records are shared by caches, paths and zones, so none of their fields can be reassigned (the
+        constructor sets them through object.__setattr__).
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"RRecord objects are immutable: can't set attribute '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        """
+        Fields of a resource record are never deleted.
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"RRecord objects are immutable: can't delete attribute '{name}'")
 
     def __eq__(self, other: any) -> bool:
         """
@@ -51,10 +68,7 @@ class RRecord:
         :rtype: bool
         """
         if isinstance(other, RRecord):
-            if self.name == other.name and self.type == other.type:
-                return True
-            else:
-                return False
+            return self.name is other.name and self.type == other.type
         else:
             return False
 
@@ -117,7 +131,7 @@ class RRecord:
         :return: Hash of this object.
         :rtype: int
         """
-        return hash((self.name, self.type))
+        return self._hash_
 
     @staticmethod
     def construct_objects(type_rr: TypesRR, values: List[str]) -> List[DomainName or IPv4Address]:
@@ -0,0 +1,113 @@
+import ipaddress
+from typing import Optional, List
+
+
+class RedirectionHop:
+    """
+    This class represents a single hop of a redirection path: the response obtained requesting an URL, before following
+    its redirection (if any). Only the status line and the headers of the response are considered, the body is never
+    downloaded. Objects are slot-based.
+
+    ...
+
+    Attributes
+    ----------
+    url : str
+        The URL requested.
+    status_code : int
+        The status code of the response.
+    ip : ipaddress.IPv4Address or None
+        The IP address of the server that answered (None if it is not known, e.g. an IPv6 peer).
+    hsts : str or None
+        The value of the Strict-Transport-Security header of the response, or None if it is not present.
+    location : str or None
+        The absolute URL of the redirection (the next hop), or None if the response is not a redirection.
+    """
+    __slots__ = ('url', 'status_code', 'ip', 'hsts', 'location')
+
+    def __init__(self, url: str, status_code: int, ip: Optional[ipaddress.IPv4Address], hsts: Optional[str], location: Optional[str]):
+        """
+        Initialize the object.
+
+        :param url: The URL requested.
+        :type url: str
+        :param status_code: The status code of the response.
+        :type status_code: int
+        :param ip: The IP address of the server that answered.
+        :type ip: ipaddress.IPv4Address or None
+        :param hsts: The value of the Strict-Transport-Security header of the response.
+        :type hsts: str or None
+        :param location: The absolute URL of the redirection.
+        :type location: str or None
+        """
+        self.url = url
+        self.status_code = status_code
+        self.ip = ip
+        self.hsts = hsts
+        self.location = location
+
+    def is_redirection(self) -> bool:
+        """
+        This method returns if the response of this hop is a redirection.
+
+        :return: True or False.
+        :rtype: bool
+        """
+        return self.location is not None
+
+    def has_hsts_policy(self) -> bool:
+        """
+        This method returns if the response of this hop sets a valid HSTS policy, that a browser would apply to the
+        following requests towards the same host: the Strict-Transport-Security header has to be received via HTTPS and
+        its max-age directive has to be positive.
+
+        :return: True or False.
+        :rtype: bool
+        """
+        if self.hsts is None or not self.url.lower().startswith('https://'):
+            return False
+        for directive in self.hsts.split(';'):
+            name, _, value = directive.partition('=')
+            if name.strip().lower() == 'max-age':
+                try:
+                    return int(value.strip().strip('"')) > 0
+                except ValueError:
+                    return False
+        return False
+
+    def to_list(self) -> list:
+        """
+        This method returns the attributes of this object as a list of JSON serializable values (see from_list).
+
+        :return: The list of values.
+        :rtype: list
+        """
+        return [self.url, self.status_code, self.ip.compressed if self.ip is not None else None, self.hsts, self.location]
+
+    @staticmethod
+    def from_list(values: List) -> 'RedirectionHop':
+        """
+        Static method that instantiates a RedirectionHop object from the list of values returned by to_list.
+
+        :param values: The list of values.
+        :type values: list
+        :raise ValueError: If the values are not well-formed.
+        :return: The RedirectionHop object.
+        :rtype: RedirectionHop
+        """
+        try:
+            url, status_code, ip, hsts, location = values
+            return RedirectionHop(str(url), int(status_code), ipaddress.IPv4Address(ip) if ip is not None else None, hsts, location)
+        except (TypeError, ValueError) as e:
+            raise ValueError(str(e))
+
+    def __str__(self) -> str:
+        """
+        This method returns a human-readable string representation of this object.
+
+        :return: A human-readable string representation of this object.
+        :rtype: str
+        """
+        hsts = 'HSTS' if self.hsts is not None else 'no HSTS'
+        ip = self.ip.compressed if self.ip is not None else '?'
+        return f"{self.status_code} {self.url} ({ip}, {hsts})"
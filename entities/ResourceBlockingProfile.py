@@ -0,0 +1,108 @@
+from typing import Optional, Iterable, Mapping
+from urllib.parse import urlsplit
+
+
+class ResourceBlockingProfile:
+    """
+    This class represents the types of resources that a headless browser doesn't download while loading a page,
+    because they are irrelevant to main frame script discovery (e.g. images, fonts, media and stylesheets). Documents
+    (main frame and iframes) and scripts (workers included) are never blocked.
+    The type of a request is its destination (the Sec-Fetch-Dest header sent by Firefox) or, if the destination isn't
+    specific, the extension of its path. The other requests towards the blocked hosts (and their subdomains), e.g.
+    tracking beacons, are blocked whatever their type.
+
+    ...
+
+    Attributes
+    ----------
+    blocked_types : frozenset
+        The types of the resources blocked: any of 'image', 'font', 'media' and 'stylesheet'.
+    blocked_hosts : frozenset
+        The host names whose resources are blocked.
+    """
+    __slots__ = ('blocked_types', 'blocked_hosts')
+    DEFAULT_BLOCKED_TYPES = ('image', 'font', 'media', 'stylesheet')
+    TYPE_PER_DESTINATION = {
+        'image': 'image',
+        'font': 'font',
+        'audio': 'media',
+        'video': 'media',
+        'track': 'media',
+        'style': 'stylesheet'
+    }
+    TYPE_PER_EXTENSION = {
+        **dict.fromkeys(('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp', 'tif', 'tiff'), 'image'),
+        **dict.fromkeys(('woff', 'woff2', 'ttf', 'otf', 'eot'), 'font'),
+        **dict.fromkeys(('mp4', 'webm', 'ogg', 'ogv', 'mp3', 'wav', 'm4a', 'm4v', 'flac', 'vtt'), 'media'),
+        'css': 'stylesheet'
+    }
+    NEVER_BLOCKED_DESTINATIONS = ('document', 'iframe', 'frame', 'script', 'worker', 'sharedworker', 'serviceworker')
+
+    def __init__(self, blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES, blocked_hosts: Iterable[str] = ()):
+        """
+        Instantiate the object.
+
+        :param blocked_types: The types of the resources blocked: any of 'image', 'font', 'media' and 'stylesheet'.
+        :type blocked_types: Iterable[str]
+        :param blocked_hosts: The host names whose resources are blocked.
+        :type blocked_hosts: Iterable[str]
+        :raise ValueError: If a type is not valid.
+        """
+        self.blocked_types = frozenset(blocked_types)
+        for blocked_type in self.blocked_types:
+            if blocked_type not in ResourceBlockingProfile.DEFAULT_BLOCKED_TYPES:
+                raise ValueError(f"Not a blockable resource type: {blocked_type}")
+        self.blocked_hosts = frozenset(map(lambda host: host.lower().rstrip('.'), blocked_hosts))
+
+    def get_blocked_type(self, url: str, headers: Mapping[str, str]) -> Optional[str]:
+        """
+        This method checks if a request is blocked.
+
+        :param url: The URL of the request.
+        :type url: str
+        :param headers: The headers of the request.
+        :type headers: Mapping[str, str]
+        :return: The type of the resource if the request is blocked ('host' if it is blocked by host), otherwise None.
+        :rtype: Optional[str]
+        """
+        destination = (headers.get('Sec-Fetch-Dest') or '').lower()
+        if destination in ResourceBlockingProfile.NEVER_BLOCKED_DESTINATIONS:
+            return None
+        split_url = urlsplit(url)
+        if self.is_blocked_host((split_url.hostname or '').rstrip('.')):
+            return 'host'
+        try:
+            resource_type = ResourceBlockingProfile.TYPE_PER_DESTINATION[destination]
+        except KeyError:
+            extension = split_url.path.rsplit('/', 1)[-1].rpartition('.')[2].lower()
+            resource_type = ResourceBlockingProfile.TYPE_PER_EXTENSION.get(extension)
+        return resource_type if resource_type in self.blocked_types else None
+
+    def is_blocked_host(self, host: str) -> bool:
+        """
+        This method checks if a host name is blocked: it is a blocked host or one of their subdomains.
+
+        :param host: The host name (lowercase).
+        :type host: str
+        :return: True or False.
+        :rtype: bool
+        """
+        if len(self.blocked_hosts) == 0:
+            return False
+        index = -1
+        while True:
+            if host[index+1:] in self.blocked_hosts:
+                return True
+            index = host.find('.', index+1)
+            if index == -1:
+                return False
+
+    def __str__(self) -> str:
+        """
+        This method returns a human-readable string representation of this object.
+
+        :return: A human-readable string representation of this object.
+        :rtype: str
+        """
+        blocked = sorted(self.blocked_types) + ([f"{len(self.blocked_hosts)} hosts"] if len(self.blocked_hosts) > 0 else [])
+        return f"blocking {', '.join(blocked)}" if len(blocked) > 0 else 'no blocking'
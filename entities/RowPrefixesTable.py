@@ -28,6 +28,8 @@ class RowPrefixesTable:
     roas : `str`
         The ROAS.
     """
+    __slots__ = ('as_number', 'prefix', 'span', 'cc', 'visibility', 'rov_state', 'roas')
+
     def __init__(self, as_number: str, prefix: str, span: str, cc: str, visibility: str, rov_state: str, roas: str):
         """
         Initialize an object from a string representation of every attribute.
@@ -94,6 +96,39 @@ class RowPrefixesTable:
             raise
         self.roas = roas
 
+    @staticmethod
+    def from_values(as_number: int, prefix: ipaddress.IPv4Network, span: int, cc: str, visibility: int, rov_state: ROVStates, roas: str) -> 'RowPrefixesTable':
+        """
+        Static method that instantiates a RowPrefixesTable object from already parsed values (e.g. computed offline
+        instead of scraped).
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :param prefix: The prefix.
+        :type prefix: ipaddress.IPv4Network
+        :param span: The span.
+        :type span: int
+        :param cc: The cc.
+        :type cc: str
+        :param visibility: The visibility.
+        :type visibility: int
+        :param rov_state: The ROV state.
+        :type rov_state: ROVStates
+        :param roas: The ROAS.
+        :type roas: str
+        :return: The RowPrefixesTable object.
+        :rtype: RowPrefixesTable
+        """
+        row = RowPrefixesTable.__new__(RowPrefixesTable)
+        row.as_number = as_number
+        row.prefix = prefix
+        row.span = span
+        row.cc = cc
+        row.visibility = visibility
+        row.rov_state = rov_state
+        row.roas = roas
+        return row
+
     def __str__(self) -> str:
         """
         This method returns a human-readable string representation of this object.
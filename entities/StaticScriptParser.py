@@ -0,0 +1,118 @@
+import re
+from html.parser import HTMLParser
+from typing import Set, Optional, List, Tuple
+from urllib.parse import urljoin
+from entities.MainFrameScript import MainFrameScript
+
+
+class StaticScriptParser(HTMLParser):
+    """
+    This class represents a streaming parser of the HTML of a page (fed in chunks, see feed) that extracts the main
+    frame scripts declared in the markup: the src (made absolute against the URL of the page or its base element, as
+    the browser does) and the integrity attributes of every script element. The contents of iframes aren't part of the
+    markup of the page; script elements inside noscript and template elements are ignored, because a browser with
+    JavaScript enabled doesn't create them in the document.
+    The parser also detects if the page can add script elements while running (script-injected page): an inline script
+    that creates elements or writes markup, or a loader script (with data-main attribute). In that case the scripts of
+    the markup may be only part of the ones found by a browser.
+
+    ...
+
+    Attributes
+    ----------
+    base_url : str
+        The URL against which the src attributes are resolved.
+    scripts : Set[MainFrameScript]
+        The scripts found.
+    is_script_injected : bool
+        If the page can add script elements while running.
+    """
+    INJECTION_PATTERN = re.compile(r"createElement\s*\(|document\s*\.\s*write|<script|appendChild\s*\(|insertBefore\s*\(|insertAdjacentHTML|getScript\s*\(|importScripts\s*\(", re.IGNORECASE)
+    IGNORED_CONTAINERS = ('noscript', 'template')
+
+    def __init__(self, url: str):
+        """
+        Instantiate the parser.
+
+        :param url: The URL of the page.
+        :type url: str
+        """
+        super().__init__(convert_charrefs=True)
+        self.base_url = url
+        self.scripts: Set[MainFrameScript] = set()
+        self.is_script_injected = False
+        self.__is_base_set = False
+        self.__ignored_depth = 0
+        self.__inline_script: Optional[List[str]] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        Handles the start tag of an element: the first base element sets the URL against which the src attributes are
+        resolved; a script element with a src attribute is added to the scripts found, otherwise its content is
+        collected (inline script). Elements inside noscript and template elements are ignored.
+
+        :param tag: The name of the element (lowercase).
+        :type tag: str
+        :param attrs: The (name, value) pairs of the attributes; value is None for attributes without value.
+        :type attrs: List[Tuple[str, Optional[str]]]
+        """
+        if tag in StaticScriptParser.IGNORED_CONTAINERS:
+            self.__ignored_depth = self.__ignored_depth + 1
+            return
+        if self.__ignored_depth > 0:
+            return
+        attributes = dict(attrs)
+        if tag == 'base' and not self.__is_base_set and attributes.get('href'):
+            self.base_url = urljoin(self.base_url, attributes['href'].strip())
+            self.__is_base_set = True
+        elif tag == 'script':
+            src = attributes.get('src')
+            if src is None or src.strip() == '':
+                self.__inline_script = list()        # inline script
+            else:
+                integrity = attributes.get('integrity')
+                if integrity == '':
+                    integrity = None
+                self.scripts.add(MainFrameScript(urljoin(self.base_url, src.strip()), integrity))
+            if attributes.get('data-main') is not None:
+                self.is_script_injected = True
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        Handles a self-closing tag (e.g. <script src="..."/>) as a start tag followed, for script elements, by the end
+        tag.
+
+        :param tag: The name of the element (lowercase).
+        :type tag: str
+        :param attrs: The (name, value) pairs of the attributes; value is None for attributes without value.
+        :type attrs: List[Tuple[str, Optional[str]]]
+        """
+        if tag not in StaticScriptParser.IGNORED_CONTAINERS:
+            self.handle_starttag(tag, attrs)
+            if tag == 'script':
+                self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        """
+        Handles the end tag of an element: it closes an ignored container or, for an inline script, checks if its
+        content can add script elements (see is_script_injected).
+
+        :param tag: The name of the element (lowercase).
+        :type tag: str
+        """
+        if tag in StaticScriptParser.IGNORED_CONTAINERS:
+            self.__ignored_depth = max(0, self.__ignored_depth - 1)
+        elif tag == 'script' and self.__inline_script is not None:
+            if StaticScriptParser.INJECTION_PATTERN.search(''.join(self.__inline_script)) is not None:
+                self.is_script_injected = True
+            self.__inline_script = None
+
+    def handle_data(self, data: str) -> None:
+        """
+        Handles text content: only the content of the current inline script is kept.
+
+        :param data: The text.
+        :type data: str
+        """
+        if self.__inline_script is not None:
+            self.__inline_script.append(data)
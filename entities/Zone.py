@@ -1,4 +1,5 @@
 import copy
+import types
 from typing import List, Set, Union, Dict
 from entities.paths.APath import APath
 from entities.DomainName import DomainName
@@ -11,7 +12,8 @@ from exceptions.UnknownReasonError import UnknownReasonError
 class Zone:
     """
     This class represent a simplified DNS zone. Semantically it represents only the data structures, not the fact
-    that is a real existent zone.
+    that is a real existent zone. Zones are hashed by name in the constructor; the name servers are kept as a tuple, the
+    unresolved ones as a read-only mapping, and no attribute can be reassigned afterwards.
 
     ...
 
@@ -21,11 +23,12 @@ class Zone:
         NSPath executed for the zone name.
     name : DomainName
         Zone name.
-    name_servers : List[APath]
-        List of APath associated to each mail server (so each DNS query of type A had a valid result).
-    unresolved_name_servers : Dict[DomainName, Union[DomainNonExistentError, NoAnswerError, UnknownReasonError]]
-        Dictionary of mail servers that associates each mail server domain name and the corresponding exception raised.
+    name_servers : Tuple[APath]
+        Tuple of APath associated to each mail server (so each DNS query of type A had a valid result).
+    unresolved_name_servers : Mapping[DomainName, Union[DomainNonExistentError, NoAnswerError, UnknownReasonError]]
+        Read-only mapping of mail servers that associates each mail server domain name and the corresponding exception raised.
     """
+    __slots__ = ('name_path', 'name', 'name_servers', 'unresolved_name_servers', '_hash_')
 
     def __init__(self, name_path: NSPath, nameservers_path: List[APath], unresolved_nameservers_path: Dict[DomainName, Union[DomainNonExistentError, NoAnswerError, UnknownReasonError]]):
         """
@@ -42,10 +45,28 @@ class Zone:
         """
         if len(name_path.get_resolution().values) != (len(nameservers_path) + len(unresolved_nameservers_path.keys())):
             raise ValueError
-        self.name_path = name_path
-        self.name = name_path.get_canonical_name()
-        self.name_servers = nameservers_path
-        self.unresolved_name_servers = unresolved_nameservers_path
+        object.__setattr__(self, 'name_path', name_path)
+        object.__setattr__(self, 'name', name_path.get_canonical_name())
+        object.__setattr__(self, 'name_servers', tuple(nameservers_path))
+        object.__setattr__(self, 'unresolved_name_servers', types.MappingProxyType(dict(unresolved_nameservers_path)))
+        object.__setattr__(self, '_hash_', hash(self.name))
+
+    def __setattr__(self, name: str, value) -> None:
+        """
+        Zones are kept in sets and dictionaries by name, so reassigning a field raises (the constructor sets them
+        through object.__setattr__).
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"Zone objects are immutable: can't set attribute '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        """
+        Fields of a zone are never deleted.
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"Zone objects are immutable: can't delete attribute '{name}'")
 
     def nameservers(self, as_strings=False) -> Union[List[str], List[DomainName]]:
         """
@@ -124,7 +145,7 @@ class Zone:
         :rtype: bool
         """
         if isinstance(other, Zone):
-            return self.name == other.name
+            return self.name is other.name
         else:
             return False
 
@@ -136,4 +157,4 @@ class Zone:
         :return: Hash of this object.
         :rtype: int
         """
-        return hash(self.name)
+        return self._hash_
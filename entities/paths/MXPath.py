@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 from entities.paths.Path import Path
 from entities.RRecord import RRecord
 from entities.enums.TypesRR import TypesRR
@@ -13,9 +13,11 @@ class MXPath(Path):
 
     Attributes
     ----------
-    __path : List[RRecord]
-        List of resource records, accessible through the path property as defined in the Path abstract class.
+    __path : Tuple[RRecord]
+        Tuple of resource records, accessible through the path property as defined in the Path abstract class.
     """
+    __slots__ = ('__path',)
+
     def __init__(self, rr_list: List[RRecord]):
         """
         Initialize the object.
@@ -32,8 +34,9 @@ class MXPath(Path):
         for rr in rr_list[0:-1]:
             if rr.type != TypesRR.CNAME:
                 raise ValueError
-        self.__path = rr_list
+        object.__setattr__(self, '_MXPath__path', tuple(rr_list))
+        object.__setattr__(self, '_hash_', hash((self.get_resolution(), self.get_qname())))
 
     @property
-    def path(self) -> List[RRecord]:
+    def path(self) -> Tuple[RRecord]:
         return self.__path
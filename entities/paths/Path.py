@@ -2,7 +2,7 @@ import abc
 from exceptions.DomainNameNotInPathError import DomainNameNotInPathError
 from utils import resource_records_utils
 from abc import ABC
-from typing import List, Union, Iterator
+from typing import List, Union, Iterator, Tuple
 from entities.DomainName import DomainName
 from entities.RRecord import RRecord
 
@@ -17,23 +17,21 @@ class Path(ABC):
         www.youtube.com. --CNAME-> youtube-ui.l.google.com. ==A=> [142.250.180.174, .. ]
 
     This class is an abstract data structure for this chain of resource records, that doesn't take in account the final
-    'resolution' resource record.
+    'resolution' resource record. Subclasses store the chain as a tuple and, as last step of their constructor, its
+    hash (see __hash__): from then on the path can't be modified.
 
     ...
 
     Attributes
     ----------
-    path : List[RRecord]
-        Abstract property. List of resource records.
+    path : Tuple[RRecord]
+        Abstract property. Tuple of resource records.
     """
-    @property
-    @abc.abstractmethod
-    def path(self) -> List[RRecord]:
-        raise NotImplementedError
+    __slots__ = ('_hash_',)
 
-    @path.setter
+    @property
     @abc.abstractmethod
-    def path(self, new_val: List[RRecord]) -> List[RRecord]:
+    def path(self) -> Tuple[RRecord]:
         raise NotImplementedError
 
     def get_resolution(self) -> RRecord:
@@ -57,7 +55,7 @@ class Path(ABC):
         :rtype: Union[List[RRecord], List[DomainName]]
         """
         if as_resource_records:
-            return self.path[0:-1]
+            return list(self.path[0:-1])
         else:
             result = list()
             result.append(self.path[0].name)
@@ -155,7 +153,24 @@ class Path(ABC):
         :return: Hash of this object.
         :rtype: int
         """
-        return hash((self.get_resolution(), self.get_qname()))
+        return self._hash_
+
+    def __setattr__(self, name: str, value) -> None:
+        """
+        The chain is fixed by the subclass constructor (through object.__setattr__) together with its hash: every
+        assignment raises.
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"Path objects are immutable: can't set attribute '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        """
+        The chain of a path is never deleted.
+
+        :raise AttributeError: Always.
+        """
+        raise AttributeError(f"Path objects are immutable: can't delete attribute '{name}'")
 
     def __iter__(self) -> Iterator[RRecord]:
         """
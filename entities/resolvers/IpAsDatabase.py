@@ -1,11 +1,16 @@
 import csv
 import ipaddress
+import mmap
+import os
+import shutil
+import struct
 from pathlib import Path
-from typing import List, Set
+from typing import List, Set, Iterable, Optional, Dict
+import numpy as np
 from entities.EntryIpAsDatabase import EntryIpAsDatabase
 from exceptions.AutonomousSystemNotFoundError import AutonomousSystemNotFoundError
 from exceptions.FileWithExtensionNotFoundError import FileWithExtensionNotFoundError
-from static_variables import INPUT_FOLDER_NAME
+from static_variables import INPUT_FOLDER_NAME, IP_ASN_COMPILED_DATABASE_NAME, IP_ASN_PREVIOUS_COMPILED_DATABASE_NAME
 from utils import file_utils
 
 
@@ -14,22 +19,57 @@ class IpAsDatabase:
     This class represent an object that read the .tsv database inserted in the 'input' folder of the project root
     directory (PRD) and provides the necessary methods to query such database to return a match with an Autonomous
     System. The instantiation of an object of this class is bind to the existence of the .tsv database.
+    The database is kept as an interval index: the ranges are stored (ordered by start) as arrays of unsigned 32-bit
+    integers, so many IP addresses can be resolved at once with a vectorized binary search.
+    The .tsv database is compiled once in a binary file (put in the same folder) which is then memory-mapped: every
+    array is a read-only view of the mapped file, so loading is almost instant and the pages are shared between
+    processes. The compiled file is rebuilt when it is older than the .tsv database.
+
+    The compiled file is made of a header (magic bytes, number of ranges, size of the string table) followed by 7
+    little-endian unsigned 32-bit columns of the same length (start, end, AS number, country code offset, description
+    offset, AS number inverted index, ordered AS numbers) and by a table of null-terminated UTF-8 strings, without
+    duplicates. The AS number inverted index contains the indexes of the ranges ordered by AS number (and then by
+    start), so all the ranges of an Autonomous System are contiguous in it.
+    When the compiled database is rebuilt, the one it replaces is kept as the previous compiled database (if there isn't
+    one already), so the stored results can be reconciled with the differences between the two snapshots.
 
     Attributes
     ----------
     filepath : str
         The absolute filepath of the .tsv database.
+    compiled_filepath : str
+        The absolute filepath of the compiled database.
+    previous_compiled_filepath : str
+        The absolute filepath of the previous compiled database.
     column_separator : str
         The character separator between every column-value of each entry
-    entries : List[EntryIpAsDatabase]
-        All the entries of the database.
+    start_ip_ranges : np.ndarray
+        The start of every range as unsigned 32-bit integer, ordered.
+    end_ip_ranges : np.ndarray
+        The end of every range as unsigned 32-bit integer.
+    as_numbers : np.ndarray
+        The Autonomous System number of every range.
+    country_code_offsets : np.ndarray
+        The offset in the string table of the country code of every range.
+    as_description_offsets : np.ndarray
+        The offset in the string table of the Autonomous System brief description of every range.
+    as_number_index : np.ndarray
+        The indexes of the ranges ordered by AS number.
+    ordered_as_numbers : np.ndarray
+        The AS numbers ordered, aligned with as_number_index.
+    entries_cache : Dict[int, EntryIpAsDatabase]
+        The entries already requested, by index, so that their CIDR decomposition is computed only once.
     """
+    MAGIC = b'IPASDB02'
+    NUMBER_OF_COLUMNS = 7
+    HEADER = struct.Struct('<8sII')
+    COLUMN_DTYPE = np.dtype('<u4')
 
     def __init__(self, project_root_directory=Path.cwd(), column_separator='\t'):      # '\t' = TAB
         """
-        Instantiate an IpAsDatabase object setting the filepath of the .tsv database file and then the file is read
-        in order to populate a list with all the database entries. The column_separator string is used when parsing the
-        .tsv file, which means in this method and the load() one.
+        Instantiate an IpAsDatabase object setting the filepath of the .tsv database file and then the compiled database
+        is loaded (compiling it before if necessary). The column_separator string is used when parsing the .tsv file,
+        which means in this method and the load() one.
         Path.cwd() returns the current working directory which depends upon the entry point of the application; in
         particular, if we start the application from the main.py file in the PRD, every time Path.cwd() is encountered
         (even in methods belonging to files that are in sub-folders with respect to PRD) then the actual PRD is
@@ -54,113 +94,369 @@ class IpAsDatabase:
             with open(filepath, "r", encoding='utf-8') as f:
                 f.close()
             self.filepath = filepath
+            self.compiled_filepath = str(file.parent / IP_ASN_COMPILED_DATABASE_NAME)
+            self.previous_compiled_filepath = str(file.parent / IP_ASN_PREVIOUS_COMPILED_DATABASE_NAME)
             self.column_separator = column_separator
-            self.entries = list()
+            self.mapped_file = None
+            self.entries_cache = dict()
+            self.start_ip_ranges = np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
+            self.end_ip_ranges = np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
+            self.as_numbers = np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
+            self.country_code_offsets = np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
+            self.as_description_offsets = np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
+            self.as_number_index = np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
+            self.ordered_as_numbers = np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
             self.load()
         except OSError:
             raise
 
     def resolve_range(self, ip: ipaddress.IPv4Address) -> EntryIpAsDatabase:
         """
-        Method which concern is to resolve the ip parameter using the database. It uses a binary search approach
-        considering that the .tsv database is ordered (following attribute start_ip_range) to gain performance.
+        Method which concern is to resolve the ip parameter using the database. It is a wrapper of the resolve_ranges
+        method for a single IP address.
 
         :param ip: The ip address parameter.
         :type ip: ipaddress.IPv4Address
-        :raises ValueError: If the binary search auxiliary method raises a ValueError exception. In particular it is
-        impossible to instantiate a valid Ipv4Address from an entry of the .tsv database.
-        If the matched entry is formatted wrongly, not as described in https://iptoasn.com/. In particular one of 3
-        errors occurred:
-            - the start_ip_range is not a valid ip address
-            - the end_ip_range is not a valid ip address
-            - the as_number is not a valid integer number
         :raise AutonomousSystemNotFoundError: If there is no Autonomous System that match the ip parameter.
-        :raise ValueError: An entry of the database is not well-formatted as described in https://iptoasn.com/.
         :returns: An EntryIpAsDatabase object of the matched entry in the database.
         :rtype: EntryIpAsDatabase
         """
-        try:
-            index = IpAsDatabase.__binary_search(self.entries, ip)
-        except ValueError:
-            raise ValueError(f"!!! Database is file is not well-formatted !!!")
-        if index == -1:
+        entry = self.resolve_ranges([ip])[0]
+        if entry is None:
             raise AutonomousSystemNotFoundError(ip.exploded)
-        else:
-            try:
-                return self.entries[index]
-            except ValueError:
-                raise
+        return entry
 
-    @staticmethod
-    def __binary_search(array_entries: List[EntryIpAsDatabase], ip_param: ipaddress.IPv4Address) -> int:
+    def resolve_ranges(self, ips: Iterable[ipaddress.IPv4Address]) -> List[Optional[EntryIpAsDatabase]]:
         """
-        Auxiliary method that is concerned to implement binary search approach in the resolve method above.
+        Method which concern is to resolve all the ip addresses parameter in one call, using a vectorized binary search
+        on the ordered ranges of the database.
 
-        :param array_entries: All the entries.
-        :type array_entries: List[EntryIpAsDatabase]
-        :param ip_param: The ip parameter.
-        :type ip_param: ipaddress.IPv4Address
-        :raises ValueError: An entry of the database is not well-formatted as described in https://iptoasn.com/.
-        :returns: The corresponding index of the entry matched in array_entries. It returns -1 if nothing is found.
-        :rtype: int
+        :param ips: The ip addresses.
+        :type ips: Iterable[ipaddress.IPv4Address]
+        :returns: For each ip address (same order) the matched entry in the database, or None if there is no
+        Autonomous System that match such ip address.
+        :rtype: List[Optional[EntryIpAsDatabase]]
         """
-        inf = 0
-        sup = len(array_entries) - 1
-        while inf <= sup:
-            if sup - inf <= 2:
-                print('', end='')
-                pass
-            med = (inf + sup) // 2
-            try:
-                start = array_entries[med].start_ip_range
-                end = array_entries[med].end_ip_range
-                if end < ip_param:
-                    inf = med + 1
-                elif start > ip_param:
-                    sup = med - 1
-                else:
-                    return med
-            except ValueError:
-                raise
-        return -1
+        indexes = self.search_indexes(ips)
+        return list(map(lambda index: None if index == -1 else self.get_entry(index), indexes.tolist()))
+
+    def search_indexes(self, ips: Iterable[ipaddress.IPv4Address]) -> np.ndarray:
+        """
+        Auxiliary method that computes the index of the range containing each ip address parameter.
+
+        :param ips: The ip addresses.
+        :type ips: Iterable[ipaddress.IPv4Address]
+        :returns: The array of indexes (same order of the parameter); -1 is used when nothing is found.
+        :rtype: np.ndarray
+        """
+        int_ips = np.fromiter(map(int, ips), dtype=np.uint32)
+        indexes = np.searchsorted(self.start_ip_ranges, int_ips, side='right') - 1
+        found = indexes >= 0
+        found[found] = int_ips[found] <= self.end_ip_ranges[indexes[found]]
+        return np.where(found, indexes, -1)
+
+    def get_entry(self, index: int) -> EntryIpAsDatabase:
+        """
+        This method returns the database entry at a certain index. Entries are instantiated at the first request and
+        then kept.
+
+        :param index: The index.
+        :type index: int
+        :raise IndexError: If the index is out of range.
+        :returns: The EntryIpAsDatabase object.
+        :rtype: EntryIpAsDatabase
+        """
+        try:
+            return self.entries_cache[index]
+        except KeyError:
+            pass
+        entry = EntryIpAsDatabase.from_values(ipaddress.IPv4Address(int(self.start_ip_ranges[index])),
+                                             ipaddress.IPv4Address(int(self.end_ip_ranges[index])),
+                                             int(self.as_numbers[index]),
+                                             self._read_string(int(self.country_code_offsets[index])),
+                                             self._read_string(int(self.as_description_offsets[index])))
+        self.entries_cache[index] = entry
+        return entry
+
+    def _read_string(self, offset: int) -> str:
+        """
+        Auxiliary method that reads a null-terminated string from the string table of the compiled database.
+
+        :param offset: The offset of the string in the string table.
+        :type offset: int
+        :returns: The string.
+        :rtype: str
+        """
+        start = self.strings_offset + offset
+        end = self.mapped_file.find(b'\x00', start)
+        return self.mapped_file[start:end].decode('utf-8')
 
     def get_entries_from_as_number(self, as_number: int) -> Set[EntryIpAsDatabase]:
         """
-        This method returns the database entry that matches the autonomous system associated with the parameter.
-        The method needs to control every single entry, so it is pretty slow.
+        This method returns the database entries that match the autonomous system associated with the parameter.
+        It uses the AS number inverted index, so only the matched entries are visited.
 
         :param as_number: The autonomous system number.
         :type as_number: int
         :raise AutonomousSystemNotFoundError: If no entry is found.
-        :raise ValueError: If the matched entry is not well-formatted.
-        :returns: An EntryIpAsDatabase object of the matched entry in the database.
-        :rtype: EntryIpAsDatabase
+        :returns: A set of EntryIpAsDatabase objects of the matched entries in the database.
+        :rtype: Set[EntryIpAsDatabase]
         """
-        entries = set()
-        for entry in self.entries:
-            if entry.as_number == as_number:
-                entries.add(entry)
-        if len(entries) == 0:
+        indexes = self.get_indexes_from_as_number(as_number)
+        if len(indexes) == 0:
             raise AutonomousSystemNotFoundError(as_number)
         else:
-            return entries
+            return set(map(lambda index: self.get_entry(index), indexes.tolist()))
+
+    def get_indexes_from_as_number(self, as_number: int) -> np.ndarray:
+        """
+        This method returns the indexes (ordered) of the ranges announced by the autonomous system associated with the
+        parameter, using the AS number inverted index.
+
+        :param as_number: The autonomous system number.
+        :type as_number: int
+        :returns: The array of indexes; it is empty if no range is found.
+        :rtype: np.ndarray
+        """
+        if as_number < 0 or as_number > np.iinfo(IpAsDatabase.COLUMN_DTYPE).max:
+            return np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
+        first = np.searchsorted(self.ordered_as_numbers, as_number, side='left')
+        last = np.searchsorted(self.ordered_as_numbers, as_number, side='right')
+        return self.as_number_index[first:last]
+
+    def __len__(self) -> int:
+        """
+        The number of entries of the database.
+
+        :return: The number of entries.
+        :rtype: int
+        """
+        return len(self.start_ip_ranges)
 
     def load(self) -> None:
         """
-        Auxiliary method that is concerned to populate the entries attribute from the .tsv file database. When called it
-        clears all the entries currently saved in the object. If an entry is not well-formatted, the error is ignored.
+        Auxiliary method that is concerned to map the compiled database in memory and to populate the ranges arrays as
+        views of it. When called it releases the arrays currently saved in the object. If the compiled database is
+        absent, not valid or older than the .tsv database, it is compiled before.
+
+        :raise BufferError: If a view of the currently mapped file is still referenced outside this object.
+        :raise OSError: If is there a problem reading or writing the files.
+        """
+        self.close()
+        if not IpAsDatabase.is_compiled_database_valid(self.compiled_filepath, self.filepath):
+            IpAsDatabase.compile(self.filepath, self.compiled_filepath, column_separator=self.column_separator, previous_compiled_filepath=self.previous_compiled_filepath)
+        self._map(self.compiled_filepath)
 
+    def _map(self, compiled_filepath: str) -> None:
         """
-        if len(self.entries) == 0:
+        Auxiliary method that maps a compiled database in memory and populates the ranges arrays as views of it.
+
+        :param compiled_filepath: The filepath of the compiled database.
+        :type compiled_filepath: str
+        :raise OSError: If is there a problem reading the file.
+        """
+        with open(compiled_filepath, 'rb') as f:
+            mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            f.close()
+        magic, count, strings_size = IpAsDatabase.HEADER.unpack_from(mapped_file, 0)
+        columns = list()
+        for i in range(IpAsDatabase.NUMBER_OF_COLUMNS):
+            offset = IpAsDatabase.HEADER.size + i * count * IpAsDatabase.COLUMN_DTYPE.itemsize
+            columns.append(np.frombuffer(mapped_file, dtype=IpAsDatabase.COLUMN_DTYPE, count=count, offset=offset))
+        self.mapped_file = mapped_file
+        self.entries_cache = dict()
+        self.strings_offset = IpAsDatabase.HEADER.size + IpAsDatabase.NUMBER_OF_COLUMNS * count * IpAsDatabase.COLUMN_DTYPE.itemsize
+        self.start_ip_ranges, self.end_ip_ranges, self.as_numbers, self.country_code_offsets, self.as_description_offsets, self.as_number_index, self.ordered_as_numbers = columns
+
+    def close(self) -> None:
+        """
+        This method releases the compiled database mapped in memory: the ranges arrays (views of the mapped file) are
+        dropped and the file is unmapped, so that it can be replaced or deleted (on Windows a mapped file can't be). The
+        object is empty afterwards, until load() is called again.
+
+        :raise BufferError: If a view of the mapped file is still referenced outside this object.
+        """
+        empty = np.empty(0, dtype=IpAsDatabase.COLUMN_DTYPE)
+        self.start_ip_ranges = self.end_ip_ranges = self.as_numbers = empty
+        self.country_code_offsets = self.as_description_offsets = empty
+        self.as_number_index = self.ordered_as_numbers = empty
+        self.entries_cache = dict()
+        if self.mapped_file is not None:
+            mapped_file = self.mapped_file
+            self.mapped_file = None
+            try:
+                mapped_file.close()
+            except BufferError:
+                raise
+
+    def get_strings(self) -> Dict[int, str]:
+        """
+        This method returns the whole string table of the compiled database.
+
+        :returns: A dictionary of the strings by offset.
+        :rtype: Dict[int, str]
+        """
+        result = dict()
+        offset = 0
+        for raw in self.mapped_file[self.strings_offset:].split(b'\x00')[:-1]:
+            result[offset] = raw.decode('utf-8')
+            offset = offset + len(raw) + 1
+        return result
+
+    def has_previous(self) -> bool:
+        """
+        This method checks if there is a well-formed previous compiled database, i.e. the snapshot the stored results
+        were computed with before the last update.
+
+        :returns: True or False.
+        :rtype: bool
+        """
+        return IpAsDatabase.is_compiled_database_well_formed(self.previous_compiled_filepath)
+
+    def get_previous(self) -> 'IpAsDatabase':
+        """
+        This method returns the previous compiled database as another (read-only) IpAsDatabase object.
+
+        :raise FileNotFoundError: If there is no previous compiled database.
+        :raise OSError: If is there a problem reading the file.
+        :returns: The previous database.
+        :rtype: IpAsDatabase
+        """
+        if not self.has_previous():
+            raise FileNotFoundError(self.previous_compiled_filepath)
+        previous = IpAsDatabase.__new__(IpAsDatabase)
+        previous.filepath = self.filepath
+        previous.compiled_filepath = self.previous_compiled_filepath
+        previous.previous_compiled_filepath = self.previous_compiled_filepath
+        previous.column_separator = self.column_separator
+        previous.mapped_file = None
+        previous._map(self.previous_compiled_filepath)
+        return previous
+
+    def discard_previous(self) -> None:
+        """
+        This method deletes the previous compiled database, once the stored results are reconciled with the current one.
+        The object returned by get_previous() must be closed before.
+
+        :raise OSError: If is there a problem deleting the file.
+        """
+        try:
+            os.remove(self.previous_compiled_filepath)
+        except FileNotFoundError:
             pass
-        else:
-            self.entries.clear()
-        with open(self.filepath, "r", encoding='utf-8') as f:        # FileNotFoundError
-            rd = csv.reader(f, delimiter=self.column_separator, quotechar='"')
+
+    @staticmethod
+    def is_compiled_database_valid(compiled_filepath: str, tsv_filepath: str) -> bool:
+        """
+        Static method that checks if the compiled database exists, is well-formed and is not older than the .tsv
+        database.
+
+        :param compiled_filepath: The filepath of the compiled database.
+        :type compiled_filepath: str
+        :param tsv_filepath: The filepath of the .tsv database.
+        :type tsv_filepath: str
+        :returns: True or False.
+        :rtype: bool
+        """
+        try:
+            if file_utils.last_modified(compiled_filepath) < file_utils.last_modified(tsv_filepath):
+                return False
+        except OSError:
+            return False
+        return IpAsDatabase.is_compiled_database_well_formed(compiled_filepath)
+
+    @staticmethod
+    def is_compiled_database_well_formed(compiled_filepath: str) -> bool:
+        """
+        Static method that checks if the compiled database exists and is well-formed: its header is valid and its size
+        matches the one declared in the header.
+
+        :param compiled_filepath: The filepath of the compiled database.
+        :type compiled_filepath: str
+        :returns: True or False.
+        :rtype: bool
+        """
+        try:
+            size = os.path.getsize(compiled_filepath)
+            with open(compiled_filepath, 'rb') as f:
+                header = f.read(IpAsDatabase.HEADER.size)
+                f.close()
+        except OSError:
+            return False
+        if len(header) != IpAsDatabase.HEADER.size:
+            return False
+        magic, count, strings_size = IpAsDatabase.HEADER.unpack(header)
+        return magic == IpAsDatabase.MAGIC and size == IpAsDatabase.HEADER.size + IpAsDatabase.NUMBER_OF_COLUMNS * count * IpAsDatabase.COLUMN_DTYPE.itemsize + strings_size
+
+    @staticmethod
+    def compile(tsv_filepath: str, compiled_filepath: str, column_separator='\t', previous_compiled_filepath=None) -> None:
+        """
+        Static method that compiles the .tsv database in the binary format described in the class documentation. If an
+        entry is not well-formatted, the error is ignored. The file is written in a temporary file which then replaces
+        atomically the compiled database, so processes that are reading the previous one are not affected.
+        If the previous_compiled_filepath parameter is set and there is no previous compiled database yet, the replaced
+        compiled database is kept there (hard link, or copy if not supported).
+
+        :param tsv_filepath: The filepath of the .tsv database.
+        :type tsv_filepath: str
+        :param compiled_filepath: The filepath of the compiled database.
+        :type compiled_filepath: str
+        :param column_separator: The character separator between every column-value of each entry
+        :type column_separator: str
+        :param previous_compiled_filepath: The filepath where the replaced compiled database is kept.
+        :type previous_compiled_filepath: str or None
+        :raise OSError: If is there a problem reading or writing the files.
+        """
+        starts = list()
+        ends = list()
+        as_numbers = list()
+        country_code_offsets = list()
+        as_description_offsets = list()
+        string_offsets: Dict[str, int] = dict()
+        strings = bytearray()
+
+        def string_offset(string: str) -> int:
+            try:
+                return string_offsets[string]
+            except KeyError:
+                string_offsets[string] = len(strings)
+                strings.extend(string.replace('\x00', '').encode('utf-8'))
+                strings.append(0)
+                return string_offsets[string]
+
+        with open(tsv_filepath, "r", encoding='utf-8') as f:        # FileNotFoundError
+            rd = csv.reader(f, delimiter=column_separator, quotechar='"')
             for row in rd:
+                if len(row) != 5:
+                    continue
                 try:
-                    entry = EntryIpAsDatabase(row)
-                    self.entries.append(entry)
+                    start = int(ipaddress.IPv4Address(row[0]))
+                    end = int(ipaddress.IPv4Address(row[1]))
+                    as_number = int(row[2])
                 except ValueError:
-                    pass
+                    continue
+                starts.append(start)
+                ends.append(end)
+                as_numbers.append(as_number)
+                country_code_offsets.append(string_offset(row[3]))
+                as_description_offsets.append(string_offset(row[4]))
             f.close()
+        columns = list(map(lambda column: np.array(column, dtype=IpAsDatabase.COLUMN_DTYPE), [starts, ends, as_numbers, country_code_offsets, as_description_offsets]))
+        order = np.argsort(columns[0], kind='stable')
+        columns = list(map(lambda column: column[order], columns))
+        as_number_index = np.argsort(columns[2], kind='stable').astype(IpAsDatabase.COLUMN_DTYPE)
+        columns.append(as_number_index)
+        columns.append(columns[2][as_number_index])
+        temp_filepath = compiled_filepath + '.tmp'
+        with open(temp_filepath, 'wb') as f:
+            f.write(IpAsDatabase.HEADER.pack(IpAsDatabase.MAGIC, len(starts), len(strings)))
+            for column in columns:
+                f.write(column.tobytes())
+            f.write(strings)
+            f.close()
+        if previous_compiled_filepath is not None and os.path.isfile(compiled_filepath) and not os.path.isfile(previous_compiled_filepath):
+            try:
+                os.link(compiled_filepath, previous_compiled_filepath)
+            except OSError:
+                shutil.copyfile(compiled_filepath, previous_compiled_filepath)
+        os.replace(temp_filepath, compiled_filepath)
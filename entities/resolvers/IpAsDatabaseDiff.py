@@ -0,0 +1,189 @@
+import ipaddress
+from typing import Iterable, List
+import numpy as np
+from entities.EntryIpAsDatabase import EntryIpAsDatabase
+from entities.resolvers.IpAsDatabase import IpAsDatabase
+
+
+class IpAsDatabaseDiff:
+    """
+    This class represents the differences between 2 snapshots of the .tsv database (an old and a new IpAsDatabase
+    object). Both compiled tables are ordered by start of the range, so they are walked together with a sorted merge on
+    the (start, end) couple of every range:
+        1- removed: the ranges of the old table that aren't in the new one;
+        2- added: the ranges of the new table that aren't in the old one;
+        3- changed: the ranges present in both tables whose Autonomous System number, country code or description
+        changed.
+    A range that is split or merged appears as removed and then added.
+
+    ...
+
+    Attributes
+    ----------
+    old_database : IpAsDatabase
+        The old snapshot.
+    new_database : IpAsDatabase
+        The new snapshot.
+    removed_indexes : np.ndarray
+        The indexes (ordered) of the removed ranges in the old table.
+    added_indexes : np.ndarray
+        The indexes (ordered) of the added ranges in the new table.
+    changed_old_indexes : np.ndarray
+        The indexes (ordered) of the changed ranges in the old table.
+    changed_new_indexes : np.ndarray
+        The indexes of the changed ranges in the new table, aligned with changed_old_indexes.
+    """
+    __slots__ = ('old_database', 'new_database', 'removed_indexes', 'added_indexes', 'changed_old_indexes', 'changed_new_indexes', '_old_starts_', '_old_ends_', '_new_starts_', '_new_ends_')
+
+    def __init__(self, old_database: IpAsDatabase, new_database: IpAsDatabase):
+        """
+        Instantiate an IpAsDatabaseDiff object computing the differences between the 2 databases parameters.
+
+        :param old_database: The old snapshot.
+        :type old_database: IpAsDatabase
+        :param new_database: The new snapshot.
+        :type new_database: IpAsDatabase
+        """
+        self.old_database = old_database
+        self.new_database = new_database
+        old_keys = IpAsDatabaseDiff._range_keys(old_database)
+        new_keys = IpAsDatabaseDiff._range_keys(new_database)
+        # sorted merge: for each old range the position of the same range in the new table (if present)
+        positions = np.searchsorted(new_keys, old_keys)
+        matched = positions < len(new_keys)
+        matched[matched] = new_keys[positions[matched]] == old_keys[matched]
+        old_matched_indexes = np.flatnonzero(matched)
+        new_matched_indexes = positions[matched]
+        is_new_matched = np.zeros(len(new_keys), dtype=bool)
+        is_new_matched[new_matched_indexes] = True
+        differs = old_database.as_numbers[old_matched_indexes] != new_database.as_numbers[new_matched_indexes]
+        differs |= IpAsDatabaseDiff._translate_offsets(old_database, new_database, old_database.country_code_offsets[old_matched_indexes]) != new_database.country_code_offsets[new_matched_indexes]
+        differs |= IpAsDatabaseDiff._translate_offsets(old_database, new_database, old_database.as_description_offsets[old_matched_indexes]) != new_database.as_description_offsets[new_matched_indexes]
+        self.removed_indexes = np.flatnonzero(~matched)
+        self.added_indexes = np.flatnonzero(~is_new_matched)
+        self.changed_old_indexes = old_matched_indexes[differs]
+        self.changed_new_indexes = new_matched_indexes[differs]
+        # the old ranges no longer valid and the new ranges never seen, both ordered and without overlaps
+        old_indexes = np.union1d(self.removed_indexes, self.changed_old_indexes)
+        new_indexes = np.union1d(self.added_indexes, self.changed_new_indexes)
+        self._old_starts_ = old_database.start_ip_ranges[old_indexes]
+        self._old_ends_ = old_database.end_ip_ranges[old_indexes]
+        self._new_starts_ = new_database.start_ip_ranges[new_indexes]
+        self._new_ends_ = new_database.end_ip_ranges[new_indexes]
+
+    def is_empty(self) -> bool:
+        """
+        This method returns if the 2 snapshots are equal.
+
+        :return: True or False.
+        :rtype: bool
+        """
+        return len(self.removed_indexes) == 0 and len(self.added_indexes) == 0 and len(self.changed_old_indexes) == 0
+
+    def get_removed_entries(self) -> List[EntryIpAsDatabase]:
+        """
+        This method returns the removed entries of the old snapshot.
+
+        :return: The list of entries, ordered.
+        :rtype: List[EntryIpAsDatabase]
+        """
+        return list(map(lambda index: self.old_database.get_entry(index), self.removed_indexes.tolist()))
+
+    def get_added_entries(self) -> List[EntryIpAsDatabase]:
+        """
+        This method returns the added entries of the new snapshot.
+
+        :return: The list of entries, ordered.
+        :rtype: List[EntryIpAsDatabase]
+        """
+        return list(map(lambda index: self.new_database.get_entry(index), self.added_indexes.tolist()))
+
+    def get_changed_entries(self) -> List[EntryIpAsDatabase]:
+        """
+        This method returns the changed entries of the new snapshot.
+
+        :return: The list of entries, ordered.
+        :rtype: List[EntryIpAsDatabase]
+        """
+        return list(map(lambda index: self.new_database.get_entry(index), self.changed_new_indexes.tolist()))
+
+    def get_affected_mask(self, ips: Iterable[ipaddress.IPv4Address]) -> np.ndarray:
+        """
+        This method computes which ip addresses parameter could have a different resolution in the new snapshot: the
+        ones belonging to a removed or changed range of the old snapshot, or to an added or changed range of the new
+        one. All the other ip addresses keep the same entry.
+
+        :param ips: The ip addresses.
+        :type ips: Iterable[ipaddress.IPv4Address]
+        :return: An array of booleans, aligned with the ip addresses parameter.
+        :rtype: np.ndarray
+        """
+        int_ips = np.fromiter(map(int, ips), dtype=np.uint32)
+        return IpAsDatabaseDiff._are_contained(int_ips, self._old_starts_, self._old_ends_) | IpAsDatabaseDiff._are_contained(int_ips, self._new_starts_, self._new_ends_)
+
+    def __str__(self) -> str:
+        """
+        This method returns a human-readable string representation of this object.
+
+        :return: A human-readable string representation of this object.
+        :rtype: str
+        """
+        return f"{len(self.added_indexes)} added, {len(self.removed_indexes)} removed, {len(self.changed_old_indexes)} changed ranges"
+
+    @staticmethod
+    def _range_keys(database: IpAsDatabase) -> np.ndarray:
+        """
+        Auxiliary static method that packs the (start, end) couple of every range in a single unsigned 64-bit integer.
+        The keys keep the order of the table.
+
+        :param database: The database.
+        :type database: IpAsDatabase
+        :return: The array of keys.
+        :rtype: np.ndarray
+        """
+        return (database.start_ip_ranges.astype(np.uint64) << np.uint64(32)) | database.end_ip_ranges.astype(np.uint64)
+
+    @staticmethod
+    def _translate_offsets(old_database: IpAsDatabase, new_database: IpAsDatabase, old_offsets: np.ndarray) -> np.ndarray:
+        """
+        Auxiliary static method that translates offsets of the old string table in offsets of the new one, so strings
+        of the 2 snapshots are compared as integers. A string not present in the new table is translated to a value
+        that is not a valid offset.
+
+        :param old_database: The old snapshot.
+        :type old_database: IpAsDatabase
+        :param new_database: The new snapshot.
+        :type new_database: IpAsDatabase
+        :param old_offsets: The offsets of the old string table.
+        :type old_offsets: np.ndarray
+        :return: The translated offsets.
+        :rtype: np.ndarray
+        """
+        if len(old_offsets) == 0:
+            return old_offsets
+        new_offsets = dict(map(lambda item: (item[1], item[0]), new_database.get_strings().items()))
+        old_strings = old_database.get_strings()
+        missing = np.iinfo(IpAsDatabase.COLUMN_DTYPE).max
+        unique_offsets, inverse = np.unique(old_offsets, return_inverse=True)
+        translated = np.fromiter(map(lambda offset: new_offsets.get(old_strings[offset], missing), unique_offsets.tolist()), dtype=IpAsDatabase.COLUMN_DTYPE, count=len(unique_offsets))
+        return translated[inverse]
+
+    @staticmethod
+    def _are_contained(int_ips: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Auxiliary static method that computes which ip addresses are contained in one of the ranges parameter (ordered
+        and without overlaps), using a vectorized binary search.
+
+        :param int_ips: The ip addresses as unsigned 32-bit integers.
+        :type int_ips: np.ndarray
+        :param starts: The starts of the ranges.
+        :type starts: np.ndarray
+        :param ends: The ends of the ranges.
+        :type ends: np.ndarray
+        :return: An array of booleans, aligned with the ip addresses parameter.
+        :rtype: np.ndarray
+        """
+        indexes = np.searchsorted(starts, int_ips, side='right') - 1
+        found = indexes >= 0
+        found[found] = int_ips[found] <= ends[indexes[found]]
+        return found
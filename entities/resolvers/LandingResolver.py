@@ -1,7 +1,16 @@
-from typing import Dict, Set
+import ipaddress
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Set, Optional, Tuple, List
 import requests
+from entities.DomainName import DomainName
+from entities.HstsPreloadList import HstsPreloadList
+from entities.LandingResultCache import LandingResultCache
+from entities.RedirectionHop import RedirectionHop
+from entities.SchemeUrl import SchemeUrl
 from entities.Url import Url
 from entities.error_log.ErrorLog import ErrorLog
+from entities.paths.APath import APath
 from entities.resolvers.DnsResolver import DnsResolver
 from entities.resolvers.results.LandingSiteResult import LandingSiteResult
 from entities.resolvers.results.LandingSiteSingleSchemeResult import LandingSiteSingleSchemeResult
@@ -13,7 +22,27 @@ from utils import requests_utils
 
 class LandingResolver:
     """
-    This class' concern is to provide tools to resolve URL landing.
+    This class' concern is to provide tools to resolve URL landing. Sites are resolved concurrently by a pool of
+    threads: the HTTPS and the HTTP requests of every site are executed in parallel, with a global limit (the number of
+    threads) on the requests in flight and a limit on the concurrent requests towards the same destination. The
+    destination of a site is the first IP address of its A resolution (the domain name itself if it can't be resolved),
+    so many sites hosted by the same server aren't requested all together. Every request has a timeout.
+    All the requests go through the same session, whose connections are kept alive and pooled by host: sites sharing a
+    front end (CDN, hosting provider) or landing on the same host reuse its connections instead of a new TCP and TLS
+    handshake each. The session is shared by all the stages using this object, until close() is called.
+    Connections are opened towards the addresses of the A resolutions of the DNS resolver (and its cache) instead of
+    the OS resolver ones: the A resolution of the landing host is computed while connecting and then found in the cache
+    when the access path of the result is built, so the address connected is always the one of the access path.
+    If a LandingResultCache is set, the redirection path of a starting URL (site and scheme) is taken from it while its
+    time-to-live isn't expired (without any request). Once expired, if revalidation is enabled, only the starting URL is
+    requested: if its response (status code and redirection) is the same as the saved first hop, the whole saved path
+    is reused; otherwise the path is probed again. The cache can be bypassed (and refreshed) with force_refresh.
+    If skip_hsts_http_probes is set, the HTTP probe of a site is executed after the HTTPS one, and only if needed: a
+    browser never requests via HTTP a site that is in the HSTS preload list or that returned a valid HSTS policy in
+    its HTTPS starting page, it upgrades internally the starting URL to HTTPS instead. So for those sites the HTTP
+    result is built from the HTTPS one (see get_hsts_http_result) and the request is skipped.
+    Many results (schemes of the same site, or different sites) land on the same host: the A resolution of every
+    landing host is computed once and the same APath object is shared by all of them.
 
     ...
 
@@ -21,19 +50,68 @@ class LandingResolver:
     ----------
     dns_resolver : DnsResolver
         A DNS resolver.
+    max_workers : int
+        The maximum number of requests in flight.
+    max_requests_per_ip : int
+        The maximum number of concurrent requests towards the same destination.
+    timeout : float
+        The timeout (in seconds) for connecting and for each read of every request.
+    session : requests.Session
+        The session whose connections are reused by all the requests.
+    cache : LandingResultCache or None
+        The on-disk cache of the redirection paths.
+    revalidate : bool
+        If the expired entries of the cache are revalidated with a single request.
+    force_refresh : bool
+        If every site is probed again, ignoring (and then refreshing) the cache.
+    hsts_preload_list : HstsPreloadList or None
+        The HSTS preload list.
+    skip_hsts_http_probes : bool
+        If the HTTP probes of the sites with a known HSTS policy are skipped.
     """
-    def __init__(self, dns_resolver: DnsResolver):
+    def __init__(self, dns_resolver: DnsResolver, max_workers=32, max_requests_per_ip=4, timeout=15, cache=None, revalidate=True, force_refresh=False, hsts_preload_list=None, skip_hsts_http_probes=False):
         """
         Instantiate the object.
 
         :param dns_resolver: A DNS resolver.
         :type dns_resolver: DnsResolver
+        :param max_workers: The maximum number of requests in flight.
+        :type max_workers: int
+        :param max_requests_per_ip: The maximum number of concurrent requests towards the same destination.
+        :type max_requests_per_ip: int
+        :param timeout: The timeout (in seconds) for connecting and for each read of every request.
+        :type timeout: float
+        :param cache: The on-disk cache of the redirection paths, or None.
+        :type cache: LandingResultCache or None
+        :param revalidate: If the expired entries of the cache are revalidated with a single request.
+        :type revalidate: bool
+        :param force_refresh: If every site is probed again, ignoring (and then refreshing) the cache.
+        :type force_refresh: bool
+        :param hsts_preload_list: The HSTS preload list, or None (then only the HSTS policies returned via HTTPS are
+        considered).
+        :type hsts_preload_list: HstsPreloadList or None
+        :param skip_hsts_http_probes: If the HTTP probes of the sites with a known HSTS policy are skipped.
+        :type skip_hsts_http_probes: bool
         """
         self.dns_resolver = dns_resolver
+        self.max_workers = max_workers
+        self.max_requests_per_ip = max_requests_per_ip
+        self.timeout = timeout
+        self.session = requests_utils.create_pooled_session(pool_maxsize=max_requests_per_ip, host_resolver=self.resolve_host)
+        self.cache: Optional[LandingResultCache] = cache
+        self.revalidate = revalidate
+        self.force_refresh = force_refresh
+        self.hsts_preload_list: Optional[HstsPreloadList] = hsts_preload_list
+        self.skip_hsts_http_probes = skip_hsts_http_probes
+        self.__destinations_lock = threading.Lock()
+        self.__destinations_semaphores: Dict[str, threading.BoundedSemaphore] = dict()
+        self.__landing_a_paths_lock = threading.Lock()
+        self.__landing_a_paths: Dict[str, APath] = dict()
 
     def resolve_sites(self, sites: Set[Url]) -> Dict[Url, LandingSiteResult]:
         """
-        This methods resolves landing of all sites (web sites or script sites) parameters.
+        This methods resolves landing of all sites (web sites or script sites) parameters. Requests are executed
+        concurrently, results are printed in the order of the sites.
 
         :param sites: A set of sites, that are URLs.
         :type sites: Set[Url]
@@ -41,42 +119,56 @@ class LandingResolver:
         :rtype: Dict[Url, LandingSiteResult]
         """
         final_results = dict()
-        for i, site in enumerate(sites):
-            print(f"Trying to resolve landing page of site[{i+1}/{len(sites)}]: {site}")
-            resolver_result = self.resolve_site(site)
-            final_results[site] = resolver_result
-
-            # HTTPS
-            print(f"***** via HTTPS *****")
-            if resolver_result.https is not None:
-                print(f"HTTPS Landing url: {resolver_result.https.url}")
-                print(f"HTTPS Access Path: {resolver_result.https.a_path.stamp()}")
-                print(f"Strict Transport Security: {resolver_result.https.hsts}")
-                print(f"Landing scheme: {resolver_result.https.url.stamp_landing_scheme()}")
-                print(f"HTTPS Redirection path:")
-                for index, url in enumerate(resolver_result.https.redirection_path):
-                    print(f"----> [{index + 1}/{len(resolver_result.https.redirection_path)}]: {url}")
+        sites = list(sites)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='landing-resolver') as executor:
+            if self.skip_hsts_http_probes:
+                # the HTTP probe depends on the HTTPS result
+                futures = list(map(lambda site: executor.submit(self.resolve_site, site), sites))
             else:
-                print(f"Impossible to land somewhere via HTTPS...")
-
-            # HTTP
-            print(f"***** via HTTP *****")
-            if resolver_result.http is not None:
-                print(f"HTTP Landing url: {resolver_result.http.url}")
-                print(f"HTTP Access Path: {resolver_result.http.a_path.stamp()}")
-                print(f"Strict Transport Security: {resolver_result.http.hsts}")
-                print(f"Landing scheme: {resolver_result.http.url.stamp_landing_scheme()}")
-                print(f"HTTP Redirection path:")
-                for index, url in enumerate(resolver_result.http.redirection_path):
-                    print(f"----> [{index + 1}/{len(resolver_result.http.redirection_path)}]: {url}")
-            else:
-                print(f"Impossible to land somewhere via HTTP...")
-            print()
+                futures = list(map(lambda site: (executor.submit(self.__resolve_single_scheme, site, True), executor.submit(self.__resolve_single_scheme, site, False)), sites))
+            for i, site in enumerate(sites):
+                print(f"Trying to resolve landing page of site[{i+1}/{len(sites)}]: {site}")
+                if self.skip_hsts_http_probes:
+                    resolver_result = futures[i].result()
+                else:
+                    https_result, https_error_log = futures[i][0].result()
+                    http_result, http_error_log = futures[i][1].result()
+                    resolver_result = LandingSiteResult(https_result, http_result, [error_log for error_log in (https_error_log, http_error_log) if error_log is not None])
+                final_results[site] = resolver_result
+
+                # HTTPS
+                print(f"***** via HTTPS *****")
+                if resolver_result.https is not None:
+                    print(f"HTTPS Landing url: {resolver_result.https.url}")
+                    print(f"HTTPS Access Path: {resolver_result.https.a_path.stamp()}")
+                    print(f"Strict Transport Security: {resolver_result.https.hsts}")
+                    print(f"Landing scheme: {resolver_result.https.url.stamp_landing_scheme()}")
+                    print(f"HTTPS Redirection path:")
+                    for index, hop in enumerate(resolver_result.https.redirection_hops):
+                        print(f"----> [{index + 1}/{len(resolver_result.https.redirection_hops)}]: {hop}")
+                else:
+                    print(f"Impossible to land somewhere via HTTPS...")
+
+                # HTTP
+                print(f"***** via HTTP *****")
+                if resolver_result.http is not None:
+                    print(f"HTTP Landing url: {resolver_result.http.url}")
+                    print(f"HTTP Access Path: {resolver_result.http.a_path.stamp()}")
+                    print(f"Strict Transport Security: {resolver_result.http.hsts}")
+                    print(f"Landing scheme: {resolver_result.http.url.stamp_landing_scheme()}")
+                    print(f"HTTP Redirection path:")
+                    for index, hop in enumerate(resolver_result.http.redirection_hops):
+                        print(f"----> [{index + 1}/{len(resolver_result.http.redirection_hops)}]: {hop}")
+                else:
+                    print(f"Impossible to land somewhere via HTTP...")
+                print()
+        self.save_cache()
         return final_results
 
     def resolve_site(self, url: Url) -> LandingSiteResult:
         """
-        This methods resolves landing of a site, using HTTPS and HTTP as schemes.
+        This methods resolves landing of a site, using HTTPS and HTTP as schemes. If skip_hsts_http_probes is set and
+        the site has a known HSTS policy, the HTTP result is built from the HTTPS one without any request.
         If an error occurs, it will be added in the error_logs attribute of the result and the result is set to None,
         so exceptions are silent.
 
@@ -86,34 +178,218 @@ class LandingResolver:
         :rtype: LandingSiteResult
         """
         error_logs = list()
+        https_result, https_error_log = self.__resolve_single_scheme(url, https=True)
+        if https_error_log is not None:
+            error_logs.append(https_error_log)
+        http_result = None
+        if self.skip_hsts_http_probes and https_result is not None:
+            http_result = self.get_hsts_http_result(url, https_result)
+        if http_result is None:
+            http_result, http_error_log = self.__resolve_single_scheme(url, https=False)
+            if http_error_log is not None:
+                error_logs.append(http_error_log)
+        return LandingSiteResult(https_result, http_result, error_logs)
+
+    def has_known_hsts_policy(self, site: Url, https_result: LandingSiteSingleSchemeResult) -> bool:
+        """
+        This method checks if a browser would request a site only via HTTPS: its domain name is in the HSTS preload
+        list (if set) or the first hop of its HTTPS redirection path returned a valid HSTS policy.
+
+        :param site: A site, that is an URL.
+        :type site: Url
+        :param https_result: The HTTPS result of the site.
+        :type https_result: LandingSiteSingleSchemeResult
+        :return: True or False.
+        :rtype: bool
+        """
+        if self.hsts_preload_list is not None and self.hsts_preload_list.is_preloaded(site.domain_name().string):
+            return True
+        return len(https_result.redirection_hops) > 0 and https_result.redirection_hops[0].has_hsts_policy()
+
+    def get_hsts_http_result(self, site: Url, https_result: LandingSiteSingleSchemeResult) -> Optional[LandingSiteSingleSchemeResult]:
+        """
+        This method returns the HTTP result of a site with a known HSTS policy (see has_known_hsts_policy) without any
+        request: the redirection path is the one of a browser, that is the internal redirection (307 status code, no
+        server) from the HTTP starting URL to the HTTPS one followed by the HTTPS redirection path.
+
+        :param site: A site, that is an URL.
+        :type site: Url
+        :param https_result: The HTTPS result of the site.
+        :type https_result: LandingSiteSingleSchemeResult
+        :return: The HTTP result, or None if the site has no known HSTS policy.
+        :rtype: Optional[LandingSiteSingleSchemeResult]
+        """
+        if not self.has_known_hsts_policy(site, https_result):
+            return None
+        http_url_string = site.http().string
+        internal_redirection = RedirectionHop(http_url_string, 307, None, None, site.https().string)
+        return LandingSiteSingleSchemeResult(https_result.url, [http_url_string] + https_result.redirection_path, https_result.hsts, https_result.a_path, redirection_hops=[internal_redirection] + https_result.redirection_hops)
+
+    def save_cache(self) -> None:
+        """
+        This method saves on disk the cache (if set). Errors are printed and otherwise ignored.
+
+        """
+        if self.cache is None:
+            return
         try:
-            https_result = self.do_single_request(url, https=True)
-        except (NoAnswerError, DomainNonExistentError, UnknownReasonError) as e:
-            https_result = None
-            error_logs.append(ErrorLog(e, url.https().string, str(e)))
-        except requests.exceptions.ConnectionError as e:
-            https_result = None
-            error_logs.append(ErrorLog(e, url.https().string, str(e)))
-        except Exception as exc:
-            https_result = None
-            error_logs.append(ErrorLog(exc, url.https().string, str(exc)))
+            self.cache.save()
+        except OSError as e:
+            print(f"!!! Landing cache can't be saved: {str(e)} !!!")
+
+    def close(self) -> None:
+        """
+        This method saves the cache (if set) and closes the session and all its pooled connections.
+
+        """
+        self.save_cache()
+        self.session.close()
+
+    def get_redirection_hops(self, url_string: str) -> List[RedirectionHop]:
+        """
+        This method returns the hops of the redirection path of a starting URL, using the cache (if set) as described
+        in the class documentation. Probed paths are saved in the cache.
+
+        :param url_string: The starting URL (with scheme).
+        :type url_string: str
+        :raise requests.exceptions.RequestException: If a request fails (see do_single_request).
+        :return: The hops, from the starting URL to the landing one.
+        :rtype: List[RedirectionHop]
+        """
+        if self.cache is not None and not self.force_refresh:
+            cached_hops = self.cache.get_hops(url_string)
+            if cached_hops is not None:
+                if self.cache.is_fresh(url_string):
+                    return cached_hops
+                if self.revalidate:
+                    try:
+                        first_hop = requests_utils.probe_hop(url_string, self.session, timeout=self.timeout)
+                    except requests.exceptions.RequestException:
+                        raise
+                    if first_hop.status_code == cached_hops[0].status_code and first_hop.location == cached_hops[0].location:
+                        self.cache.touch(url_string)
+                        return cached_hops
+                    if not first_hop.is_redirection():
+                        self.cache.put(url_string, [first_hop])
+                        return [first_hop]
+        try:
+            hops = requests_utils.follow_redirections(url_string, timeout=self.timeout, session=self.session)
+        except requests.exceptions.RequestException:
+            raise
+        if self.cache is not None:
+            self.cache.put(url_string, hops)
+        return hops
+
+    def resolve_host(self, host: str) -> List[str]:
+        """
+        This method returns the IP addresses of a host name (of an HTTP URL) from its A resolution, using the DNS
+        resolver and its cache. It is the host resolver of the connections of the session.
+
+        :param host: The host name.
+        :type host: str
+        :return: The IP addresses, or an empty list if the host is an IP address or it can't be resolved (so the
+        connection is left to the OS resolver).
+        :rtype: List[str]
+        """
         try:
-            http_result = self.do_single_request(url, https=False)
+            ipaddress.ip_address(host)
+            return list()
+        except ValueError:
+            pass
+        try:
+            a_path = self.dns_resolver.resolve_a_path(DomainName(host))
+        except (NoAnswerError, DomainNonExistentError, UnknownReasonError):
+            return list()
+        return list(map(str, a_path.get_resolution().values))
+
+    def resolve_landing_a_path(self, domain_name: DomainName) -> APath:
+        """
+        This method returns the A resolution of a landing host: it is computed (with the DNS resolver) only the first
+        time, then the same object is returned.
+
+        :param domain_name: The domain name of the landing host.
+        :type domain_name: DomainName
+        :raise NoAnswerError: If such error happen.
+        :raise DomainNonExistentError: If such error happen.
+        :raise UnknownReasonError: If such error happen.
+        :return: The APath object.
+        :rtype: APath
+        """
+        with self.__landing_a_paths_lock:
+            try:
+                return self.__landing_a_paths[domain_name.string]
+            except KeyError:
+                pass
+        try:
+            a_path = self.dns_resolver.resolve_a_path(domain_name)
+        except (NoAnswerError, DomainNonExistentError, UnknownReasonError):
+            raise
+        with self.__landing_a_paths_lock:
+            return self.__landing_a_paths.setdefault(domain_name.string, a_path)
+
+    def get_destination(self, site: Url) -> str:
+        """
+        This method returns the destination of the requests of a site: the first IP address of its A resolution, or
+        the domain name if it can't be resolved.
+
+        :param site: A site, that is an URL.
+        :type site: Url
+        :return: The destination.
+        :rtype: str
+        """
+        try:
+            a_path = self.dns_resolver.resolve_a_path(site.domain_name())
+        except (NoAnswerError, DomainNonExistentError, UnknownReasonError):
+            return site.domain_name().string
+        return str(a_path.get_resolution().get_first_value())
+
+    def __get_destination_semaphore(self, site: Url) -> threading.BoundedSemaphore:
+        """
+        Auxiliary method that returns the semaphore that limits the concurrent requests towards the destination of a
+        site.
+
+        :param site: A site, that is an URL.
+        :type site: Url
+        :return: The semaphore.
+        :rtype: threading.BoundedSemaphore
+        """
+        destination = self.get_destination(site)
+        with self.__destinations_lock:
+            try:
+                return self.__destinations_semaphores[destination]
+            except KeyError:
+                semaphore = threading.BoundedSemaphore(self.max_requests_per_ip)
+                self.__destinations_semaphores[destination] = semaphore
+                return semaphore
+
+    def __resolve_single_scheme(self, site: Url, https: bool) -> Tuple[Optional[LandingSiteSingleSchemeResult], Optional[ErrorLog]]:
+        """
+        Auxiliary method that resolves landing of a site using the HTTPS or the HTTP scheme, respecting the limit of
+        concurrent requests towards its destination. Exceptions are silent: an error log is returned instead.
+
+        :param site: A site, that is an URL.
+        :type site: Url
+        :param https: A flag to set the scheme used: HTTPS or HTTP.
+        :type https: bool
+        :return: The result (None if an error occurred) and the error log (None if no error occurred).
+        :rtype: Tuple[Optional[LandingSiteSingleSchemeResult], Optional[ErrorLog]]
+        """
+        url_string = site.https().string if https else site.http().string
+        try:
+            with self.__get_destination_semaphore(site):
+                return self.do_single_request(site, https), None
         except (NoAnswerError, DomainNonExistentError, UnknownReasonError) as e:
-            http_result = None
-            error_logs.append(ErrorLog(e, url.http().string, str(e)))
+            return None, ErrorLog(e, url_string, str(e))
         except requests.exceptions.ConnectionError as e:
-            http_result = None
-            error_logs.append(ErrorLog(e, url.http().string, str(e)))
+            return None, ErrorLog(e, url_string, str(e))
         except Exception as exc:
-            http_result = None
-            error_logs.append(ErrorLog(exc, url.http().string, str(exc)))
-        return LandingSiteResult(https_result, http_result, error_logs)
+            return None, ErrorLog(exc, url_string, str(exc))
 
     def do_single_request(self, site: Url, https: bool) -> LandingSiteSingleSchemeResult:
         """
-        This methods actually executes a HTTP GET request; it constructs a HTTP URL from the site parameter using HTTPS
-        or HTTP scheme according to the https parameter.
+        This methods actually executes the HTTP GET requests of the redirection path (see
+        requests_utils.follow_redirections); it constructs a HTTP URL from the site parameter using HTTPS or HTTP scheme
+        according to the https parameter. Response bodies are never downloaded.
 
         :param site: An URL.
         :type site: Url
@@ -133,7 +409,7 @@ class LandingResolver:
         :rtype: LandingSiteSingleSchemeResult
         """
         try:
-            landing_url, redirection_path, hsts, ip = requests_utils.resolve_landing_page(site, as_https=https)
+            hops = self.get_redirection_hops(site.https().string if https else site.http().string)
         except requests.exceptions.ConnectTimeout:
             # The request timed out while trying to connect to the remote server.
             # Requests that produced this error are safe to retry.
@@ -161,8 +437,10 @@ class LandingResolver:
         except requests.exceptions.RequestException:
             # There was an ambiguous exception that occurred while handling your request.
             raise
+        landing_url = SchemeUrl(hops[-1].url)
+        hsts = hops[-1].hsts is not None
         try:
-            a_path = self.dns_resolver.resolve_a_path(landing_url.domain_name())
+            a_path = self.resolve_landing_a_path(landing_url.domain_name())
         except (NoAnswerError, DomainNonExistentError, UnknownReasonError):
             raise
-        return LandingSiteSingleSchemeResult(landing_url, redirection_path, hsts, a_path)
+        return LandingSiteSingleSchemeResult(landing_url, list(map(lambda hop: hop.url, hops)), hsts, a_path, redirection_hops=hops)
@@ -1,7 +1,14 @@
 import ipaddress
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Iterable, Optional, Iterator
+from urllib.parse import urlsplit
 import requests
 import re
+from requests.adapters import HTTPAdapter
+from entities.PrefixTrie import PrefixTrie
+from entities.ROVPageCache import ROVPageCache
 from entities.RowPrefixesTable import RowPrefixesTable
 from exceptions.NetworkNotFoundError import NetworkNotFoundError
 from exceptions.NotROVStateTypeError import NotROVStateTypeError
@@ -10,50 +17,236 @@ from exceptions.TableNotPresentError import TableNotPresentError
 
 
 class ROVPageScraper:
-    def __init__(self, dbg=False):
+    """
+    This class scrapes the ROV page of an autonomous system. Pages are fetched through a pooled requests.Session (so
+    connections are reused) with a timeout; they can be prefetched concurrently with the prefetch_as_pages() method,
+    which keeps a bounded number of pages in flight and a politeness limit per host (maximum number of concurrent
+    requests and minimum delay between the start of 2 requests). Fetching is separate from parsing: load_as_page()
+    parses the prefetched page if present, otherwise it fetches it.
+    If a ROVPageCache is set, the prefixes table of an autonomous system is taken from it while its time-to-live isn't
+    expired (without any request); then the page is revalidated with a conditional request, and fetched again only if
+    modified.
+
+    ...
+
+    Attributes
+    ----------
+    max_workers : int
+        The maximum number of pages in flight.
+    max_requests_per_host : int
+        The maximum number of concurrent requests to the same host.
+    politeness_delay : float
+        The minimum delay (in seconds) between the start of 2 requests to the same host.
+    timeout : float
+        The timeout (in seconds) of every request.
+    session : requests.Session
+        The session whose connection pool is shared by all the requests.
+    pending_pages : Dict[int, Future]
+        The pages prefetched (or being fetched) and not yet parsed, by AS number.
+    cache : ROVPageCache or None
+        The on-disk cache of the prefixes tables.
+    """
+    TABLE_START = 'var roatable'
+    TABLE_END_PATTERN = re.compile(r'\]\s*\]\);')
+    PREFIX_PATTERN = re.compile(r'p=([\d.]+/\d+)')
+    MAX_TAIL_LENGTH = 64
+
+    def __init__(self, dbg=False, max_workers=16, max_requests_per_host=8, politeness_delay=0.05, timeout=30, cache=None):
         self.baseUrl = 'https://stats.labs.apnic.net/roa/AS'
         self.pageLoaded = False
-        self.sleepTime = 30
         self.dbg = dbg
         self.prefixes_table = list()
+        self.prefixes_tries: Dict[int, PrefixTrie[RowPrefixesTable]] = dict()
         self.responseDocument = None
         self.current_as_number = -1 #awful..compatibility in exception handling...
-        #self.extractorRegex = 'var roatable.*\(\[.*]\s*\]\);'
-        self.extractorRegex='var roatable.*\(\[.*]\s*\]\);(?s:.*?)roatable'
+        self.max_workers = max_workers
+        self.max_requests_per_host = max_requests_per_host
+        self.politeness_delay = politeness_delay
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_requests_per_host, pool_maxsize=max_requests_per_host)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.pending_pages: Dict[int, Future] = dict()
+        self.cache: Optional[ROVPageCache] = cache
+        self.__executor = None
+        self.__hosts_lock = threading.Lock()
+        self.__hosts_semaphores: Dict[str, threading.BoundedSemaphore] = dict()
+        self.__hosts_next_start: Dict[str, float] = dict()
+
+    def fetchPage(self, urlPage, headers=None) -> requests.Response:
+        """
+        This method fetches a page respecting the politeness limit of its host. It is thread-safe and it doesn't change
+        the state of the parser.
+
+        :param urlPage: The url of the page.
+        :type urlPage: str
+        :param headers: Additional headers of the request (e.g. the ones of a conditional request).
+        :type headers: Dict[str, str] or None
+        :raise requests.exceptions.RequestException: If the request fails, times out or the response has an error
+        status code.
+        :return: The response.
+        :rtype: requests.Response
+        """
+        host = urlsplit(urlPage).netloc
+        with self.__hosts_lock:
+            try:
+                semaphore = self.__hosts_semaphores[host]
+            except KeyError:
+                semaphore = threading.BoundedSemaphore(self.max_requests_per_host)
+                self.__hosts_semaphores[host] = semaphore
+        with semaphore:
+            with self.__hosts_lock:
+                now = time.monotonic()
+                start = max(now, self.__hosts_next_start.get(host, now))
+                self.__hosts_next_start[host] = start + self.politeness_delay
+            if start > now:
+                time.sleep(start - now)
+            if self.dbg:
+                print('Loading page ', urlPage, ' ...')
+            try:
+                response = self.session.get(urlPage, headers=headers, timeout=self.timeout)
+                response.raise_for_status()
+            except requests.exceptions.RequestException:
+                raise
+            if self.dbg:
+                print('Page loaded')
+            return response
 
     def loadPage(self, urlPage):
-        if self.dbg:
-            print('Loading page ', urlPage, ' ...')
-        self.responseDocument = requests.get(urlPage).text.replace("\n", " ")
+        self.responseDocument = self.fetchPage(urlPage).text
         self.pageLoaded = True
-        if self.dbg:
-            print('Page loaded')
+
+    def fetch_as_page(self, asn) -> Optional[requests.Response]:
+        """
+        This method fetches the page of an autonomous system, unless its prefixes table is fresh in the cache. If the
+        cache has a stale table, the request is conditional. It is thread-safe.
+
+        :param asn: The autonomous system number.
+        :type asn: int
+        :raise requests.exceptions.RequestException: If the request fails, times out or the response has an error
+        status code.
+        :return: The response (status code 304 if the cached table is still valid), or None if the cached table is
+        fresh.
+        :rtype: Optional[requests.Response]
+        """
+        if self.cache is None:
+            return self.fetchPage(self.baseUrl + str(asn))
+        if self.cache.is_fresh(asn):
+            return None
+        return self.fetchPage(self.baseUrl + str(asn), headers=self.cache.get_validators_headers(asn))
+
+    def prefetch_as_pages(self, asns: Iterable[int]) -> None:
+        """
+        This method starts fetching concurrently the pages of the autonomous systems parameter (the ones not already
+        pending). The pages are then parsed, one at a time, with load_as_page().
+
+        :param asns: The autonomous system numbers.
+        :type asns: Iterable[int]
+        """
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='rov-page-fetcher')
+        for asn in asns:
+            if asn not in self.pending_pages and (self.cache is None or not self.cache.is_fresh(asn)):
+                self.pending_pages[asn] = self.__executor.submit(self.fetch_as_page, asn)
 
     def load_as_page(self, asn):
-        self.loadPage(self.baseUrl + str(asn))
+        """
+        This method loads the page of the autonomous system parameter (waiting for the prefetched one if present) and
+        scrapes its prefixes table. If a cache is set, the table is taken from it when fresh or not modified, otherwise
+        the scraped one is saved in it.
+
+        :param asn: The autonomous system number.
+        :type asn: int
+        :raise requests.exceptions.RequestException: If the request fails, times out or the response has an error
+        status code.
+        :raise TableNotPresentError: See scrape_prefixes_table_from_page().
+        :raise ValueError: See scrape_prefixes_table_from_page().
+        :raise TableEmptyError: See scrape_prefixes_table_from_page().
+        :raise NotROVStateTypeError: See scrape_prefixes_table_from_page().
+        """
+        self.current_as_number = asn
+        self.prefixes_tries.pop(asn, None)
+        try:
+            future = self.pending_pages.pop(asn)
+        except KeyError:
+            future = None
+        if future is None:
+            response = self.fetch_as_page(asn)
+        else:
+            response = future.result()      # re-raises the fetching exception
+        if response is None or response.status_code == 304:
+            if response is not None:
+                self.cache.touch(asn)
+            try:
+                self.build_prefixes_table(asn, self.cache.get_prefixes(asn))
+            except (ValueError, NotROVStateTypeError):
+                raise
+            return
+        self.responseDocument = response.text
+        self.pageLoaded = True
         # ab - added for compatibility with Fabbio
         try:
-            self.current_as_number = asn
             self.scrape_prefixes_table_from_page(asn)
         except (TableNotPresentError, ValueError, TableEmptyError, NotROVStateTypeError):
             raise
+        if self.cache is not None:
+            self.cache.put(asn, list(map(lambda row: row.prefix.compressed, self.prefixes_table)), etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
+
+    def close(self) -> None:
+        """
+        This method cancels the pages not yet fetched, stops the fetching threads and closes the session.
+
+        """
+        for future in self.pending_pages.values():
+            future.cancel()
+        self.pending_pages = dict()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+        self.session.close()
 
     def __scrapeTable(self):
-        # good XPath tutorial
-        # https://www.swtestacademy.com/xpath-selenium/#selenium-webdriver-tutorials
-        scrapedData = []
-
-        tableToScrape = re.findall(self.extractorRegex, self.responseDocument)
-        if len(tableToScrape) != 0:
-            #len = tableToScrape[0].count(']') - 2
-            str1 = tableToScrape[0]
-            ## ">213.208.0.0/19</a>
-            indexes = [_.start() for _ in re.finditer("p=", str1)]
-            for i in indexes:
-                end = str1.find('\\', i)
-                scrapedData.append(str1[i + 2:end])
-                
-        return scrapedData
+        return list(ROVPageScraper.iter_prefixes([self.responseDocument]))
+
+    @staticmethod
+    def iter_prefixes(chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Static method that extracts the IPv4 prefixes of the roatable data from a page, given as a sequence of text
+        chunks (e.g. the whole page or the decoded chunks of a streamed response). It is a single pass with precompiled
+        patterns: it seeks the start of the roatable data, then emits the prefixes (the p= parameter of each row link)
+        of every chunk as soon as it is read, and stops at the end of the data (']]);'). Each chunk is scanned up to
+        its last 'p=' occurrence, which is kept for the next chunk, so a prefix split in 2 chunks is not lost nor
+        emitted twice.
+
+        :param chunks: The chunks of the page.
+        :type chunks: Iterable[str]
+        :return: An iterator of the prefixes, in order of appearance.
+        :rtype: Iterator[str]
+        """
+        buffer = ''
+        is_in_table = False
+        for chunk in chunks:
+            buffer = buffer + chunk
+            if not is_in_table:
+                index = buffer.find(ROVPageScraper.TABLE_START)
+                if index == -1:
+                    buffer = buffer[-(len(ROVPageScraper.TABLE_START) - 1):]
+                    continue
+                buffer = buffer[index + len(ROVPageScraper.TABLE_START):]
+                is_in_table = True
+            end = ROVPageScraper.TABLE_END_PATTERN.search(buffer)
+            if end is not None:
+                yield from ROVPageScraper.PREFIX_PATTERN.findall(buffer, 0, end.start())
+                return
+            cut = buffer.rfind('p=')
+            if cut == -1:
+                buffer = buffer[-ROVPageScraper.MAX_TAIL_LENGTH:]
+                continue
+            yield from ROVPageScraper.PREFIX_PATTERN.findall(buffer, 0, cut)
+            buffer = buffer[cut:]
+        if is_in_table:
+            yield from ROVPageScraper.PREFIX_PATTERN.findall(buffer)
 
     def getResults(self, xpath=None):
         if self.pageLoaded == False:
@@ -70,7 +263,7 @@ class ROVPageScraper:
         """
         This method scrape the current page in the headless browser to find the pfx_table_div (id html element) table
         constructed (normally) in the ROV page. Obviously it needs a previous load of a valid autonomous system page.
-        See method: load_as_page().
+        See method: load_as_page(). The table is built with build_prefixes_table().
 
         :raise TableNotPresentError: If the pfx_table_div (id html element) or the table (html element) or the tbody
         (html element) are not found.
@@ -83,39 +276,71 @@ class ROVPageScraper:
         :rtype: List[RowPrefixesTable]
         """
         try:
-            roa_data = self.__scrapeTable()
+            return self.build_prefixes_table(asn, self.__scrapeTable())
+        except (ValueError, NotROVStateTypeError):
+            raise
+
+    def build_prefixes_table(self, asn, roa_data: List[str]) -> List[RowPrefixesTable]:
+        """
+        This method builds the prefixes table of an autonomous system from its prefixes (scraped or cached). The table
+        replaces the one of the previous page, and its rows are also saved in a PrefixTrie (kept per autonomous system)
+        for the lookups.
+
+        :param asn: The autonomous system number.
+        :type asn: int
+        :param roa_data: The prefixes.
+        :type roa_data: List[str]
+        :raise ValueError: If the data found for a row are not formatted as expected. See __init__() of class
+        RowPrefixesTable.
+        :raise NotROVStateTypeError: If the data found for a row are not formatted as expected. See __init__() of class
+        RowPrefixesTable.
+        :return: A list of RowPrefixesTable objects.
+        :rtype: List[RowPrefixesTable]
+        """
+        self.prefixes_table = list()
+        self.prefixes_tries.pop(asn, None)
+        trie = PrefixTrie()
+        try:
             roa_data_len = len(roa_data)
             if roa_data_len != 0:
                 for i in range(roa_data_len):
                 #     def __init__(self, as_number: str, prefix: str, span: str, cc: str, visibility: str, rov_state: str, roas: str):
                     tmp = RowPrefixesTable('AS'+str(asn), roa_data[i], '256', 'IT', '10', 'VLD', ' ')
                     self.prefixes_table.append(tmp)
+                    trie.insert(tmp.prefix, tmp)
         except (ValueError, NotROVStateTypeError):
             self.prefixes_table = None
             raise
+        self.prefixes_tries[asn] = trie
         return self.prefixes_table
 
 
-    def get_network_if_present(self, ip: ipaddress.IPv4Address) -> RowPrefixesTable:
+    def get_network_if_present(self, ip: ipaddress.IPv4Address, as_number=None) -> RowPrefixesTable:
         """
         This method search in the table saved in the state of this ROVPageScraper object a row containing a prefix which
         contains the address parameter. In other words, before this method you have to invoke load_as_page(as_number)
-        method.
+        method. The row with the longest prefix is returned, searching in the PrefixTrie of the autonomous system.
 
 
         :param ip: An ip v4 address.
         :type ip: ipaddress.IPv4Address
+        :param as_number: The autonomous system of the table; if None the last loaded one is used.
+        :type as_number: int or None
         :raise TableEmptyError: If the pfx_table_div (id html element) table is empty.
         :raise TableNotPresentError: If the table (html element) is not present.
         :raise NetworkNotFoundError: If a network that contains the ip parameter is not found in the table.
         :return: The matched row (from the prefix) in the table.
         :rtype: RowPrefixesTable
         """
-        if self.prefixes_table is None:
-            raise TableNotPresentError(self.current_as_number)
-        if len(self.prefixes_table) == 0:
-            raise TableEmptyError(self.current_as_number, ip)
-        for row in self.prefixes_table:
-            if ip in row.prefix:
-                return row
-        raise NetworkNotFoundError(ip.compressed)
+        if as_number is None:
+            as_number = self.current_as_number
+        try:
+            trie = self.prefixes_tries[as_number]
+        except KeyError:
+            raise TableNotPresentError(as_number)
+        if len(trie) == 0:
+            raise TableEmptyError(as_number, ip)
+        try:
+            return trie.longest_prefix_match(ip)
+        except NetworkNotFoundError:
+            raise
@@ -1,39 +1,164 @@
-from typing import Set
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set, List, Optional, Iterator, Tuple
+import requests
 import selenium
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.wait import WebDriverWait
 from entities.FirefoxHeadlessWebDriver import FirefoxHeadlessWebDriver
+from entities.HeadlessBrowserPool import HeadlessBrowserPool
 from entities.MainFrameScript import MainFrameScript
 from entities.SchemeUrl import SchemeUrl
+from utils import requests_utils
 
 
 class ScriptDependenciesResolver:
     """
     The class represents an object that provides tools to resolve script dependencies given a HTTP URL.
+    Many URLs can be resolved in parallel by a pool of headless browsers.
+    If a session is set, many URLs are first resolved without a browser (static HTML fast path): the HTML of every page
+    is downloaded and parsed, and the scripts declared in it are the result (see StaticScriptParser). Only the pages
+    that can't be parsed (errors, not HTML, ...) or that are detected as script-injected are loaded by a browser.
+    The detection only looks at inline scripts: the scripts added at runtime by external bundles or loaders are missed,
+    so the fast path is opt-in and every page logs which path produced its result.
 
     ...
 
     Attributes
     ----------
-    headless_browser : FirefoxHeadlessWebDriver
+    headless_browser : FirefoxHeadlessWebDriver or None
         An instance of a FirefoxHeadlessWebDriver object to use for resolving.
-
+    browser_pool : HeadlessBrowserPool or None
+        A pool of headless browsers to use for resolving many URLs in parallel.
+    session : requests.Session or None
+        The session used to download the HTML of the pages, or None to always use a browser.
+    static_timeout : float
+        The timeout (in seconds) for connecting and for each read of the HTML downloads.
+    static_max_workers : int
+        The maximum number of concurrent HTML downloads.
+    """
+    ready_timeout_in_seconds = 10
+    # null while the document is loading, otherwise the JSON array of the [src, integrity] pairs of the main frame
+    # scripts (the properties, so src is absolute; they are '' if absent)
+    extract_scripts_script = """
+        if (document.readyState === 'loading') {
+            return null;
+        }
+        return JSON.stringify(Array.from(document.scripts, function (script) {
+            return [script.src, script.integrity];
+        }));
     """
-    def __init__(self, headless_browser: FirefoxHeadlessWebDriver):
+    def __init__(self, headless_browser: Optional[FirefoxHeadlessWebDriver] = None, browser_pool: Optional[HeadlessBrowserPool] = None, session: Optional[requests.Session] = None, static_timeout=15, static_max_workers=16):
         """
-        Instantiate the object.
+        Instantiate the object. At least one of the headless browser and the browser pool has to be set.
 
         :param headless_browser: An instance of a Firefox headless browser.
-        :type headless_browser: FirefoxHeadlessWebDriver
+        :type headless_browser: FirefoxHeadlessWebDriver or None
+        :param browser_pool: A pool of headless browsers.
+        :type browser_pool: HeadlessBrowserPool or None
+        :param session: The session (see requests_utils.create_pooled_session) used to download the HTML of the pages,
+        or None to always use a browser.
+        :type session: requests.Session or None
+        :param static_timeout: The timeout (in seconds) for connecting and for each read of the HTML downloads.
+        :type static_timeout: float
+        :param static_max_workers: The maximum number of concurrent HTML downloads.
+        :type static_max_workers: int
+        :raise ValueError: If neither the headless browser nor the browser pool is set.
         """
+        if headless_browser is None and browser_pool is None:
+            raise ValueError('A headless browser or a browser pool is required.')
         self.headless_browser = headless_browser
+        self.browser_pool = browser_pool
+        self.session = session
+        self.static_timeout = static_timeout
+        self.static_max_workers = static_max_workers
 
     def search_script_application_dependencies(self, url: SchemeUrl) -> Set[MainFrameScript]:
         """
-        The method is the actual research of main frame script dependencies from a HTTP URL.
+        The method is the actual research of main frame script dependencies from a HTTP URL, using the headless browser
+        (or, if not set, a browser of the pool).
+
+
+        :param url: An HTTP URL.
+        :type url: SchemeUrl
+        :raise selenium.common.exceptions.WebDriverException: There was a problem getting the response form the request.
+        :returns: A set of scripts.
+        :rtype: Set[MainFrameScript]
+        """
+        if self.headless_browser is None:
+            for _, scripts, error in self.search_multiple_script_application_dependencies([url]):
+                if error is not None:
+                    raise error
+                return scripts
+        try:
+            return self.search_in_browser(self.headless_browser, url)
+        except selenium.common.exceptions.WebDriverException:
+            raise
+
+    def search_multiple_script_application_dependencies(self, urls: List[SchemeUrl]) -> Iterator[Tuple[SchemeUrl, Optional[Set[MainFrameScript]], Optional[selenium.common.exceptions.WebDriverException]]]:
+        """
+        This method researches the main frame script dependencies of many HTTP URLs. If a session is set, the static
+        HTML of the pages is parsed first (concurrently) and its results are yielded in the order of the URLs; then the
+        remaining pages are loaded in parallel by the browser pool, if set, otherwise one by one with the headless
+        browser, and their results are yielded in the order of the URLs.
+        Exceptions are silent: for every URL it is yielded the set of scripts (None if an error occurred) and the error
+        (None if no error occurred).
+
+        :param urls: The HTTP URLs.
+        :type urls: List[SchemeUrl]
+        :return: An iterator of (URL, scripts, error) tuples.
+        :rtype: Iterator[Tuple[SchemeUrl, Optional[Set[MainFrameScript]], Optional[selenium.common.exceptions.WebDriverException]]]
+        """
+        browser_urls = list(urls)
+        if self.session is not None:
+            browser_urls = list()
+            with ThreadPoolExecutor(max_workers=self.static_max_workers, thread_name_prefix='static-script-parser') as executor:
+                for url, scripts in zip(urls, executor.map(self.search_static_script_application_dependencies, urls)):
+                    if scripts is None:
+                        browser_urls.append(url)
+                    else:
+                        print(f"> Scripts read from static HTML: {url} ({len(scripts)} scripts)")
+                        yield url, scripts, None
+            print(f"> Scripts of {len(urls) - len(browser_urls)}/{len(urls)} pages found in their static HTML, {len(browser_urls)} pages are loaded by a headless browser.")
+        if self.browser_pool is not None:
+            for url, scripts, error in self.browser_pool.map(self.search_in_browser, browser_urls):
+                if error is not None and not isinstance(error, selenium.common.exceptions.WebDriverException):
+                    error = selenium.common.exceptions.WebDriverException(f"{type(error).__name__}: {str(error)}")
+                yield url, scripts, error
+            return
+        for url in browser_urls:
+            try:
+                yield url, self.search_in_browser(self.headless_browser, url), None
+            except selenium.common.exceptions.WebDriverException as e:
+                yield url, None, e
 
+    def search_static_script_application_dependencies(self, url: SchemeUrl) -> Optional[Set[MainFrameScript]]:
+        """
+        This method researches the main frame script dependencies declared in the static HTML of a HTTP URL, without a
+        browser (see requests_utils.parse_static_html). Exceptions are silent.
 
+        :param url: An HTTP URL.
+        :type url: SchemeUrl
+        :return: A set of scripts, or None if the HTML can't be parsed or the page is script-injected (so a browser is
+        needed).
+        :rtype: Optional[Set[MainFrameScript]]
+        """
+        try:
+            parser = requests_utils.parse_static_html(url.string, self.session, timeout=self.static_timeout)
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+        if parser.is_script_injected:
+            return None
+        return parser.scripts
+
+    @staticmethod
+    def search_in_browser(headless_browser: FirefoxHeadlessWebDriver, url: SchemeUrl) -> Set[MainFrameScript]:
+        """
+        Static method that researches the main frame script dependencies from a HTTP URL with a headless browser.
+        Once the page is loaded, the scripts are read from the document with a single command (a script executed by
+        the browser that returns all of them), repeated only while the document is still loading.
+
+        :param headless_browser: A headless browser.
+        :type headless_browser: FirefoxHeadlessWebDriver
         :param url: An HTTP URL.
         :type url: SchemeUrl
         :raise selenium.common.exceptions.WebDriverException: There was a problem getting the response form the request.
@@ -41,16 +166,18 @@ class ScriptDependenciesResolver:
         :rtype: Set[MainFrameScript]
         """
         try:
-            self.headless_browser.driver.get(url.string)
+            statistics = headless_browser.load_page(url.string)
+        except selenium.common.exceptions.WebDriverException:
+            raise
+        print(f"> Page loaded by headless browser: {url} ({statistics})")
+        try:
+            extracted_scripts = WebDriverWait(headless_browser.driver, ScriptDependenciesResolver.ready_timeout_in_seconds).until(
+                lambda driver: driver.execute_script(ScriptDependenciesResolver.extract_scripts_script)
+            )
         except selenium.common.exceptions.WebDriverException:
             raise
         main_page_scripts = set()
-        awaiter_scripts = WebDriverWait(self.headless_browser.driver, 10).until(
-            expected_conditions.presence_of_all_elements_located((By.XPATH, '//script[not(ancestor::iframe)]'))
-        )
-        for script in awaiter_scripts:
-            src = script.get_attribute('src')
-            integrity = script.get_attribute('integrity')
+        for src, integrity in json.loads(extracted_scripts):
             if integrity == '':
                 integrity = None
             if src == '' or src is None:
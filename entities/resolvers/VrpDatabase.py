@@ -0,0 +1,223 @@
+import csv
+import ipaddress
+import json
+from typing import List, Sequence, Tuple
+import numpy as np
+from entities.enums.ROVStates import ROVStates
+
+
+class VrpDatabase:
+    """
+    This class represents a local export of Validated ROA Payloads (VRPs), i.e. the (prefix, max length, origin AS)
+    triples obtained by a Relying Party software (Routinator, rpki-client, ...) from the RPKI repositories. It is the
+    offline alternative to the ROV page scraping: routes (prefix and origin AS) are validated as described in RFC 6811:
+        1- NOT FOUND (ROVStates.UNK): no VRP prefix covers the route prefix;
+        2- VALID (ROVStates.VLD): a covering VRP has the origin AS of the route and a max length not shorter than the
+        route prefix length (the origin AS 0 never matches);
+        3- INVALID (ROVStates.INV): otherwise.
+    Supported exports are the JSON one ({"roas": [{"asn": "AS13335", "prefix": "1.0.0.0/24", "maxLength": 24, ...}]})
+    and the CSV one (ASN, IP Prefix, Max Length, ... columns). IPv6 VRPs and malformed rows are ignored.
+    The VRPs are indexed by prefix length: for each length there are the ordered network addresses (to find covering
+    VRPs) and the ordered (network address, AS number) couples with the maximum max length (to find matching VRPs). So
+    all the routes are validated together with at most 33 vectorized binary searches.
+
+    ...
+
+    Attributes
+    ----------
+    filepath : str
+        The filepath of the export.
+    network_addresses : np.ndarray
+        The network address of every VRP as unsigned 32-bit integer.
+    prefix_lengths : np.ndarray
+        The prefix length of every VRP.
+    max_lengths : np.ndarray
+        The max length of every VRP.
+    as_numbers : np.ndarray
+        The AS number of every VRP.
+    levels : List[Tuple[int, np.ndarray, np.ndarray, np.ndarray]]
+        For every prefix length present: the length, the ordered network addresses, the ordered (network address, AS
+        number) keys and their maximum max length.
+    """
+    def __init__(self, filepath: str):
+        """
+        Instantiate a VrpDatabase object loading the export. The format is chosen from the extension of the file (.json
+        or .csv).
+
+        :param filepath: The filepath of the export.
+        :type filepath: str
+        :raise ValueError: If the extension is not supported or the JSON export is not well-formed.
+        :raise OSError: If is there a problem reading the file.
+        """
+        if filepath.lower().endswith('.json'):
+            rows = VrpDatabase.parse_json(filepath)
+        elif filepath.lower().endswith('.csv'):
+            rows = VrpDatabase.parse_csv(filepath)
+        else:
+            raise ValueError(f"Unsupported VRP export: {filepath}")
+        self.filepath = filepath
+        network_addresses = list()
+        prefix_lengths = list()
+        max_lengths = list()
+        as_numbers = list()
+        for prefix, max_length, as_number in rows:
+            try:
+                network = ipaddress.IPv4Network(prefix)
+            except ValueError:
+                continue
+            if max_length < network.prefixlen or max_length > 32 or as_number < 0 or as_number > 0xFFFFFFFF:
+                continue
+            network_addresses.append(int(network.network_address))
+            prefix_lengths.append(network.prefixlen)
+            max_lengths.append(max_length)
+            as_numbers.append(as_number)
+        self.network_addresses = np.array(network_addresses, dtype=np.uint32)
+        self.prefix_lengths = np.array(prefix_lengths, dtype=np.uint8)
+        self.max_lengths = np.array(max_lengths, dtype=np.uint8)
+        self.as_numbers = np.array(as_numbers, dtype=np.uint32)
+        self.levels = list()
+        for length in np.unique(self.prefix_lengths).tolist():
+            selected = self.prefix_lengths == length
+            addresses = self.network_addresses[selected]
+            keys = (addresses.astype(np.uint64) << np.uint64(32)) | self.as_numbers[selected].astype(np.uint64)
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+            ordered_max_lengths = self.max_lengths[selected][order]
+            unique_keys, firsts = np.unique(keys, return_index=True)
+            self.levels.append((length, np.sort(addresses), unique_keys, np.maximum.reduceat(ordered_max_lengths, firsts)))
+
+    def validate(self, networks: Sequence[ipaddress.IPv4Network], origins: Sequence[int]) -> List[Tuple[ROVStates, int]]:
+        """
+        This method validates all the routes (prefix and origin AS) parameters in one vectorized pass.
+
+        :param networks: The prefixes of the routes.
+        :type networks: Sequence[ipaddress.IPv4Network]
+        :param origins: The origin AS numbers of the routes (same order).
+        :type origins: Sequence[int]
+        :raise ValueError: If the 2 parameters have different length.
+        :return: For each route (same order) the ROV state and the number of covering VRPs.
+        :rtype: List[Tuple[ROVStates, int]]
+        """
+        if len(networks) != len(origins):
+            raise ValueError()
+        route_addresses = np.fromiter(map(lambda network: int(network.network_address), networks), dtype=np.uint32, count=len(networks))
+        route_lengths = np.fromiter(map(lambda network: network.prefixlen, networks), dtype=np.uint8, count=len(networks))
+        route_origins = np.fromiter(origins, dtype=np.uint32, count=len(origins))
+        covering = np.zeros(len(networks), dtype=np.int64)
+        valid = np.zeros(len(networks), dtype=bool)
+        for length, addresses, keys, key_max_lengths in self.levels:
+            mask = np.uint32((0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF)
+            applicable = route_lengths >= length
+            masked = route_addresses & mask
+            counts = np.searchsorted(addresses, masked, side='right') - np.searchsorted(addresses, masked, side='left')
+            covering += np.where(applicable, counts, 0)
+            route_keys = (masked.astype(np.uint64) << np.uint64(32)) | route_origins.astype(np.uint64)
+            positions = np.minimum(np.searchsorted(keys, route_keys), len(keys) - 1)
+            valid |= applicable & (keys[positions] == route_keys) & (key_max_lengths[positions] >= route_lengths)
+        valid &= route_origins != 0
+        states = np.where(valid, 2, np.where(covering > 0, 1, 0)).tolist()
+        all_states = (ROVStates.UNK, ROVStates.INV, ROVStates.VLD)
+        return list(map(lambda state, count: (all_states[state], count), states, covering.tolist()))
+
+    def validate_route(self, network: ipaddress.IPv4Network, origin: int) -> ROVStates:
+        """
+        This method validates a single route. It is a wrapper of the validate method.
+
+        :param network: The prefix of the route.
+        :type network: ipaddress.IPv4Network
+        :param origin: The origin AS number of the route.
+        :type origin: int
+        :return: The ROV state.
+        :rtype: ROVStates
+        """
+        return self.validate([network], [origin])[0][0]
+
+    def __len__(self) -> int:
+        """
+        The number of VRPs loaded.
+
+        :return: The number of VRPs.
+        :rtype: int
+        """
+        return len(self.network_addresses)
+
+    @staticmethod
+    def parse_as_number(string) -> int:
+        """
+        Static method that parses an AS number written as integer or as string (with or without the 'AS' prefix).
+
+        :param string: The AS number.
+        :type string: str or int
+        :raise ValueError: If it is not parsable.
+        :return: The AS number.
+        :rtype: int
+        """
+        if isinstance(string, int):
+            return string
+        return int(str(string).strip().upper().lstrip('AS'))
+
+    @staticmethod
+    def parse_json(filepath: str) -> List[Tuple[str, int, int]]:
+        """
+        Static method that parses the JSON export.
+
+        :param filepath: The filepath of the export.
+        :type filepath: str
+        :raise ValueError: If the file is not a well-formed JSON export.
+        :raise OSError: If is there a problem reading the file.
+        :return: The (prefix, max length, AS number) rows.
+        :rtype: List[Tuple[str, int, int]]
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+            f.close()
+        if isinstance(document, dict):
+            document = document.get('roas')
+        if not isinstance(document, list):
+            raise ValueError(f"No 'roas' list in VRP export: {filepath}")
+        rows = list()
+        for roa in document:
+            try:
+                prefix = roa['prefix']
+                max_length = roa.get('maxLength', roa.get('max_length'))
+                if max_length is None:
+                    max_length = int(prefix.split('/')[1])
+                rows.append((prefix, int(max_length), VrpDatabase.parse_as_number(roa['asn'])))
+            except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+                continue
+        return rows
+
+    @staticmethod
+    def parse_csv(filepath: str) -> List[Tuple[str, int, int]]:
+        """
+        Static method that parses the CSV export. Columns are found from the header (the ones containing 'asn',
+        'prefix' and 'max'), otherwise the first 3 columns are considered in this order.
+
+        :param filepath: The filepath of the export.
+        :type filepath: str
+        :raise OSError: If is there a problem reading the file.
+        :return: The (prefix, max length, AS number) rows.
+        :rtype: List[Tuple[str, int, int]]
+        """
+        rows = list()
+        asn_column, prefix_column, max_length_column = 0, 1, 2
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            rd = csv.reader(f)
+            for i, row in enumerate(rd):
+                if i == 0:
+                    header = list(map(lambda column: column.strip().lower(), row))
+                    if any(map(lambda column: 'prefix' in column, header)):
+                        for j, column in enumerate(header):
+                            if 'asn' in column:
+                                asn_column = j
+                            elif 'prefix' in column:
+                                prefix_column = j
+                            elif 'max' in column:
+                                max_length_column = j
+                        continue
+                try:
+                    rows.append((row[prefix_column].strip(), int(row[max_length_column]), VrpDatabase.parse_as_number(row[asn_column])))
+                except (IndexError, ValueError):
+                    continue
+            f.close()
+        return rows
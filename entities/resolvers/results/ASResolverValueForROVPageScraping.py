@@ -21,6 +21,8 @@ class ASResolverValueForROVPageScraping:
      ip_range_tsv : ipaddress.IPv4Network or None
         An IP network or None.
     """
+    __slots__ = ('server', 'entry_as_database', 'entry_rov_page', 'ip_range_tsv')
+
     def __init__(self, server: str, entry_as_database: EntryIpAsDatabase, network: ipaddress.IPv4Network or None):
         """
         Initialize the object but sets the 'entry_rov_page' to None, because the idea is that ROVPageScraping it has yet
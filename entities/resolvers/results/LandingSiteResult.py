@@ -20,6 +20,8 @@ class LandingSiteResult:
     error_logs : List[ErrorLog]
         A list of error logs occurred during landing.
     """
+    __slots__ = ('https', 'http', 'error_logs')
+
     def __init__(self, https_result: LandingSiteSingleSchemeResult or None, http_result: LandingSiteSingleSchemeResult or None, error_logs: List[ErrorLog]):
         """
         Initialize object.
@@ -1,4 +1,5 @@
-from typing import List
+from typing import List, Optional
+from entities.RedirectionHop import RedirectionHop
 from entities.SchemeUrl import SchemeUrl
 from entities.paths.APath import APath
 
@@ -15,7 +16,9 @@ class LandingSiteSingleSchemeResult:
     url : SchemeUrl
         The landing URL (with scheme).
     redirection_path : List[str]
-        The list of pages URL redirection.
+        The list of pages URL redirection, from the starting URL to the landing one.
+    redirection_hops : List[RedirectionHop]
+        The hops of the redirection path (status code, server IP address and HSTS header of every response).
     hsts : bool
         The presence of Strict-Transport-Security policy only in the landing page.
     a_path : APath
@@ -23,9 +26,12 @@ class LandingSiteSingleSchemeResult:
     server : DomainName
         The domain name associated with the landing url.
     """
-    def __init__(self, url: SchemeUrl, redirection_path: List[str], hsts: bool, a_path: APath):
+    __slots__ = ('url', 'redirection_path', 'redirection_hops', 'hsts', 'a_path', 'server')
+
+    def __init__(self, url: SchemeUrl, redirection_path: List[str], hsts: bool, a_path: APath, redirection_hops: Optional[List[RedirectionHop]] = None):
         self.url = url
         self.redirection_path = redirection_path
+        self.redirection_hops = redirection_hops if redirection_hops is not None else list()
         self.hsts = hsts
         self.a_path = a_path
         self.server = url.domain_name()
@@ -17,6 +17,8 @@ class ScriptDependenciesResult:
     http : Union[Set[MainPageScript], None]
         All the script that the web site depends upon using HTTP scheme.
     """
+    __slots__ = ('https', 'http')
+
     def __init__(self, https_script_set: Optional[Set[MainFrameScript]], http_script_set: Optional[Set[MainFrameScript]]):
         """
         Initialize object.
@@ -8,12 +8,14 @@ from SNAPSHOTS.take_snapshot import take_snapshot
 from pathlib import Path
 from entities.DomainName import DomainName
 from entities.Url import Url
+from entities.resolvers.IpAsDatabaseDiff import IpAsDatabaseDiff
 from exceptions.FilenameNotFoundError import FilenameNotFoundError
 from exceptions.InvalidUrlError import InvalidUrlError
 from persistence import helper_application_results, alias_fix
 from persistence.BaseModel import db, close_database_connection, db_file
 from static_variables import INPUT_FOLDER_NAME, INPUT_MAIL_DOMAINS_FILE_NAME, INPUT_WEB_SITES_FILE_NAME, \
-    ARGUMENT_COMPLETE_DATABASE, ARGUMENT_CONSIDER_TLD, ARGUMENT_SCRAPE_ROV, ARGUMENT_RESOLVE_SCRIPT
+    ARGUMENT_COMPLETE_DATABASE, ARGUMENT_CONSIDER_TLD, ARGUMENT_SCRAPE_ROV, ARGUMENT_RESOLVE_SCRIPT, ARGUMENT_REFRESH_LANDING, \
+    ARGUMENT_SKIP_HSTS_HTTP, ARGUMENT_STATIC_SCRIPT_PARSING
 from utils import network_utils, list_utils, file_utils, snapshot_utils, datetime_utils, database_driver_utils
 
 
@@ -104,7 +106,7 @@ def get_input_generic_file(input_filename: str, default_values: tuple, project_r
     return result_list
 
 
-def get_input_application_flags(default_complete_unresolved_database=False, default_consider_tld=False, default_execute_script_resolving=False, default_execute_rov_scraping=False) -> Tuple[bool, bool, bool, bool]:
+def get_input_application_flags(default_complete_unresolved_database=False, default_consider_tld=False, default_execute_script_resolving=False, default_execute_rov_scraping=False, default_refresh_landing_cache=False, default_skip_hsts_http_probes=False, default_static_script_parsing=False) -> Tuple[bool, bool, bool, bool, bool, bool, bool]:
     """
     Start of the application: getting the parameters that can personalized the elaboration of the application.
     Such parameters (properties: they can be set or not set) are:
@@ -119,6 +121,15 @@ def get_input_application_flags(default_complete_unresolved_database=False, defa
 
     4- default_execute_rov_scraping: a flag that sets if ROVPage scraping should be executed.
 
+    5- default_refresh_landing_cache: a flag that sets if every site landing should be probed again, ignoring (and then
+    refreshing) the landing results saved by previous executions.
+
+    6- default_skip_hsts_http_probes: a flag that sets if the HTTP landing probes of the sites that a browser requests
+    only via HTTPS (HSTS preload list or HSTS header received via HTTPS) should be skipped.
+
+    7- default_static_script_parsing: a flag that sets if the scripts of the landing pages should be read from their
+    static HTML when possible, instead of always loading the pages with a headless browser.
+
     :param default_complete_unresolved_database: The default value of the flag.
     :type default_complete_unresolved_database: bool
     :param default_consider_tld: The default value of the flag.
@@ -127,8 +138,14 @@ def get_input_application_flags(default_complete_unresolved_database=False, defa
     :type default_execute_script_resolving: bool
     :param default_execute_rov_scraping: The default value of the flag.
     :type default_execute_rov_scraping: bool
+    :param default_refresh_landing_cache: The default value of the flag.
+    :type default_refresh_landing_cache: bool
+    :param default_skip_hsts_http_probes: The default value of the flag.
+    :type default_skip_hsts_http_probes: bool
+    :param default_static_script_parsing: The default value of the flag.
+    :type default_static_script_parsing: bool
     :return: A tuple of booleans for each flag.
-    :rtype: Tuple[bool, bool, bool ,bool]
+    :rtype: Tuple[bool, bool, bool ,bool, bool, bool, bool]
     """
     print(f"******* COMPUTING INPUT FLAGS *******")
     print('> Argument List:', str(sys.argv))
@@ -141,11 +158,20 @@ def get_input_application_flags(default_complete_unresolved_database=False, defa
             default_execute_rov_scraping = True
         elif arg == ARGUMENT_RESOLVE_SCRIPT:
             default_execute_script_resolving = True
+        elif arg == ARGUMENT_REFRESH_LANDING:
+            default_refresh_landing_cache = True
+        elif arg == ARGUMENT_SKIP_HSTS_HTTP:
+            default_skip_hsts_http_probes = True
+        elif arg == ARGUMENT_STATIC_SCRIPT_PARSING:
+            default_static_script_parsing = True
     print(f"> COMPLETE_UNRESOLVED_DATABASE flag: {str(default_complete_unresolved_database)}")
     print(f"> CONSIDER_TLDs flag: {str(default_consider_tld)}")
     print(f"> EXECUTE SCRIPT RESOLVING flag: {str(default_execute_script_resolving)}")
     print(f"> EXECUTE ROV SCRAPING flag: {str(default_execute_rov_scraping)}")
-    return default_complete_unresolved_database, default_consider_tld, default_execute_script_resolving, default_execute_rov_scraping
+    print(f"> REFRESH LANDING CACHE flag: {str(default_refresh_landing_cache)}")
+    print(f"> SKIP HSTS HTTP PROBES flag: {str(default_skip_hsts_http_probes)}")
+    print(f"> STATIC SCRIPT PARSING flag: {str(default_static_script_parsing)}")
+    return default_complete_unresolved_database, default_consider_tld, default_execute_script_resolving, default_execute_rov_scraping, default_refresh_landing_cache, default_skip_hsts_http_probes, default_static_script_parsing
 
 
 if __name__ == "__main__":
@@ -163,10 +189,22 @@ if __name__ == "__main__":
         # application input
         input_websites = get_input_websites()
         input_mail_domains = get_input_mail_domains()
-        complete_unresolved_database, consider_tld, execute_script_resolving, execute_rov_resolving = get_input_application_flags()
+        complete_unresolved_database, consider_tld, execute_script_resolving, execute_rov_resolving, refresh_landing_cache, skip_hsts_http_probes, static_script_parsing = get_input_application_flags()
         # entities
         print("********** START APPLICATION **********")
-        resolvers = ApplicationResolversWrapper(consider_tld, execute_script_resolving, execute_rov_resolving)
+        resolvers = ApplicationResolversWrapper(consider_tld, execute_script_resolving, execute_rov_resolving, refresh_landing_cache=refresh_landing_cache, skip_hsts_http_probes=skip_hsts_http_probes, static_script_parsing=static_script_parsing)
+        if resolvers.ip_as_database.has_previous():
+            print("> Reconciling stored IP-AS results with the updated .tsv database... ", end='')
+            previous_ip_as_database = resolvers.ip_as_database.get_previous()
+            ip_as_database_diff = IpAsDatabaseDiff(previous_ip_as_database, resolvers.ip_as_database)
+            moved_ip_addresses = helper_application_results.update_ip_as_database_results(ip_as_database_diff)
+            print(f"DONE ({str(ip_as_database_diff)}).")
+            for ip_address in moved_ip_addresses.keys():
+                print(f"--> {ip_address.compressed} moved from AS{moved_ip_addresses[ip_address][0]} to AS{moved_ip_addresses[ip_address][1]}")
+            ip_as_database_diff = None
+            previous_ip_as_database.close()
+            previous_ip_as_database = None
+            resolvers.ip_as_database.discard_previous()
         are_there_new_domain_name_from_db_completion = False
         new_domain_names_from_db_completion = set()
         if complete_unresolved_database:
@@ -207,6 +245,10 @@ if __name__ == "__main__":
         # closing
         if resolvers is not None:
             if resolvers.headless_browser_is_instantiated:
-                resolvers.headless_browser.close()
+                resolvers.browser_pool.close()
+            if resolvers.execute_rov_scraping:
+                resolvers.rov_page_scraper.close()
+            resolvers.landing_resolver.close()
+            resolvers.ip_as_database.close()
         close_database_connection()
     print("********** APPLICATION END **********")
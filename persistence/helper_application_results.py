@@ -1,11 +1,13 @@
 import csv
+import ipaddress
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Set
+from typing import Dict, Set, Tuple, Optional
 from peewee import DoesNotExist
 from entities.ApplicationResolversWrapper import ApplicationResolversWrapper
 from entities.DomainName import DomainName
 from entities.Url import Url
+from entities.resolvers.IpAsDatabaseDiff import IpAsDatabaseDiff
 from entities.resolvers.results.ASResolverResultForROVPageScraping import ASResolverResultForROVPageScraping
 from entities.resolvers.results.LandingSiteResult import LandingSiteResult
 from entities.resolvers.results.MultipleMailDomainResolvingResult import MultipleMailDomainResolvingResult
@@ -319,6 +321,74 @@ def insert_ip_as_and_rov_resolving(finals: ASResolverResultForROVPageScraping):
         helper_prefixes_table.bulk_upserts(prefixes_table_data_source)
 
 
+def update_ip_as_database_results(diff: IpAsDatabaseDiff) -> Dict[ipaddress.IPv4Address, Tuple[Optional[int], Optional[int]]]:
+    """
+    Reconciles the stored IP-AS results with the differences between 2 snapshots of the .tsv database: only the IP
+    addresses belonging to a removed, added or changed range are resolved again with the new snapshot, and only their
+    IpRangeTSVEntity, NetworkNumbersAssociation and AutonomousSystemEntity rows are updated. The associations of the
+    old ranges that no IP address depends on anymore are deleted.
+    When the Autonomous System of an IP address changes, its IpRangeROVEntity (taken from the prefixes table of the
+    old AS) is removed, so the IP address is considered unresolved and completed at the next database completion.
+
+    :param diff: The differences between the snapshot the results were computed with and the current one.
+    :type diff: IpAsDatabaseDiff
+    :return: The IP addresses whose Autonomous System changed, with the old and new AS number (None when not
+    resolved).
+    :rtype: Dict[ipaddress.IPv4Address, Tuple[Optional[int], Optional[int]]]
+    """
+    moved = dict()
+    if diff.is_empty():
+        return moved
+    ip_address_depends_data_source = list()
+    network_numbers_data_source = list()
+    autonomous_systems_data_source = dict()
+    key_iae = 'ip_address'
+    key_ine = 'ip_network'
+    key_irte = 'ip_range_tsv'
+    key_irre = 'ip_range_rov'
+    key_ase = 'autonomous_system'
+    with db.atomic():       # peewee transaction
+        iadas = list(IpAddressDependsAssociation.select())
+        ips = list(map(lambda iada: ipaddress.IPv4Address(iada.ip_address_id), iadas))
+        mask = diff.get_affected_mask(ips).tolist()
+        affected = list()
+        old_irte_ids = set()
+        for iada, ip, is_affected in zip(iadas, ips, mask):
+            if is_affected:
+                affected.append((iada, ip))
+                if iada.ip_range_tsv_id is not None:
+                    old_irte_ids.add(iada.ip_range_tsv_id)
+        old_as_numbers = helper_network_numbers.get_as_numbers_of(old_irte_ids)
+        entries = diff.new_database.resolve_ranges(map(lambda couple: couple[1], affected))
+        for (iada, ip), entry in zip(affected, entries):
+            old_as_number = old_as_numbers.get(iada.ip_range_tsv_id)
+            irte_id = None
+            new_as_number = None
+            if entry is not None:
+                new_as_number = entry.as_number
+                autonomous_systems_data_source[entry.as_number] = {'number': entry.as_number, 'description': entry.as_description, 'country_code': entry.country_code}
+                try:
+                    ip_range_tsv, networks = entry.get_network_of_ip(ip)
+                    irte_id = helper_ip_range_tsv.insert(ip_range_tsv.compressed).compressed_notation
+                    network_numbers_data_source.append({key_irte: irte_id, key_ase: entry.as_number})
+                except ValueError:
+                    pass
+            irre_id = iada.ip_range_rov_id
+            if old_as_number != new_as_number:
+                moved[ip] = (old_as_number, new_as_number)
+                irre_id = None
+            ip_address_depends_data_source.append({key_iae: iada.ip_address_id, key_ine: iada.ip_network_id, key_irte: irte_id, key_irre: irre_id})
+    with db.atomic():  # peewee transaction
+        helper_autonomous_system.bulk_upserts(list(autonomous_systems_data_source.values()))
+    with db.atomic():  # peewee transaction
+        helper_ip_address_depends.bulk_upserts(ip_address_depends_data_source)
+    with db.atomic():  # peewee transaction
+        helper_network_numbers.bulk_upserts(network_numbers_data_source)
+    with db.atomic():  # peewee transaction
+        helper_network_numbers.delete_unreferenced(old_irte_ids)
+    return moved
+
+
 def get_unresolved_entities(execute_script_resolving=True, execute_rov_scraping=True) -> set:
     print(f"> Start retrieving all unresolved entities... ", end='')
     total_results = set()
@@ -1,9 +1,9 @@
-from typing import Set
-from peewee import DoesNotExist
+from typing import Set, List, Dict, Union
+from peewee import DoesNotExist, chunked
 from entities.EntryIpAsDatabase import EntryIpAsDatabase
 from exceptions.NoDisposableRowsError import NoDisposableRowsError
 from persistence.BaseModel import AutonomousSystemEntity, IpRangeTSVEntity, NetworkNumbersAssociation,\
-    IpAddressDependsAssociation, IpAddressEntity, IpNetworkEntity
+    IpAddressDependsAssociation, IpAddressEntity, IpNetworkEntity, BATCH_SIZE_MAX, NORMALIZATION_CONSTANT
 
 
 def insert(entry: EntryIpAsDatabase) -> AutonomousSystemEntity:
@@ -11,6 +11,24 @@ def insert(entry: EntryIpAsDatabase) -> AutonomousSystemEntity:
     return ase
 
 
+# insert + update = upsert
+def bulk_upserts(data_source: List[Dict[str, Union[int, str]]]) -> None:
+    """
+    Must be invoked inside a peewee transaction. Transaction needs the database object (db).
+    Example:
+        with db.atomic() as transaction:
+            bulk_upserts(...)
+
+    :param data_source: Fields name and values of multiple AutonomousSystemEntity objects in the form of a
+    dictionary.
+    :type data_source: List[Dict[str, Union[int, str]]]
+    """
+    num_of_fields = 3
+    batch_size = int(BATCH_SIZE_MAX / (num_of_fields + NORMALIZATION_CONSTANT))
+    for batch in chunked(data_source, batch_size):
+        AutonomousSystemEntity.insert_many(batch).on_conflict_replace().execute()
+
+
 def get(as_number: int) -> AutonomousSystemEntity:
     try:
         return AutonomousSystemEntity.get_by_id(as_number)
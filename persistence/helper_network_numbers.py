@@ -1,7 +1,7 @@
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Set
 from peewee import chunked
 from persistence.BaseModel import NetworkNumbersAssociation, IpRangeTSVEntity, AutonomousSystemEntity, BATCH_SIZE_MAX, \
-    NORMALIZATION_CONSTANT
+    NORMALIZATION_CONSTANT, IpAddressDependsAssociation
 
 
 def insert(irte: IpRangeTSVEntity, ase: AutonomousSystemEntity) -> NetworkNumbersAssociation:
@@ -25,3 +25,45 @@ def bulk_upserts(data_source: List[Dict[str, Union[IpRangeTSVEntity, AutonomousS
     batch_size = int(BATCH_SIZE_MAX / (num_of_fields + NORMALIZATION_CONSTANT))
     for batch in chunked(data_source, batch_size):
         NetworkNumbersAssociation.insert_many(batch).on_conflict_replace().execute()
+
+
+def get_as_numbers_of(compressed_notations: Set[str]) -> Dict[str, int]:
+    """
+    Returns the Autonomous System number associated with each IpRangeTSVEntity (by compressed notation) parameter.
+
+    :param compressed_notations: The compressed notations of the IpRangeTSVEntity objects.
+    :type compressed_notations: Set[str]
+    :return: A dictionary of AS numbers by compressed notation; entities without association are missing.
+    :rtype: Dict[str, int]
+    """
+    result = dict()
+    num_of_fields = 1
+    batch_size = int(BATCH_SIZE_MAX / (num_of_fields + NORMALIZATION_CONSTANT))
+    for batch in chunked(compressed_notations, batch_size):
+        query = NetworkNumbersAssociation.select()\
+            .where(NetworkNumbersAssociation.ip_range_tsv.in_(batch))
+        for row in query:
+            result[row.ip_range_tsv_id] = row.autonomous_system_id
+    return result
+
+
+def delete_unreferenced(compressed_notations: Set[str]) -> int:
+    """
+    Must be invoked inside a peewee transaction. Deletes the NetworkNumbersAssociation of the IpRangeTSVEntity (by
+    compressed notation) parameter that no IP address depends on anymore.
+
+    :param compressed_notations: The compressed notations of the IpRangeTSVEntity objects.
+    :type compressed_notations: Set[str]
+    :return: The number of deleted rows.
+    :rtype: int
+    """
+    deleted = 0
+    num_of_fields = 1
+    batch_size = int(BATCH_SIZE_MAX / (num_of_fields + NORMALIZATION_CONSTANT))
+    for batch in chunked(compressed_notations, batch_size):
+        referenced = IpAddressDependsAssociation.select(IpAddressDependsAssociation.ip_range_tsv)\
+            .where(IpAddressDependsAssociation.ip_range_tsv.in_(batch))
+        deleted = deleted + NetworkNumbersAssociation.delete()\
+            .where((NetworkNumbersAssociation.ip_range_tsv.in_(batch)) & (NetworkNumbersAssociation.ip_range_tsv.not_in(referenced)))\
+            .execute()
+    return deleted
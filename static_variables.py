@@ -27,19 +27,32 @@ ARGUMENT_CONSIDER_TLD = '-tld'
 ARGUMENT_COMPLETE_DATABASE = '-continue'
 ARGUMENT_RESOLVE_SCRIPT = '-script'
 ARGUMENT_SCRAPE_ROV = '-rov'
+ARGUMENT_REFRESH_LANDING = '-refresh'
+ARGUMENT_SKIP_HSTS_HTTP = '-hsts'
+ARGUMENT_STATIC_SCRIPT_PARSING = '-static'
 # project folders
 OUTPUT_FOLDER_NAME = 'output'
 INPUT_FOLDER_NAME = 'input'
 SNAPSHOTS_FOLDER_NAME = 'SNAPSHOTS'
+RESOURCES_FOLDER_NAME = 'res'
 # input file names
 INPUT_MAIL_DOMAINS_FILE_NAME = 'mail_domains.txt'
 INPUT_WEB_SITES_FILE_NAME = 'web_pages.txt'
 IP_ASN_ARCHIVE_NAME = 'ip2asn-v4.tsv.gz'
+IP_ASN_DATABASE_NAME = 'ip2asn-v4.tsv'
+IP_ASN_COMPILED_DATABASE_NAME = 'ip2asn-v4.bin'
+IP_ASN_PREVIOUS_COMPILED_DATABASE_NAME = 'ip2asn-v4.previous.bin'
+IP_ASN_METADATA_NAME = 'ip2asn-v4.json'
+IP_ASN_DATABASE_URL = 'https://iptoasn.com/data/ip2asn-v4.tsv.gz'
+INPUT_VRP_DATABASE_FILE_NAMES = ('vrps.json', 'vrps.csv')
+HSTS_PRELOAD_FILE_NAME = 'hsts_preload.json'
 GECKODRIVER_FILENAME = get_geckodriver_filename()
 # output file names
 OUTPUT_DNS_CACHE_FILE_NAME = 'dns_cache.csv'
 OUTPUT_ERROR_LOGS_FILE_NAME = 'error_logs.csv'
 OUTPUT_UNRESOLVED_ENTITIES_FILE_NAME = 'unresolved_entities.csv'
+OUTPUT_ROV_PAGE_CACHE_FOLDER_NAME = 'rov_cache'
+OUTPUT_LANDING_CACHE_FILE_NAME = 'landing_cache.json'
 # temp file names
 TEMP_DNS_CACHE = 'temp_dns_cache.csv'
 TEMP_FLAGS = 'temp_flags.txt'
@@ -0,0 +1,111 @@
+import gc
+import ipaddress
+import os
+import sys
+import tracemalloc
+import unittest
+from entities.DomainName import DomainName
+from entities.LocalDnsResolverCache import LocalDnsResolverCache
+from entities.RRecord import RRecord
+from entities.enums.TypesRR import TypesRR
+
+
+class DictBackedDomainName:
+    """
+    Replica of the dict-backed DomainName layout (before slots and interning), used only as comparison term.
+    """
+    def __init__(self, string: str):
+        self.input_string = string
+        self.string = string.casefold() + '.'
+
+
+class DictBackedRRecord:
+    """
+    Replica of the dict-backed RRecord layout (before slots), used only as comparison term.
+    """
+    def __init__(self, name: str, type_rr: TypesRR, values: list):
+        self.name = DictBackedDomainName(name)
+        self.type = type_rr
+        self.values = list(map(lambda v: ipaddress.IPv4Address(v), values))
+
+
+class CacheMemoryFootprintBenchmarkCase(unittest.TestCase):
+    """
+    Memory benchmark of a cache full of A type resource records: it compares the memory retained by a cache of
+    slot-based entities against the dict-backed layout they replaced. The full scale run (1M records) is executed only
+    if the BENCHMARK_FULL_SCALE environment variable is set.
+
+    """
+    @classmethod
+    def setUpClass(cls) -> None:
+        # PARAMETER
+        cls.number_of_records = 20000
+        cls.full_scale_number_of_records = 1000000
+
+    @staticmethod
+    def compute_record_parameters(index: int):
+        return f"host{index}.bench{index % 1000}.example.it", [str(ipaddress.IPv4Address(167772160 + index))]
+
+    @staticmethod
+    def measure(factory, number_of_records: int) -> int:
+        gc.collect()
+        tracemalloc.start()
+        cache = factory(number_of_records)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del cache
+        return retained
+
+    @staticmethod
+    def build_slot_based_cache(number_of_records: int) -> LocalDnsResolverCache:
+        cache = LocalDnsResolverCache()
+        for i in range(number_of_records):
+            name, values = CacheMemoryFootprintBenchmarkCase.compute_record_parameters(i)
+            cache.add_entry(RRecord(name, TypesRR.A, values))
+        return cache
+
+    @staticmethod
+    def build_dict_backed_cache(number_of_records: int) -> dict:
+        cache = dict()
+        for i in range(number_of_records):
+            name, values = CacheMemoryFootprintBenchmarkCase.compute_record_parameters(i)
+            rr = DictBackedRRecord(name, TypesRR.A, values)
+            cache[rr.name.string] = rr
+        return cache
+
+    def test_01_no_instance_dictionaries(self):
+        print(f"\n------- START TEST 1 -------")
+        name, values = CacheMemoryFootprintBenchmarkCase.compute_record_parameters(0)
+        rr = RRecord(name, TypesRR.A, values)
+        print(f"RRecord size: {sys.getsizeof(rr)} bytes (values: {sys.getsizeof(rr.values)} bytes)")
+        print(f"DomainName size: {sys.getsizeof(rr.name)} bytes")
+        self.assertFalse(hasattr(rr, '__dict__'))
+        self.assertFalse(hasattr(rr.name, '__dict__'))
+        print(f"------- END TEST 1 -------")
+
+    @staticmethod
+    def compare_footprints(number_of_records: int):
+        print(f"Number of records: {number_of_records}")
+        slot_bytes = CacheMemoryFootprintBenchmarkCase.measure(CacheMemoryFootprintBenchmarkCase.build_slot_based_cache, number_of_records)
+        dict_bytes = CacheMemoryFootprintBenchmarkCase.measure(CacheMemoryFootprintBenchmarkCase.build_dict_backed_cache, number_of_records)
+        print(f"Slot-based cache: {slot_bytes / 2**20:.1f} MiB ({slot_bytes / number_of_records:.1f} bytes per record)")
+        print(f"Dict-backed cache: {dict_bytes / 2**20:.1f} MiB ({dict_bytes / number_of_records:.1f} bytes per record)")
+        print(f"Saved: {(dict_bytes - slot_bytes) / number_of_records:.1f} bytes per record")
+        return slot_bytes, dict_bytes
+
+    def test_02_cache_footprint(self):
+        print(f"\n------- START TEST 2 -------")
+        slot_bytes, dict_bytes = CacheMemoryFootprintBenchmarkCase.compare_footprints(self.number_of_records)
+        self.assertLess(slot_bytes, dict_bytes)
+        print(f"------- END TEST 2 -------")
+
+    @unittest.skipUnless(os.environ.get('BENCHMARK_FULL_SCALE'), 'set BENCHMARK_FULL_SCALE to run the 1M records benchmark')
+    def test_03_full_scale_cache_footprint(self):
+        print(f"\n------- START TEST 3 -------")
+        slot_bytes, dict_bytes = CacheMemoryFootprintBenchmarkCase.compare_footprints(self.full_scale_number_of_records)
+        self.assertLess(slot_bytes, dict_bytes)
+        print(f"------- END TEST 3 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import re
+import tempfile
+import time
+import unittest
+from entities.resolvers.ROVPageScraper import ROVPageScraper
+
+
+class GreedyRegexROVPageParser:
+    """
+    Replica of the previous ROV page parsing (newlines replaced, greedy regex rebuilt on each call and then a second
+    scan of 'p=' occurrences), used only as comparison term.
+    """
+    @staticmethod
+    def parse(document: str) -> list:
+        document = document.replace("\n", " ")
+        scraped_data = []
+        table_to_scrape = re.findall('var roatable.*\\(\\[.*]\\s*\\]\\);(?s:.*?)roatable', document)
+        if len(table_to_scrape) != 0:
+            str1 = table_to_scrape[0]
+            indexes = [_.start() for _ in re.finditer("p=", str1)]
+            for i in indexes:
+                end = str1.find('\\', i)
+                scraped_data.append(str1[i + 2:end])
+        return scraped_data
+
+
+class ROVPageParserBenchmarkCase(unittest.TestCase):
+    """
+    Time benchmark of the ROV page parsing over sample pages saved on disk, with a growing number of rows: it compares
+    the streaming extractor against the greedy regex scan it replaced.
+
+    """
+    temp_directory = None
+    sample_pages = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # PARAMETER
+        numbers_of_rows = [100, 1000, 10000]
+        cls.repetitions = 5
+        cls.temp_directory = tempfile.TemporaryDirectory()
+        cls.sample_pages = list()
+        for number_of_rows in numbers_of_rows:
+            filepath = f"{cls.temp_directory.name}{os.sep}AS{number_of_rows}.html"
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(ROVPageParserBenchmarkCase.build_sample_page(number_of_rows))
+                f.close()
+            cls.sample_pages.append((number_of_rows, filepath))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.temp_directory.cleanup()
+
+    @staticmethod
+    def build_sample_page(number_of_rows: int) -> str:
+        header = '<html>\n<head>\n' + '<link rel="stylesheet" href="style.css">\n' * 200 + '<script>\n'
+        rows = list()
+        for i in range(number_of_rows):
+            prefix = f"{10 + i // 65536}.{(i // 256) % 256}.{i % 256}.0/24"
+            rows.append(f'["<a href=\\"/roa/AS137?c=IT&l=1&v=4&p={prefix}\\">{prefix}</a>", 256, "IT", 10, "VLD", "<a href=\\"/roa/roas?p={prefix}\\">1</a>"]')
+        table = "var roatable = google.visualization.arrayToDataTable([\n['Prefix', 'Span', 'CC', 'Visibility', 'ROV', 'ROAs'],\n" + ',\n'.join(rows) + "\n]);\n"
+        footer = "var table = new google.visualization.Table(document.getElementById('pfx_table_div'));\ntable.draw(roatable, {allowHtml: true});\n"
+        # history charts drawn after the table, as in the real pages
+        history = list()
+        for chart in range(3):
+            days = list(map(lambda day: f"[new Date(2020, {day // 28 % 12}, {day % 28 + 1}), {day}, {day // 2}, {day // 3}]", range(number_of_rows // 4)))
+            history.append(f"var history{chart} = google.visualization.arrayToDataTable([\n['Date', 'Valid', 'Invalid', 'Unknown'],\n" + ',\n'.join(days) + f"\n]);\nnew google.visualization.LineChart(document.getElementById('history{chart}')).draw(history{chart}, {{}});\n")
+        body = "</script>\n</head>\n<body>\n" + '<div class="row">padding</div>\n' * 2000 + '</body>\n</html>\n'
+        return header + table + footer + ''.join(history) + body
+
+    @staticmethod
+    def measure(parse, document: str, repetitions: int) -> float:
+        start = time.perf_counter()
+        for i in range(repetitions):
+            parse(document)
+        return (time.perf_counter() - start) / repetitions
+
+    def test_01_same_prefixes(self):
+        print(f"\n------- START TEST 1 -------")
+        for number_of_rows, filepath in self.sample_pages:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                document = f.read()
+                f.close()
+            greedy = list(filter(lambda prefix: '/roa/roas' not in prefix, GreedyRegexROVPageParser.parse(document)))
+            streaming = list(ROVPageScraper.iter_prefixes([document]))
+            self.assertEqual(number_of_rows * 2, len(streaming))
+            self.assertEqual(greedy, streaming)
+        print(f"------- END TEST 1 -------")
+
+    def test_02_parsing_time(self):
+        print(f"\n------- START TEST 2 -------")
+        for number_of_rows, filepath in self.sample_pages:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                document = f.read()
+                f.close()
+            greedy_time = ROVPageParserBenchmarkCase.measure(GreedyRegexROVPageParser.parse, document, self.repetitions)
+            streaming_time = ROVPageParserBenchmarkCase.measure(lambda d: list(ROVPageScraper.iter_prefixes([d])), document, self.repetitions)
+            print(f"{number_of_rows} rows ({len(document)} chars): greedy regex {greedy_time * 1000:.2f} ms, streaming {streaming_time * 1000:.2f} ms (x{greedy_time / streaming_time:.1f})")
+            self.assertLess(streaming_time, greedy_time)
+        print(f"------- END TEST 2 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
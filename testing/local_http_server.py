@@ -0,0 +1,68 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class LocalSiteHandler(BaseHTTPRequestHandler):
+    """
+    Base request handler of the sites simulated by the tests: connections are kept alive (HTTP/1.1) and requests are
+    not logged. Subclasses implement the do_GET method.
+
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def send_empty_response(self, status_code: int, headers=()) -> None:
+        """
+        Sends a response without body.
+
+        :param status_code: The status code.
+        :type status_code: int
+        :param headers: The (name, value) header pairs.
+        :type headers: Iterable[Tuple[str, str]]
+        """
+        self.send_response(status_code)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalHttpServer:
+    """
+    HTTP server listening on a free port of the loopback interface, served by a daemon thread, that replaces the real
+    sites and services in the tests.
+
+    ...
+
+    Attributes
+    ----------
+    server : ThreadingHTTPServer
+        The server.
+    port : int
+        The port of the server.
+    base_url : str
+        The URL of the server root, without trailing slash.
+    """
+    def __init__(self, handler_class: type):
+        """
+        Instantiate the server and start serving.
+
+        :param handler_class: The request handler class.
+        :type handler_class: type
+        """
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        self.server.daemon_threads = True
+        self.port = self.server.server_port
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.__thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def close(self) -> None:
+        """
+        Stops serving and closes the server.
+
+        """
+        self.server.shutdown()
+        self.server.server_close()
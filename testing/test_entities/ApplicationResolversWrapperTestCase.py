@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+import selenium
+from entities.ApplicationResolversWrapper import ApplicationResolversWrapper
+from entities.FirefoxHeadlessWebDriver import FirefoxHeadlessWebDriver
+from entities.MainFrameScript import MainFrameScript
+from entities.SchemeUrl import SchemeUrl
+from entities.Url import Url
+from entities.error_log.ErrorLogger import ErrorLogger
+from entities.resolvers.ScriptDependenciesResolver import ScriptDependenciesResolver
+from entities.resolvers.results.LandingSiteResult import LandingSiteResult
+from entities.resolvers.results.LandingSiteSingleSchemeResult import LandingSiteSingleSchemeResult
+
+
+def landing(url: str) -> LandingSiteSingleSchemeResult:
+    return LandingSiteSingleSchemeResult(SchemeUrl(url), [url], False, None)
+
+
+class ApplicationResolversWrapperTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # PARAMETER
+        self.landing_results = {
+            Url('example.com'): LandingSiteResult(landing('https://www.example.com/'), landing('https://www.example.com/'), list()),
+            Url('example.org'): LandingSiteResult(landing('https://www.example.com/'), landing('http://legacy.example.org/'), list()),
+            Url('example.net'): LandingSiteResult(None, landing('http://www.example.net/'), list()),
+        }
+        self.failing_url = 'http://legacy.example.org/'
+        # the wrapper constructor needs geckodriver and the .tsv database: only the state used is set
+        self.wrapper = ApplicationResolversWrapper.__new__(ApplicationResolversWrapper)
+        self.wrapper.landing_web_sites_results = self.landing_results
+        self.wrapper.script_resolver = ScriptDependenciesResolver(headless_browser=mock.Mock(spec=FirefoxHeadlessWebDriver))
+        self.wrapper.error_logger = ErrorLogger()
+
+    def search_multiple_script_application_dependencies(self, resolver: ScriptDependenciesResolver, urls: list):
+        for url in urls:
+            if url.string == self.failing_url:
+                yield url, None, selenium.common.exceptions.WebDriverException(f"{url} can't be loaded")
+            else:
+                yield url, {MainFrameScript(f"{url.string}app.js", None)}, None
+
+    def test_01_one_search_per_landing_page(self):
+        print(f"\n------- START TEST 1 -------")
+        with mock.patch.object(ScriptDependenciesResolver, 'search_multiple_script_application_dependencies', autospec=True, side_effect=self.search_multiple_script_application_dependencies) as search:
+            results = self.wrapper.do_script_dependencies_resolving()
+        search.assert_called_once()
+        searched_urls = list(map(lambda url: url.string, search.call_args.args[1]))
+        print(f"Landing pages searched: {searched_urls}")
+        self.assertListEqual(['https://www.example.com/', self.failing_url, 'http://www.example.net/'], searched_urls)
+        # the scripts of a landing page are shared by every site and scheme that lands on it
+        shared_scripts = results[Url('example.com')].https
+        self.assertSetEqual({MainFrameScript('https://www.example.com/app.js', None)}, shared_scripts)
+        self.assertIs(shared_scripts, results[Url('example.com')].http)
+        self.assertIs(shared_scripts, results[Url('example.org')].https)
+        # failure: None, and the error is logged once for the landing page
+        self.assertIsNone(results[Url('example.org')].http)
+        self.assertEqual(1, len(self.wrapper.error_logger.logs))
+        # no landing: None
+        self.assertIsNone(results[Url('example.net')].https)
+        self.assertSetEqual({MainFrameScript('http://www.example.net/app.js', None)}, results[Url('example.net')].http)
+        self.assertSetEqual(set(self.landing_results.keys()), set(results.keys()))
+        print(f"------- END TEST 1 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,6 @@
+import copy
+import gc
+import pickle
 import unittest
 from entities.DomainName import DomainName
 
@@ -16,8 +19,8 @@ class DomainNameTestCase(unittest.TestCase):
 
     def test_01_equality(self):
         print(f"\n------- START TEST 1 -------")
-        print(f"standardized string of {self.domain_name.input_string}: {self.domain_name}")
-        print(f"standardized string of {self.for_comparison.input_string}: {self.for_comparison}")
+        print(f"standardized string of domain name: {self.domain_name}")
+        print(f"standardized string of domain name for comparison: {self.for_comparison}")
         self.assertEqual(self.domain_name, self.for_comparison)
         print(f"------- END TEST 1 -------")
 
@@ -107,6 +110,58 @@ class DomainNameTestCase(unittest.TestCase):
         print(f"Result: {result}")
         print(f"------- END TEST 8 -------")
 
+    def test_09_interning(self):
+        print(f"\n------- START TEST 9 -------")
+        # PARAMETERS
+        strings = ('Units.it', 'units.it.', 'UNITS.IT..', ' units.it')
+        # TESTING
+        domain_names = list(map(lambda s: DomainName(s), strings))
+        for i, dn in enumerate(domain_names):
+            print(f"[{i+1}/{len(domain_names)}]: {strings[i]} ==> {dn.string} (id={id(dn)})")
+            self.assertIs(domain_names[0], dn)
+        self.assertIs(DomainName(domain_names[0]), domain_names[0])
+        self.assertEqual(('units', 'it'), domain_names[0].labels)
+        print(f"------- END TEST 9 -------")
+
+    def test_10_copies_are_interned(self):
+        print(f"\n------- START TEST 10 -------")
+        self.assertIs(copy.copy(self.for_comparison), self.for_comparison)
+        self.assertIs(copy.deepcopy(self.for_comparison), self.for_comparison)
+        self.assertIs(pickle.loads(pickle.dumps(self.for_comparison)), self.for_comparison)
+        print(f"------- END TEST 10 -------")
+
+    def test_11_parse_subdomains_cached(self):
+        print(f"\n------- START TEST 11 -------")
+        subdomains = self.for_comparison.parse_subdomains(root_included=True, tld_included=True, self_included=True)
+        for i, dn in enumerate(subdomains):
+            print(f"[{i+1}/{len(subdomains)}]: {dn.string}")
+        self.assertEqual(['.', 'it.', 'units.it.'], list(map(lambda dn: dn.string, subdomains)))
+        self.assertIs(DomainName('it'), subdomains[1])
+        self.assertEqual([DomainName('units.it')], self.for_comparison.parse_subdomains(root_included=False, tld_included=False, self_included=True))
+        print(f"------- END TEST 11 -------")
+
+    def test_12_immutability(self):
+        print(f"\n------- START TEST 12 -------")
+        domain_name = DomainName('immutable.units.it')
+        hash_before = hash(domain_name)
+        with self.assertRaises(AttributeError):
+            domain_name.string = 'evil.'
+        with self.assertRaises(AttributeError):
+            del domain_name.string
+        self.assertEqual('immutable.units.it.', DomainName('immutable.units.it').string)
+        self.assertEqual(hash_before, hash(DomainName('immutable.units.it')))
+        print(f"------- END TEST 12 -------")
+
+    def test_13_unused_names_are_released(self):
+        print(f"\n------- START TEST 13 -------")
+        # PARAMETER
+        string = 'released.units.it.'
+        DomainName(string).parse_subdomains(root_included=True, tld_included=True, self_included=True)
+        gc.collect()
+        self.assertNotIn(string, DomainName._interned)
+        self.assertIn(self.for_comparison.string, DomainName._interned)
+        print(f"------- END TEST 13 -------")
+
 
 if __name__ == '__main__':
     unittest.main()
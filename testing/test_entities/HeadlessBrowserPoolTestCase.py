@@ -0,0 +1,127 @@
+import threading
+import time
+import unittest
+from unittest import mock
+import selenium
+from entities.FirefoxHeadlessWebDriver import FirefoxHeadlessWebDriver
+from entities.HeadlessBrowserPool import HeadlessBrowserPool
+
+
+def load_page(browser: FirefoxHeadlessWebDriver, item: str) -> str:
+    if browser.killed.is_set() or not browser.alive:
+        raise RuntimeError(f"Task {item} dispatched to not alive browser {browser.number}")
+    if item.startswith('crash'):
+        browser.alive = False
+        raise selenium.common.exceptions.WebDriverException(f"Browser {browser.number} crashed loading {item}")
+    elif item.startswith('hang'):
+        browser.killed.wait()
+        raise selenium.common.exceptions.WebDriverException(f"Browser {browser.number} killed loading {item}")
+    time.sleep(0.2)
+    return f"{item} loaded by browser {browser.number}"
+
+
+class HeadlessBrowserPoolTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.browsers = list()
+        self.lock = threading.Lock()
+        self.failing_factory = False
+
+    def new_browser(self) -> FirefoxHeadlessWebDriver:
+        """
+        Browser factory: every browser is a mock that can crash (not alive anymore) and hang (until it is killed).
+        """
+        with self.lock:
+            if self.failing_factory:
+                raise selenium.common.exceptions.WebDriverException('geckodriver not found')
+            browser = mock.Mock(spec=FirefoxHeadlessWebDriver)
+            browser.number = len(self.browsers) + 1
+            browser.alive = True
+            browser.killed = threading.Event()
+            browser.is_alive.side_effect = lambda: browser.alive and not browser.killed.is_set()
+            browser.kill.side_effect = lambda: browser.killed.set()
+            self.browsers.append(browser)
+            return browser
+
+    def test_01_parallel_dispatching(self):
+        print(f"\n------- START TEST 1 -------")
+        # PARAMETER
+        size = 4
+        items = [f"page{i}" for i in range(12)]
+        pool = HeadlessBrowserPool(self.new_browser, size=size)
+        start = time.monotonic()
+        results = list(pool.map(load_page, items))
+        elapsed = time.monotonic() - start
+        print(f"{len(items)} pages in {elapsed:.2f}s with {size} browsers (one browser: {0.2 * len(items):.2f}s)")
+        self.assertListEqual(items, list(map(lambda result: result[0], results)))
+        for item, result, error in results:
+            self.assertIsNone(error)
+            self.assertTrue(result.startswith(item))
+        self.assertLess(elapsed, 0.2 * len(items) / 2)
+        self.assertEqual(size, len(self.browsers))
+        # no health check while tasks succeed
+        self.assertTrue(all(map(lambda browser: browser.is_alive.call_count == 0, self.browsers)))
+        pool.close()
+        self.assertTrue(all(map(lambda browser: browser.close.called, self.browsers)))
+        print(f"------- END TEST 1 -------")
+
+    def test_02_crashed_browser_replacement(self):
+        print(f"\n------- START TEST 2 -------")
+        items = ['crash1', 'page1', 'page2', 'page3', 'crash2', 'page4']
+        pool = HeadlessBrowserPool(self.new_browser, size=2)
+        results = list(pool.map(load_page, items))
+        for item, result, error in results:
+            print(f"{item}: {result if error is None else error.msg}")
+            if item.startswith('crash'):
+                self.assertIsInstance(error, selenium.common.exceptions.WebDriverException)
+            else:
+                self.assertIsNone(error)
+        # crashed browsers are replaced
+        self.assertGreater(len(self.browsers), 2)
+        pool.close()
+        self.assertEqual(2, len(list(filter(lambda browser: not browser.alive and browser.close.called, self.browsers))))
+        print(f"------- END TEST 2 -------")
+
+    def test_03_hung_browser_replacement(self):
+        print(f"\n------- START TEST 3 -------")
+        # the other browser keeps returning results while the first one is hung
+        items = ['hang1'] + [f"page{i}" for i in range(10)]
+        pool = HeadlessBrowserPool(self.new_browser, size=2, task_timeout_seconds=0.5)
+        start = time.monotonic()
+        results = list(pool.map(load_page, items))
+        for item, result, error in results:
+            print(f"{item}: {result if error is None else error.msg}")
+        self.assertIsInstance(results[0][2], selenium.common.exceptions.TimeoutException)
+        self.assertTrue(all(map(lambda result: result[2] is None, results[1:])))
+        self.assertTrue(self.browsers[0].killed.is_set())
+        # killed within the timeout plus a watchdog period, not after the other tasks
+        self.assertLess(time.monotonic() - start, 0.2 * (len(items) - 1))
+        pool.close()
+        self.assertTrue(self.browsers[0].close.called)
+        print(f"------- END TEST 3 -------")
+
+    def test_04_failing_factory(self):
+        print(f"\n------- START TEST 4 -------")
+        items = ['crash1'] + [f"page{i}" for i in range(5)]
+        pool = HeadlessBrowserPool(self.new_browser, size=2, max_factory_failures=3, factory_backoff_seconds=0.01)
+        self.failing_factory = True
+        results = list(pool.map(load_page, items))
+        for item, result, error in results:
+            print(f"{item}: {result if error is None else error.msg}")
+        # the slot that can't replace its browser is retired, the healthy one executes the remaining tasks
+        self.assertTrue(all(map(lambda result: result[2] is None, results[1:])))
+        pool.close()
+        # no healthy slot left: the remaining tasks fail with the factory error
+        self.failing_factory = False
+        pool = HeadlessBrowserPool(self.new_browser, size=1, max_factory_failures=2, factory_backoff_seconds=0.01)
+        self.failing_factory = True
+        results = list(pool.map(load_page, ['crash2', 'page6', 'page7']))
+        for item, result, error in results:
+            print(f"{item}: {result if error is None else error.msg}")
+        self.assertIsInstance(results[0][2], selenium.common.exceptions.WebDriverException)
+        self.assertTrue(all(map(lambda result: 'geckodriver not found' in str(result[2]), results[1:])))
+        pool.close()
+        print(f"------- END TEST 4 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+from pathlib import Path
+from entities.HstsPreloadList import HstsPreloadList
+from static_variables import INPUT_FOLDER_NAME, HSTS_PRELOAD_FILE_NAME
+
+
+class HstsPreloadListTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # PARAMETER
+        self.chromium_json = '\n'.join([
+            '// Copyright 2012 The Chromium Authors',
+            '// comment lines are not JSON',
+            '{',
+            '  "entries": [',
+            '    // a comment inside the list',
+            '    { "name": "example.com", "policy": "custom", "mode": "force-https", "include_subdomains": true },',
+            '    { "name": "exact.example.org", "policy": "custom", "mode": "force-https" },',
+            '    { "name": "pinned.example.net", "policy": "custom", "pins": "google" }',
+            '  ]',
+            '}'
+        ])
+        self.temp_directory = tempfile.TemporaryDirectory()
+        self.project_root_directory = Path(self.temp_directory.name)
+
+    def tearDown(self) -> None:
+        self.temp_directory.cleanup()
+
+    def test_01_suffix_matching(self):
+        print(f"\n------- START TEST 1 -------")
+        hsts_preload_list = HstsPreloadList({'example.com': True, 'exact.example.org': False})
+        for host in ('example.com', 'www.example.com', 'a.b.example.com', 'WWW.Example.COM.', 'www.example.com:8443', 'exact.example.org'):
+            print(f"{host}: {hsts_preload_list.is_preloaded(host)}")
+            self.assertTrue(hsts_preload_list.is_preloaded(host))
+        for host in ('www.exact.example.org', 'example.org', 'notexample.com', 'com'):
+            print(f"{host}: {hsts_preload_list.is_preloaded(host)}")
+            self.assertFalse(hsts_preload_list.is_preloaded(host))
+        print(f"------- END TEST 1 -------")
+
+    def test_02_chromium_format(self):
+        print(f"\n------- START TEST 2 -------")
+        input_folder = self.project_root_directory / INPUT_FOLDER_NAME
+        input_folder.mkdir()
+        with open(input_folder / HSTS_PRELOAD_FILE_NAME, 'w', encoding='utf-8') as f:
+            f.write(self.chromium_json)
+        hsts_preload_list = HstsPreloadList.load(project_root_directory=self.project_root_directory)
+        print(f"{len(hsts_preload_list)} entries loaded")
+        self.assertTrue(hsts_preload_list.is_preloaded('www.example.com'))
+        self.assertTrue(hsts_preload_list.is_preloaded('exact.example.org'))
+        self.assertFalse(hsts_preload_list.is_preloaded('www.exact.example.org'))
+        # only force-https entries
+        self.assertFalse(hsts_preload_list.is_preloaded('pinned.example.net'))
+        # bundled entries are loaded too
+        self.assertTrue(hsts_preload_list.is_preloaded('www.site.dev'))
+        print(f"------- END TEST 2 -------")
+
+    def test_03_bundled_list(self):
+        print(f"\n------- START TEST 3 -------")
+        hsts_preload_list = HstsPreloadList.load(project_root_directory=self.project_root_directory)
+        print(f"{len(hsts_preload_list)} bundled entries")
+        self.assertGreater(len(hsts_preload_list), 0)
+        self.assertTrue(hsts_preload_list.is_preloaded('web.dev'))
+        self.assertTrue(hsts_preload_list.is_preloaded('get.app'))
+        self.assertFalse(hsts_preload_list.is_preloaded('example.com'))
+        print(f"------- END TEST 3 -------")
+
+    def test_04_malformed_file(self):
+        print(f"\n------- START TEST 4 -------")
+        filepath = self.project_root_directory / HSTS_PRELOAD_FILE_NAME
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('{"entries": ')
+        hsts_preload_list = HstsPreloadList()
+        self.assertRaises(ValueError, hsts_preload_list.load_json, str(filepath))
+        print(f"------- END TEST 4 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
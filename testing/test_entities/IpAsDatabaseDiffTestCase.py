@@ -0,0 +1,102 @@
+import ipaddress
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from entities.resolvers.IpAsDatabase import IpAsDatabase
+from entities.resolvers.IpAsDatabaseDiff import IpAsDatabaseDiff
+from static_variables import INPUT_FOLDER_NAME
+
+
+class IpAsDatabaseDiffTestCase(unittest.TestCase):
+    temp_directory = None
+    database = None
+    previous_database = None
+
+    @staticmethod
+    def write_tsv(project_root_directory: Path, rows: list) -> None:
+        filepath = f"{str(project_root_directory)}{os.sep}{INPUT_FOLDER_NAME}{os.sep}ip2asn-v4.tsv"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(rows) + '\n')
+        # the .tsv database has to look newer than the compiled one
+        os.utime(filepath, (os.path.getmtime(filepath) + 10, os.path.getmtime(filepath) + 10))
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # PARAMETER
+        old_rows = [
+            '1.0.0.0\t1.0.0.255\t13335\tUS\tCLOUDFLARENET',
+            '8.8.8.0\t8.8.8.255\t15169\tUS\tGOOGLE',
+            '9.9.9.0\t9.9.9.255\t19281\tUS\tQUAD9-AS-1',
+            '193.205.128.0\t193.205.159.255\t137\tIT\tASGARR Consortium GARR',
+        ]
+        new_rows = [
+            '1.0.0.0\t1.0.0.255\t13335\tUS\tCLOUDFLARENET',
+            '8.8.8.0\t8.8.8.127\t15169\tUS\tGOOGLE',
+            '8.8.8.128\t8.8.8.255\t15169\tUS\tGOOGLE',
+            '9.9.9.0\t9.9.9.255\t19281\tCH\tQUAD9-AS-1',
+            '193.205.128.0\t193.205.159.255\t1299\tSE\tTWELVE99',
+            '200.0.0.0\t200.0.0.255\t64500\tZZ\tNEW',
+        ]
+        cls.temp_directory = tempfile.TemporaryDirectory()
+        project_root_directory = Path(cls.temp_directory.name)
+        (project_root_directory / INPUT_FOLDER_NAME).mkdir()
+        cls.write_tsv(project_root_directory, old_rows)
+        IpAsDatabase(project_root_directory=project_root_directory)
+        cls.write_tsv(project_root_directory, new_rows)
+        cls.database = IpAsDatabase(project_root_directory=project_root_directory)
+        cls.previous_database = cls.database.get_previous()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.temp_directory.cleanup()
+
+    def test_01_previous_database_is_kept(self):
+        print(f"\n------- START TEST 1 -------")
+        self.assertTrue(self.database.has_previous())
+        self.assertTrue(IpAsDatabase.is_compiled_database_well_formed(self.database.previous_compiled_filepath))
+        self.assertFalse(IpAsDatabase.is_compiled_database_well_formed(self.database.filepath))
+        self.assertEqual(4, len(self.previous_database))
+        self.assertEqual(6, len(self.database))
+        print(f"------- END TEST 1 -------")
+
+    def test_02_diff(self):
+        print(f"\n------- START TEST 2 -------")
+        diff = IpAsDatabaseDiff(self.previous_database, self.database)
+        print(f"Diff: {str(diff)}")
+        self.assertFalse(diff.is_empty())
+        self.assertEqual(['8.8.8.0'], list(map(lambda entry: entry.start_ip_range.compressed, diff.get_removed_entries())))
+        self.assertEqual(['8.8.8.0', '8.8.8.128', '200.0.0.0'], list(map(lambda entry: entry.start_ip_range.compressed, diff.get_added_entries())))
+        self.assertEqual([('CH', 19281), ('SE', 1299)], list(map(lambda entry: (entry.country_code, entry.as_number), diff.get_changed_entries())))
+        self.assertTrue(IpAsDatabaseDiff(self.database, self.database).is_empty())
+        print(f"------- END TEST 2 -------")
+
+    def test_03_affected_ip_addresses(self):
+        print(f"\n------- START TEST 3 -------")
+        # PARAMETER
+        ips = ['1.0.0.1', '8.8.8.8', '9.9.9.9', '193.205.130.1', '200.0.0.1', '10.0.0.1']
+        diff = IpAsDatabaseDiff(self.previous_database, self.database)
+        mask = diff.get_affected_mask(map(ipaddress.IPv4Address, ips)).tolist()
+        for ip, is_affected in zip(ips, mask):
+            print(f"{ip}: {is_affected}")
+        self.assertEqual([False, True, True, True, True, False], mask)
+        print(f"------- END TEST 3 -------")
+
+    def test_04_discard_previous(self):
+        print(f"\n------- START TEST 4 -------")
+        database = IpAsDatabase(project_root_directory=Path(self.temp_directory.name))
+        self.assertTrue(database.has_previous())
+        # the mapping is released before deleting the file (required on Windows)
+        diff = IpAsDatabaseDiff(self.previous_database, database)
+        diff = None
+        self.previous_database.close()
+        self.assertIsNone(self.previous_database.mapped_file)
+        self.assertEqual(0, len(self.previous_database))
+        database.discard_previous()
+        self.assertFalse(database.has_previous())
+        database.close()
+        print(f"------- END TEST 4 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
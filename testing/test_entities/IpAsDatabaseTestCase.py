@@ -0,0 +1,98 @@
+import ipaddress
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from entities.resolvers.IpAsDatabase import IpAsDatabase
+from exceptions.AutonomousSystemNotFoundError import AutonomousSystemNotFoundError
+from static_variables import INPUT_FOLDER_NAME
+
+
+class IpAsDatabaseTestCase(unittest.TestCase):
+    temp_directory = None
+    database = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # PARAMETER
+        rows = [
+            '1.0.0.0\t1.0.0.255\t13335\tUS\tCLOUDFLARENET',
+            '1.0.1.0\t1.0.3.255\t0\tNone\tNot routed',
+            '8.8.8.0\t8.8.8.255\t15169\tUS\tGOOGLE',
+            'malformed row',
+            '193.205.128.0\t193.205.159.255\t137\tIT\tASGARR Consortium GARR',
+            '193.206.0.0\t193.206.255.255\t137\tIT\tASGARR Consortium GARR',
+        ]
+        cls.temp_directory = tempfile.TemporaryDirectory()
+        project_root_directory = Path(cls.temp_directory.name)
+        (project_root_directory / INPUT_FOLDER_NAME).mkdir()
+        with open(f"{str(project_root_directory)}{os.sep}{INPUT_FOLDER_NAME}{os.sep}ip2asn-v4.tsv", 'w', encoding='utf-8') as f:
+            f.write('\n'.join(rows) + '\n')
+        cls.database = IpAsDatabase(project_root_directory=project_root_directory)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.temp_directory.cleanup()
+
+    def test_01_resolve_range(self):
+        print(f"\n------- START TEST 1 -------")
+        ip = ipaddress.IPv4Address('193.205.130.1')
+        entry = self.database.resolve_range(ip)
+        print(f"{ip} ==> {str(entry)}")
+        self.assertEqual(137, entry.as_number)
+        self.assertEqual(ipaddress.IPv4Address('193.205.128.0'), entry.start_ip_range)
+        self.assertEqual('ASGARR Consortium GARR', entry.as_description)
+        with self.assertRaises(AutonomousSystemNotFoundError):
+            self.database.resolve_range(ipaddress.IPv4Address('9.9.9.9'))
+        print(f"------- END TEST 1 -------")
+
+    def test_02_resolve_ranges(self):
+        print(f"\n------- START TEST 2 -------")
+        ips = list(map(lambda s: ipaddress.IPv4Address(s), ['0.0.0.1', '1.0.0.0', '1.0.2.7', '8.8.8.8', '8.8.9.0', '193.206.255.255', '255.255.255.255']))
+        entries = self.database.resolve_ranges(ips)
+        for ip, entry in zip(ips, entries):
+            print(f"{ip} ==> {str(entry)}")
+        self.assertEqual([None, 13335, 0, 15169, None, 137, None], list(map(lambda e: None if e is None else e.as_number, entries)))
+        self.assertEqual([], self.database.resolve_ranges([]))
+        print(f"------- END TEST 2 -------")
+
+    def test_03_get_entries_from_as_number(self):
+        print(f"\n------- START TEST 3 -------")
+        entries = self.database.get_entries_from_as_number(137)
+        for entry in entries:
+            print(f"{str(entry)}")
+        self.assertEqual(2, len(entries))
+        indexes = self.database.get_indexes_from_as_number(137)
+        self.assertEqual([3, 4], indexes.tolist())
+        self.assertEqual(0, len(self.database.get_indexes_from_as_number(-1)))
+        with self.assertRaises(AutonomousSystemNotFoundError):
+            self.database.get_entries_from_as_number(64512)
+        print(f"------- END TEST 3 -------")
+
+    def test_04_compiled_database_is_mapped(self):
+        print(f"\n------- START TEST 4 -------")
+        print(f"Compiled database: {self.database.compiled_filepath}")
+        self.assertTrue(IpAsDatabase.is_compiled_database_valid(self.database.compiled_filepath, self.database.filepath))
+        self.assertFalse(self.database.start_ip_ranges.flags.writeable)
+        reloaded = IpAsDatabase(project_root_directory=Path(self.temp_directory.name))
+        self.assertEqual(len(self.database), len(reloaded))
+        self.assertEqual(5, len(reloaded))
+        self.assertEqual('CLOUDFLARENET', reloaded.resolve_range(ipaddress.IPv4Address('1.0.0.1')).as_description)
+        print(f"------- END TEST 4 -------")
+
+    def test_05_get_network_of_ip(self):
+        print(f"\n------- START TEST 5 -------")
+        ip = ipaddress.IPv4Address('1.0.2.7')
+        entry = self.database.resolve_range(ip)
+        network, networks = entry.get_network_of_ip(ip)
+        print(f"{ip} ==> {network.compressed} in {list(map(lambda n: n.compressed, networks))}")
+        self.assertEqual(ipaddress.IPv4Network('1.0.2.0/23'), network)
+        self.assertEqual([ipaddress.IPv4Network('1.0.1.0/24'), ipaddress.IPv4Network('1.0.2.0/23')], networks)
+        self.assertIs(entry, self.database.resolve_range(ipaddress.IPv4Address('1.0.1.1')))
+        with self.assertRaises(ValueError):
+            entry.get_network_of_ip(ipaddress.IPv4Address('1.0.0.1'))
+        print(f"------- END TEST 5 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import threading
+import time
+import unittest
+from collections import defaultdict
+from unittest import mock
+from entities.DomainName import DomainName
+from entities.HstsPreloadList import HstsPreloadList
+from entities.RRecord import RRecord
+from entities.RedirectionHop import RedirectionHop
+from entities.SchemeUrl import SchemeUrl
+from entities.Url import Url
+from entities.enums.TypesRR import TypesRR
+from entities.resolvers.DnsResolver import DnsResolver
+from entities.resolvers.LandingResolver import LandingResolver
+from entities.resolvers.results.LandingSiteSingleSchemeResult import LandingSiteSingleSchemeResult
+
+
+class LandingResolverTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # PARAMETER
+        self.delay = 0.2
+        self.destinations = {
+            '10.0.0.1': ['site1.example', 'site2.example', 'site3.example', 'site4.example', 'down1.example'],
+            '10.0.0.2': ['site5.example', 'site6.example', 'site7.example', 'down2.example'],
+            '10.0.0.3': ['hsts1.example', 'www.site.dev', 'down.site.dev'],
+        }
+        self.dns_resolver = DnsResolver(True)
+        self.sites = set()
+        for ip, names in self.destinations.items():
+            for name in names:
+                self.dns_resolver.cache.add_entry(RRecord(name, TypesRR.A, [ip]))
+                self.sites.add(Url(name))
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.in_flight_per_destination = defaultdict(int)
+        self.max_in_flight_per_destination = defaultdict(int)
+        self.requests = list()
+
+    def simulated_requests(self, delay: float):
+        """
+        Patches the requests of LandingResolver: every request takes some time and keeps track of the requests in
+        flight (in total and per destination). Sites whose name starts with 'down' fail via HTTPS, sites whose name
+        starts with 'hsts' return a HSTS header via HTTPS.
+        """
+        def do_single_request(resolver: LandingResolver, site: Url, https: bool) -> LandingSiteSingleSchemeResult:
+            destination = resolver.get_destination(site)
+            with self.lock:
+                self.in_flight = self.in_flight + 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                self.in_flight_per_destination[destination] = self.in_flight_per_destination[destination] + 1
+                self.requests.append((site, https))
+                self.max_in_flight_per_destination[destination] = max(self.max_in_flight_per_destination[destination], self.in_flight_per_destination[destination])
+            time.sleep(delay)
+            with self.lock:
+                self.in_flight = self.in_flight - 1
+                self.in_flight_per_destination[destination] = self.in_flight_per_destination[destination] - 1
+            if https and site.domain_name().string.startswith('down'):
+                raise ConnectionError(f"{site} is down via HTTPS")
+            landing_url = site.https() if https else site.http()
+            hsts = 'max-age=31536000' if https and site.domain_name().string.startswith('hsts') else None
+            hops = [RedirectionHop(landing_url.string, 200, None, hsts, None)]
+            return LandingSiteSingleSchemeResult(SchemeUrl(landing_url.string), [landing_url.string], hsts is not None, resolver.dns_resolver.resolve_a_path(site.domain_name()), redirection_hops=hops)
+        return mock.patch.object(LandingResolver, 'do_single_request', autospec=True, side_effect=do_single_request)
+
+    def test_01_bounded_concurrency(self):
+        print(f"\n------- START TEST 1 -------")
+        # PARAMETER
+        max_workers = 6
+        max_requests_per_ip = 2
+        resolver = LandingResolver(self.dns_resolver, max_workers=max_workers, max_requests_per_ip=max_requests_per_ip)
+        with self.simulated_requests(self.delay):
+            start = time.monotonic()
+            results = resolver.resolve_sites(self.sites)
+            elapsed = time.monotonic() - start
+        sequential = 2 * len(self.sites) * self.delay
+        print(f"{2 * len(self.sites)} requests in {elapsed:.2f}s (sequentially: {sequential:.2f}s), max {self.max_in_flight} in flight")
+        for destination, max_in_flight in self.max_in_flight_per_destination.items():
+            print(f"destination {destination}: max {max_in_flight} in flight")
+            self.assertLessEqual(max_in_flight, max_requests_per_ip)
+        self.assertLessEqual(self.max_in_flight, max_workers)
+        self.assertGreater(self.max_in_flight, 1)
+        self.assertLess(elapsed, sequential / 2)
+        self.assertSetEqual(self.sites, set(results.keys()))
+        print(f"------- END TEST 1 -------")
+
+    def test_02_same_results(self):
+        print(f"\n------- START TEST 2 -------")
+        concurrent_resolver = LandingResolver(self.dns_resolver, max_workers=8, max_requests_per_ip=2)
+        sequential_resolver = LandingResolver(self.dns_resolver)
+        with self.simulated_requests(0.0):
+            results = concurrent_resolver.resolve_sites(self.sites)
+            expected_results = {site: sequential_resolver.resolve_site(site) for site in self.sites}
+        for site in self.sites:
+            expected = expected_results[site]
+            print(f"{site}: HTTPS={results[site].https is not None}, HTTP={results[site].http is not None}, {len(results[site].error_logs)} error logs")
+            self.assertEqual(expected.https is None, results[site].https is None)
+            self.assertEqual(expected.http.url, results[site].http.url)
+            self.assertListEqual(expected.error_logs, results[site].error_logs)
+        self.assertIsNone(results[Url('down1.example')].https)
+        self.assertEqual(1, len(results[Url('down1.example')].error_logs))
+        print(f"------- END TEST 2 -------")
+
+    def test_03_host_resolver_uses_dns_cache(self):
+        print(f"\n------- START TEST 3 -------")
+        resolver = LandingResolver(self.dns_resolver)
+        for ip, names in self.destinations.items():
+            for name in names:
+                self.assertListEqual([ip], resolver.resolve_host(name))
+        self.assertListEqual([], resolver.resolve_host('10.0.0.4'))
+        resolver.close()
+        print(f"------- END TEST 3 -------")
+
+    def test_04_skip_hsts_http_probes(self):
+        print(f"\n------- START TEST 4 -------")
+        # PARAMETER
+        hsts_preload_list = HstsPreloadList({'dev': True})
+        resolver = LandingResolver(self.dns_resolver, hsts_preload_list=hsts_preload_list, skip_hsts_http_probes=True)
+        with self.simulated_requests(0.0):
+            results = resolver.resolve_sites(self.sites)
+        http_probed_sites = set(map(lambda request: request[0], filter(lambda request: not request[1], self.requests)))
+        print(f"HTTP probes: {len(http_probed_sites)} for {len(self.sites)} sites")
+        # preloaded or HSTS via HTTPS: no HTTP probe, the browser upgrades to HTTPS
+        for site in (Url('hsts1.example'), Url('www.site.dev')):
+            self.assertNotIn(site, http_probed_sites)
+            result = results[site]
+            self.assertEqual(0, len(result.error_logs))
+            self.assertEqual(result.https.url, result.http.url)
+            self.assertEqual(307, result.http.redirection_hops[0].status_code)
+            self.assertEqual(site.http().string, result.http.redirection_path[0])
+            self.assertEqual(site.https().string, result.http.redirection_hops[0].location)
+        # HTTPS failure: the HTTP probe is executed even if preloaded
+        self.assertIn(Url('down.site.dev'), http_probed_sites)
+        self.assertEqual(1, len(results[Url('down.site.dev')].error_logs))
+        # no known HSTS policy
+        self.assertIn(Url('site1.example'), http_probed_sites)
+        self.assertFalse(results[Url('site1.example')].http.url.string.startswith('https'))
+        print(f"------- END TEST 4 -------")
+
+    def test_05_shared_landing_a_paths(self):
+        print(f"\n------- START TEST 5 -------")
+        resolver = LandingResolver(self.dns_resolver)
+        a_path = resolver.resolve_landing_a_path(DomainName('site1.example'))
+        print(f"Landing host A path: {a_path.stamp()}")
+        # same landing host, same object: no new resolution
+        self.dns_resolver.cache.clear()
+        self.assertIs(a_path, resolver.resolve_landing_a_path(DomainName('site1.example')))
+        resolver.close()
+        print(f"------- END TEST 5 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import tempfile
+import unittest
+from pathlib import Path
+from entities.LandingResultCache import LandingResultCache
+from entities.RRecord import RRecord
+from entities.Url import Url
+from entities.enums.TypesRR import TypesRR
+from entities.resolvers.DnsResolver import DnsResolver
+from entities.resolvers.LandingResolver import LandingResolver
+from testing.local_http_server import LocalSiteHandler, LocalHttpServer
+
+
+class LandingSiteHandler(LocalSiteHandler):
+    """
+    Local site: the starting page redirects to the landing page set in the class attribute.
+
+    """
+    landing_path = '/landing'
+    requests_served = list()
+
+    def do_GET(self):
+        LandingSiteHandler.requests_served.append(self.path)
+        if self.path == '/start/':
+            self.send_empty_response(301, [('Location', LandingSiteHandler.landing_path)])
+        else:
+            self.send_empty_response(200, [('Strict-Transport-Security', 'max-age=31536000')])
+
+
+class LandingResultCacheTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.local_server = LocalHttpServer(LandingSiteHandler)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.local_server.close()
+
+    def setUp(self) -> None:
+        # PARAMETER
+        self.site = Url(f"site.test:{self.local_server.port}/start")
+        self.temp_directory = tempfile.TemporaryDirectory()
+        self.project_root_directory = Path(self.temp_directory.name)
+        self.dns_resolver = DnsResolver(True)
+        for name in ('site.test', f"site.test:{self.local_server.port}"):
+            self.dns_resolver.cache.add_entry(RRecord(name, TypesRR.A, ['127.0.0.1']))
+        LandingSiteHandler.landing_path = '/landing'
+        LandingSiteHandler.requests_served.clear()
+
+    def tearDown(self) -> None:
+        self.temp_directory.cleanup()
+
+    def new_resolver(self, ttl_seconds=86400, force_refresh=False) -> LandingResolver:
+        cache = LandingResultCache(project_root_directory=self.project_root_directory, ttl_seconds=ttl_seconds)
+        return LandingResolver(self.dns_resolver, cache=cache, force_refresh=force_refresh)
+
+    def test_01_fresh_entries_across_executions(self):
+        print(f"\n------- START TEST 1 -------")
+        resolver = self.new_resolver()
+        result = resolver.do_single_request(self.site, https=False)
+        resolver.close()
+        self.assertEqual(2, len(LandingSiteHandler.requests_served))
+        # new execution
+        resolver = self.new_resolver()
+        self.assertEqual(1, len(resolver.cache))
+        cached_result = resolver.do_single_request(self.site, https=False)
+        resolver.close()
+        print(f"Landing url: {cached_result.url}, redirection path: {cached_result.redirection_path}, HSTS: {cached_result.hsts}")
+        self.assertEqual(2, len(LandingSiteHandler.requests_served))
+        self.assertEqual(result.url, cached_result.url)
+        self.assertListEqual(result.redirection_path, cached_result.redirection_path)
+        self.assertEqual(result.hsts, cached_result.hsts)
+        self.assertTrue(cached_result.hsts)
+        self.assertEqual(result.server, cached_result.server)
+        print(f"------- END TEST 1 -------")
+
+    def test_02_revalidation(self):
+        print(f"\n------- START TEST 2 -------")
+        resolver = self.new_resolver(ttl_seconds=0)
+        resolver.do_single_request(self.site, https=False)
+        LandingSiteHandler.requests_served.clear()
+        # same first hop: only the starting page is requested
+        result = resolver.do_single_request(self.site, https=False)
+        print(f"Requests to revalidate: {LandingSiteHandler.requests_served}")
+        self.assertListEqual(['/start/'], LandingSiteHandler.requests_served)
+        self.assertTrue(result.url.string.endswith('/landing'))
+        # different first hop: the path is probed again
+        LandingSiteHandler.landing_path = '/new_landing'
+        LandingSiteHandler.requests_served.clear()
+        result = resolver.do_single_request(self.site, https=False)
+        print(f"Requests after change: {LandingSiteHandler.requests_served}")
+        self.assertListEqual(['/start/', '/start/', '/new_landing'], LandingSiteHandler.requests_served)
+        self.assertTrue(result.url.string.endswith('/new_landing'))
+        resolver.close()
+        print(f"------- END TEST 2 -------")
+
+    def test_03_force_refresh(self):
+        print(f"\n------- START TEST 3 -------")
+        resolver = self.new_resolver()
+        resolver.do_single_request(self.site, https=False)
+        resolver.close()
+        LandingSiteHandler.landing_path = '/new_landing'
+        LandingSiteHandler.requests_served.clear()
+        resolver = self.new_resolver(force_refresh=True)
+        result = resolver.do_single_request(self.site, https=False)
+        resolver.close()
+        self.assertListEqual(['/start/', '/new_landing'], LandingSiteHandler.requests_served)
+        # the refreshed path is saved
+        resolver = self.new_resolver()
+        self.assertTrue(resolver.do_single_request(self.site, https=False).url.string.endswith('/new_landing'))
+        resolver.close()
+        self.assertTrue(result.url.string.endswith('/new_landing'))
+        print(f"------- END TEST 3 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
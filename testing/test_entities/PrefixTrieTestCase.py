@@ -0,0 +1,57 @@
+import ipaddress
+import unittest
+from entities.PrefixTrie import PrefixTrie
+from entities.resolvers.ROVPageScraper import ROVPageScraper
+from exceptions.NetworkNotFoundError import NetworkNotFoundError
+from exceptions.TableNotPresentError import TableNotPresentError
+
+
+class PrefixTrieTestCase(unittest.TestCase):
+    @staticmethod
+    def fake_rov_page(prefixes: list) -> str:
+        rows = ', '.join(map(lambda prefix: f'["<a href=\\"roa?p={prefix}\\">"]', prefixes))
+        return f"var roatable = new DataTable([{rows} ]); roatable.draw();"
+
+    def test_01_longest_prefix_match(self):
+        print(f"\n------- START TEST 1 -------")
+        # PARAMETER
+        prefixes = ['8.0.0.0/8', '8.8.0.0/16', '8.8.8.0/24', '8.8.8.0/24', '9.9.9.9/32']
+        trie = PrefixTrie()
+        for i, prefix in enumerate(prefixes):
+            trie.insert(ipaddress.IPv4Network(prefix), f"{prefix} ({i})")
+        self.assertEqual(4, len(trie))
+        self.assertEqual('8.8.8.0/24 (2)', trie.longest_prefix_match(ipaddress.IPv4Address('8.8.8.8')))
+        self.assertEqual('8.8.0.0/16 (1)', trie.longest_prefix_match(ipaddress.IPv4Address('8.8.4.4')))
+        self.assertEqual('8.0.0.0/8 (0)', trie.longest_prefix_match(ipaddress.IPv4Address('8.1.1.1')))
+        self.assertEqual('9.9.9.9/32 (4)', trie.longest_prefix_match(ipaddress.IPv4Address('9.9.9.9')))
+        self.assertIsNone(trie.get_longest_prefix_match(ipaddress.IPv4Address('9.9.9.8')))
+        with self.assertRaises(NetworkNotFoundError):
+            trie.longest_prefix_match(ipaddress.IPv4Address('1.1.1.1'))
+        self.assertEqual(['8.0.0.0/8 (0)', '8.8.0.0/16 (1)', '8.8.8.0/24 (2)', '9.9.9.9/32 (4)'], trie.values())
+        trie.insert(ipaddress.IPv4Network('0.0.0.0/0'), 'default')
+        self.assertEqual('default', trie.longest_prefix_match(ipaddress.IPv4Address('1.1.1.1')))
+        print(f"------- END TEST 1 -------")
+
+    def test_02_rov_page_scraper_tables_are_scoped(self):
+        print(f"\n------- START TEST 2 -------")
+        scraper = ROVPageScraper()
+        scraper.responseDocument = self.fake_rov_page(['8.8.8.0/24', '8.8.0.0/16'])
+        scraper.pageLoaded = True
+        scraper.current_as_number = 15169
+        self.assertEqual(2, len(scraper.scrape_prefixes_table_from_page(15169)))
+        scraper.responseDocument = self.fake_rov_page(['1.1.1.0/24'])
+        scraper.current_as_number = 13335
+        self.assertEqual(1, len(scraper.scrape_prefixes_table_from_page(13335)))
+        row = scraper.get_network_if_present(ipaddress.IPv4Address('8.8.8.8'), 15169)
+        print(f"Row: {str(row)}")
+        self.assertEqual(ipaddress.IPv4Network('8.8.8.0/24'), row.prefix)
+        self.assertEqual(ipaddress.IPv4Network('1.1.1.0/24'), scraper.get_network_if_present(ipaddress.IPv4Address('1.1.1.1')).prefix)
+        with self.assertRaises(NetworkNotFoundError):
+            scraper.get_network_if_present(ipaddress.IPv4Address('8.8.8.8'))
+        with self.assertRaises(TableNotPresentError):
+            scraper.get_network_if_present(ipaddress.IPv4Address('8.8.8.8'), 137)
+        print(f"------- END TEST 2 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import ipaddress
+import tempfile
+import threading
+import time
+import unittest
+import requests
+from pathlib import Path
+from entities.ROVPageCache import ROVPageCache
+from entities.resolvers.ROVPageScraper import ROVPageScraper
+from testing.local_http_server import LocalSiteHandler, LocalHttpServer
+
+
+class ROVPageHandler(LocalSiteHandler):
+    """
+    Local copy of the ROV pages: every page takes some time to be served and contains a prefix derived from the AS
+    number. AS0 doesn't exist. The ETag validator is honoured.
+
+    """
+    delay = 0.3
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    requests_served = list()
+
+    def do_GET(self):
+        ROVPageHandler.requests_served.append((self.path, self.headers.get('If-None-Match')))
+        with ROVPageHandler.lock:
+            ROVPageHandler.in_flight = ROVPageHandler.in_flight + 1
+            ROVPageHandler.max_in_flight = max(ROVPageHandler.max_in_flight, ROVPageHandler.in_flight)
+        time.sleep(ROVPageHandler.delay)
+        with ROVPageHandler.lock:
+            ROVPageHandler.in_flight = ROVPageHandler.in_flight - 1
+        as_number = int(self.path.split('AS')[-1])
+        if as_number == 0:
+            self.send_empty_response(404)
+            return
+        etag = f'"AS{as_number}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_empty_response(304)
+            return
+        body = f'var roatable = new DataTable([["<a href=\\"roa?p=10.{as_number}.0.0/16\\">"] ]); roatable.draw();'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ROVPageScraperTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.local_server = LocalHttpServer(ROVPageHandler)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.local_server.close()
+
+    def setUp(self) -> None:
+        ROVPageHandler.max_in_flight = 0
+        ROVPageHandler.requests_served.clear()
+
+    def test_01_concurrent_prefetch(self):
+        print(f"\n------- START TEST 1 -------")
+        # PARAMETER
+        as_numbers = list(range(1, 13))
+        max_requests_per_host = 4
+        scraper = ROVPageScraper(max_workers=16, max_requests_per_host=max_requests_per_host, politeness_delay=0.0, timeout=5)
+        scraper.baseUrl = f"{self.local_server.base_url}/roa/AS"
+        start = time.monotonic()
+        scraper.prefetch_as_pages(as_numbers)
+        for as_number in as_numbers:
+            scraper.load_as_page(as_number)
+            row = scraper.get_network_if_present(ipaddress.IPv4Address(f"10.{as_number}.1.1"), as_number)
+            self.assertEqual(ipaddress.IPv4Network(f"10.{as_number}.0.0/16"), row.prefix)
+        elapsed = time.monotonic() - start
+        scraper.close()
+        print(f"{len(as_numbers)} pages in {elapsed:.2f}s, max in flight: {ROVPageHandler.max_in_flight}")
+        self.assertLessEqual(ROVPageHandler.max_in_flight, max_requests_per_host)
+        self.assertLess(elapsed, len(as_numbers) * ROVPageHandler.delay / 2)
+        print(f"------- END TEST 1 -------")
+
+    def test_02_fetching_errors(self):
+        print(f"\n------- START TEST 2 -------")
+        scraper = ROVPageScraper(timeout=5)
+        scraper.baseUrl = f"{self.local_server.base_url}/roa/AS"
+        scraper.prefetch_as_pages([0, 1])
+        with self.assertRaises(requests.exceptions.RequestException):
+            scraper.load_as_page(0)
+        scraper.load_as_page(1)
+        self.assertEqual(1, len(scraper.prefixes_table))
+        scraper.timeout = 0.05
+        with self.assertRaises(requests.exceptions.Timeout):
+            scraper.load_as_page(2)
+        scraper.close()
+        print(f"------- END TEST 2 -------")
+
+    def test_03_politeness_delay(self):
+        print(f"\n------- START TEST 3 -------")
+        scraper = ROVPageScraper(max_requests_per_host=8, politeness_delay=0.1, timeout=5)
+        scraper.baseUrl = f"{self.local_server.base_url}/roa/AS"
+        start = time.monotonic()
+        scraper.prefetch_as_pages(range(1, 6))
+        for as_number in range(1, 6):
+            scraper.load_as_page(as_number)
+        elapsed = time.monotonic() - start
+        scraper.close()
+        print(f"5 pages in {elapsed:.2f}s")
+        self.assertGreaterEqual(elapsed, 4 * 0.1 + ROVPageHandler.delay)
+        print(f"------- END TEST 3 -------")
+
+    def test_04_cache(self):
+        print(f"\n------- START TEST 4 -------")
+        # PARAMETER
+        as_numbers = [1, 2, 3]
+        with tempfile.TemporaryDirectory() as temp_directory:
+            cache = ROVPageCache(project_root_directory=Path(temp_directory), ttl_seconds=3600)
+            scraper = ROVPageScraper(politeness_delay=0.0, timeout=5, cache=cache)
+            scraper.baseUrl = f"{self.local_server.base_url}/roa/AS"
+            scraper.prefetch_as_pages(as_numbers)
+            for as_number in as_numbers:
+                scraper.load_as_page(as_number)
+            scraper.close()
+            self.assertEqual(3, len(ROVPageHandler.requests_served))
+            # fresh: no request at all, also from another process (new cache object)
+            cache = ROVPageCache(project_root_directory=Path(temp_directory), ttl_seconds=3600)
+            scraper = ROVPageScraper(politeness_delay=0.0, timeout=5, cache=cache)
+            scraper.baseUrl = f"{self.local_server.base_url}/roa/AS"
+            scraper.prefetch_as_pages(as_numbers + [4])
+            for as_number in as_numbers + [4]:
+                scraper.load_as_page(as_number)
+                row = scraper.get_network_if_present(ipaddress.IPv4Address(f"10.{as_number}.1.1"), as_number)
+                self.assertEqual(ipaddress.IPv4Network(f"10.{as_number}.0.0/16"), row.prefix)
+            scraper.close()
+            self.assertEqual(4, len(ROVPageHandler.requests_served))
+            self.assertEqual('/roa/AS4', ROVPageHandler.requests_served[-1][0])
+            # stale: conditional revalidation
+            cache.ttl_seconds = 0
+            scraper = ROVPageScraper(politeness_delay=0.0, timeout=5, cache=cache)
+            scraper.baseUrl = f"{self.local_server.base_url}/roa/AS"
+            scraper.load_as_page(2)
+            scraper.close()
+            self.assertEqual(('/roa/AS2', '"AS2"'), ROVPageHandler.requests_served[-1])
+            self.assertEqual(1, len(scraper.prefixes_table))
+            print(f"Requests served: {ROVPageHandler.requests_served}")
+        print(f"------- END TEST 4 -------")
+
+    def test_05_streaming_parser(self):
+        print(f"\n------- START TEST 5 -------")
+        # PARAMETER
+        prefixes = ['1.0.0.0/24', '10.200.0.0/16', '193.205.128.0/19', '8.8.8.0/24']
+        rows = ',\n'.join(map(lambda prefix: f'["<a href=\\"/roa/AS1?c=IT&p={prefix}\\">{prefix}</a>", 256, "VLD"]', prefixes))
+        page = f"<html><script>var other = 'p=9.9.9.0/24';\nvar roatable = google.visualization.arrayToDataTable([\n['Prefix', 'Span', 'ROV'],\n{rows}\n ]);\ntable.draw(roatable, {{}}); var x = 'p=7.7.7.0/24';</script></html>"
+        self.assertEqual(prefixes, list(ROVPageScraper.iter_prefixes([page])))
+        for chunk_size in range(1, 60):
+            chunks = [page[i:i + chunk_size] for i in range(0, len(page), chunk_size)]
+            self.assertEqual(prefixes, list(ROVPageScraper.iter_prefixes(chunks)))
+        self.assertEqual([], list(ROVPageScraper.iter_prefixes(['<html>no table</html>'])))
+        print(f"------- END TEST 5 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
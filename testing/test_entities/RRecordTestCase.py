@@ -2,6 +2,7 @@ import unittest
 from entities.DomainName import DomainName
 from entities.RRecord import RRecord
 from entities.enums.TypesRR import TypesRR
+from entities.paths.APath import APath
 
 
 class RRecordTestCase(unittest.TestCase):
@@ -39,6 +40,26 @@ class RRecordTestCase(unittest.TestCase):
         self.assertEqual(self.rr.__hash__() == self.for_comparison.__hash__(), self.rr == self.for_comparison)
         print(f"------- END TEST 2 -------")
 
+    def test_03_immutability(self):
+        print(f"\n------- START TEST 3 -------")
+        # PARAMETER
+        rr = RRecord('a.units.it', TypesRR.A, ['10.0.0.1'])
+        path = APath([RRecord('www.units.it', TypesRR.CNAME, ['a.units.it']), rr])
+        rr_hash = hash(rr)
+        path_hash = hash(path)
+        with self.assertRaises(AttributeError):
+            rr.values = tuple()
+        with self.assertRaises(AttributeError):
+            rr.name = DomainName('b.units.it')
+        with self.assertRaises(AttributeError):
+            del rr.type
+        with self.assertRaises(AttributeError):
+            path._APath__path = (rr,)
+        self.assertEqual(rr_hash, hash(rr))
+        self.assertEqual(path_hash, hash(APath([RRecord('www.units.it', TypesRR.CNAME, ['a.units.it']), rr])))
+        self.assertEqual(1, len(rr.values))
+        print(f"------- END TEST 3 -------")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+from seleniumwire.request import Request, Response
+from entities.FirefoxHeadlessWebDriver import FirefoxHeadlessWebDriver
+from entities.ResourceBlockingProfile import ResourceBlockingProfile
+
+
+class ResourceBlockingProfileTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # PARAMETER
+        self.profile = ResourceBlockingProfile(blocked_hosts=('tracker.example',))
+
+    def test_01_blocked_by_destination(self):
+        print(f"\n------- START TEST 1 -------")
+        requests = [
+            ('https://www.example.com/logo', 'image', 'image'),
+            ('https://fonts.example.com/font', 'font', 'font'),
+            ('https://www.example.com/intro', 'video', 'media'),
+            ('https://www.example.com/theme', 'style', 'stylesheet'),
+            ('https://www.example.com/', 'document', None),
+            ('https://www.example.com/frame.html', 'iframe', None),
+            ('https://www.example.com/app.png', 'script', None),
+            ('https://www.example.com/worker.js', 'worker', None),
+        ]
+        for url, destination, expected in requests:
+            blocked_type = self.profile.get_blocked_type(url, {'Sec-Fetch-Dest': destination})
+            print(f"{destination} {url}: {blocked_type}")
+            self.assertEqual(expected, blocked_type)
+        print(f"------- END TEST 1 -------")
+
+    def test_02_blocked_by_extension(self):
+        print(f"\n------- START TEST 2 -------")
+        requests = [
+            ('https://www.example.com/img/photo.JPG?w=200', 'image'),
+            ('https://www.example.com/fonts/a.woff2', 'font'),
+            ('https://www.example.com/theme.css', 'stylesheet'),
+            ('https://www.example.com/app.js', None),
+            ('https://www.example.com/api/data', None),
+        ]
+        for url, expected in requests:
+            self.assertEqual(expected, self.profile.get_blocked_type(url, {'Sec-Fetch-Dest': 'empty'}))
+            self.assertEqual(expected, self.profile.get_blocked_type(url, dict()))
+        print(f"------- END TEST 2 -------")
+
+    def test_03_blocked_hosts(self):
+        print(f"\n------- START TEST 3 -------")
+        self.assertEqual('host', self.profile.get_blocked_type('https://tracker.example/collect', {'Sec-Fetch-Dest': 'empty'}))
+        self.assertEqual('host', self.profile.get_blocked_type('https://px.Tracker.example/p', dict()))
+        self.assertIsNone(self.profile.get_blocked_type('https://nottracker.example/collect', dict()))
+        # scripts are never blocked
+        self.assertIsNone(self.profile.get_blocked_type('https://tracker.example/tag.js', {'Sec-Fetch-Dest': 'script'}))
+        print(f"------- END TEST 3 -------")
+
+    def test_04_configurable_types(self):
+        print(f"\n------- START TEST 4 -------")
+        profile = ResourceBlockingProfile(blocked_types=('image',))
+        print(f"{profile}")
+        self.assertEqual('image', profile.get_blocked_type('https://www.example.com/a.png', dict()))
+        self.assertIsNone(profile.get_blocked_type('https://www.example.com/a.css', dict()))
+        self.assertRaises(ValueError, ResourceBlockingProfile, ('image', 'script'))
+        print(f"------- END TEST 4 -------")
+
+    def test_05_page_load_statistics(self):
+        print(f"\n------- START TEST 5 -------")
+        browser = FirefoxHeadlessWebDriver.__new__(FirefoxHeadlessWebDriver)
+        browser.blocking_profile = self.profile
+        recorded = list()
+        for url, destination in (('https://www.example.com/', 'document'), ('https://www.example.com/app.js', 'script'), ('https://www.example.com/logo.png', 'image'), ('https://www.example.com/a.woff2', 'font'), ('https://tracker.example/collect', 'empty')):
+            request = Request(method='GET', url=url, headers=[('Sec-Fetch-Dest', destination)])
+            browser._FirefoxHeadlessWebDriver__intercept_request(request)
+            if request.response is None:
+                request.response = Response(status_code=200, reason='OK', headers=[('Content-Length', '1024')])
+            recorded.append(request)
+        # a 403 sent by a server is a completed request
+        request = Request(method='GET', url='https://www.example.com/private.js', headers=[('Sec-Fetch-Dest', 'script')])
+        request.response = Response(status_code=403, reason='Forbidden', headers=(), body=b'denied')
+        recorded.append(request)
+        browser.driver = mock.Mock()
+        browser.driver.get.side_effect = lambda url: setattr(browser.driver, 'requests', recorded)
+        statistics = browser.load_page('https://www.example.com/')
+        print(f"{statistics}")
+        self.assertEqual(3, statistics.requests)
+        self.assertEqual(2 * 1024 + len(b'denied'), statistics.received_bytes)
+        self.assertDictEqual({'image': 1, 'font': 1, 'host': 1}, statistics.blocked_requests)
+        self.assertIn('bytes saved not measured', str(statistics))
+        print(f"------- END TEST 5 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import unittest
+from unittest import mock
+from entities.FirefoxHeadlessWebDriver import FirefoxHeadlessWebDriver
+from entities.MainFrameScript import MainFrameScript
+from entities.PageLoadStatistics import PageLoadStatistics
+from entities.SchemeUrl import SchemeUrl
+from entities.resolvers.ScriptDependenciesResolver import ScriptDependenciesResolver
+
+
+class ScriptDependenciesResolverTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # PARAMETER
+        self.url = SchemeUrl('https://www.example.com/')
+        self.scripts = [['https://cdn.example.com/lib.js', 'sha384-abc'], ['', ''], ['https://www.example.com/app.js', '']]
+        self.scripts.extend([[f"https://www.example.com/chunk{i}.js", ''] for i in range(80)])
+
+    @staticmethod
+    def new_headless_browser(scripts: list, loading_commands: int) -> FirefoxHeadlessWebDriver:
+        """
+        Headless browser mock: the document is loading for the first commands, then the driver returns the scripts.
+        """
+        headless_browser = mock.Mock(spec=FirefoxHeadlessWebDriver)
+        headless_browser.driver = mock.Mock()
+        headless_browser.driver.execute_script.side_effect = [None] * loading_commands + [json.dumps(scripts)]
+        headless_browser.load_page.side_effect = lambda url_string: PageLoadStatistics(url_string, 0.0, 1, 0, dict())
+        return headless_browser
+
+    @staticmethod
+    def count_commands(headless_browser: FirefoxHeadlessWebDriver) -> int:
+        return headless_browser.load_page.call_count + headless_browser.driver.execute_script.call_count
+
+    def test_01_single_round_trip(self):
+        print(f"\n------- START TEST 1 -------")
+        headless_browser = self.new_headless_browser(self.scripts, 0)
+        scripts = ScriptDependenciesResolver.search_in_browser(headless_browser, self.url)
+        print(f"{len(scripts)} scripts with {self.count_commands(headless_browser)} commands")
+        headless_browser.load_page.assert_called_once_with(self.url.string)
+        self.assertEqual(2, self.count_commands(headless_browser))
+        self.assertEqual(len(self.scripts) - 1, len(scripts))
+        integrities = {script.src: script.integrity for script in scripts}
+        self.assertEqual('sha384-abc', integrities['https://cdn.example.com/lib.js'])
+        self.assertIsNone(integrities['https://www.example.com/app.js'])
+        self.assertNotIn(MainFrameScript('', None), scripts)
+        print(f"------- END TEST 1 -------")
+
+    def test_02_readiness_check(self):
+        print(f"\n------- START TEST 2 -------")
+        headless_browser = self.new_headless_browser(list(), 2)
+        scripts = ScriptDependenciesResolver.search_in_browser(headless_browser, self.url)
+        print(f"{len(scripts)} scripts with {self.count_commands(headless_browser)} commands")
+        # a page without scripts doesn't wait for the timeout
+        self.assertSetEqual(set(), scripts)
+        self.assertEqual(4, self.count_commands(headless_browser))
+        print(f"------- END TEST 2 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
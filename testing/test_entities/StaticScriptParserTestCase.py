@@ -0,0 +1,133 @@
+import unittest
+from unittest import mock
+from entities.FirefoxHeadlessWebDriver import FirefoxHeadlessWebDriver
+from entities.MainFrameScript import MainFrameScript
+from entities.SchemeUrl import SchemeUrl
+from entities.StaticScriptParser import StaticScriptParser
+from entities.resolvers.ScriptDependenciesResolver import ScriptDependenciesResolver
+from utils import requests_utils
+from testing.local_http_server import LocalSiteHandler, LocalHttpServer
+
+
+STATIC_PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+<base href="/assets/">
+<script src="https://cdn.example.com/lib.js" integrity="sha384-abc" crossorigin="anonymous"></script>
+<script src="app.js" integrity=""></script>
+<script>window.dataLayer = window.dataLayer || [];</script>
+<script type="application/ld+json">{"@type": "Organization"}</script>
+</head>
+<body>
+<noscript><script src="/noscript.js"></script></noscript>
+<template><script src="/template.js"></script></template>
+<iframe srcdoc="<script src='/iframe.js'></script>"></iframe>
+<script src="//static.example.com/footer.js"/>
+</body>
+</html>
+'''
+
+INJECTED_PAGE = '''<html><head>
+<script>(function(d, s) { var j = d.createElement(s); j.src = '/loader.js'; d.head.appendChild(j); })(document, 'script');</script>
+<script src="/main.js"></script>
+</head></html>
+'''
+
+
+class StaticPagesHandler(LocalSiteHandler):
+    """
+    Local site with a static page, a script-injected page, a UTF-8 page without charset and a non HTML resource.
+
+    """
+    def do_GET(self):
+        if self.path == '/static':
+            body, content_type = STATIC_PAGE.encode('utf-8'), 'text/html; charset=utf-8'
+        elif self.path == '/injected':
+            body, content_type = INJECTED_PAGE.encode('utf-8'), 'text/html'
+        elif self.path == '/unicode':
+            body, content_type = '<script src="/js/café-ü.js"></script>'.encode('utf-8'), 'text/html'
+        else:
+            body, content_type = b'%PDF-1.4', 'application/pdf'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StaticScriptParserTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.local_server = LocalHttpServer(StaticPagesHandler)
+        cls.base_url = cls.local_server.base_url
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.local_server.close()
+
+    def test_01_main_frame_scripts(self):
+        print(f"\n------- START TEST 1 -------")
+        # PARAMETER
+        url = 'https://www.example.com/index.html'
+        parser = StaticScriptParser(url)
+        # fed in small chunks, as received
+        for i in range(0, len(STATIC_PAGE), 7):
+            parser.feed(STATIC_PAGE[i:i+7])
+        parser.close()
+        for script in parser.scripts:
+            print(f"script: integrity={script.integrity}, src={script.src}")
+        expected = {
+            MainFrameScript('https://cdn.example.com/lib.js', 'sha384-abc'),
+            MainFrameScript('https://www.example.com/assets/app.js', None),
+            MainFrameScript('https://static.example.com/footer.js', None)
+        }
+        self.assertSetEqual(expected, parser.scripts)
+        integrities = {script.src: script.integrity for script in parser.scripts}
+        self.assertEqual('sha384-abc', integrities['https://cdn.example.com/lib.js'])
+        self.assertIsNone(integrities['https://www.example.com/assets/app.js'])
+        self.assertFalse(parser.is_script_injected)
+        print(f"------- END TEST 1 -------")
+
+    def test_02_script_injection_detection(self):
+        print(f"\n------- START TEST 2 -------")
+        parser = StaticScriptParser('https://www.example.com/')
+        parser.feed(INJECTED_PAGE)
+        parser.close()
+        print(f"Script-injected: {parser.is_script_injected}")
+        self.assertTrue(parser.is_script_injected)
+        parser = StaticScriptParser('https://www.example.com/')
+        parser.feed('<script data-main="js/app" src="/require.js"></script>')
+        parser.close()
+        self.assertTrue(parser.is_script_injected)
+        print(f"------- END TEST 2 -------")
+
+    def test_03_browser_fallback(self):
+        print(f"\n------- START TEST 3 -------")
+        headless_browser = mock.Mock(spec=FirefoxHeadlessWebDriver)
+        session = requests_utils.create_pooled_session()
+        resolver = ScriptDependenciesResolver(headless_browser=headless_browser, session=session, static_timeout=5)
+        urls = list(map(lambda path: SchemeUrl(f"{self.base_url}{path}"), ('/static', '/injected', '/document.pdf')))
+        with mock.patch.object(ScriptDependenciesResolver, 'search_in_browser', side_effect=lambda browser, url: {MainFrameScript(f"{url.string}/dynamic.js", None)}) as search_in_browser:
+            results = {url.string: (scripts, error) for url, scripts, error in resolver.search_multiple_script_application_dependencies(urls)}
+        session.close()
+        loaded_urls = list(map(lambda call: call.args[1].string, search_in_browser.call_args_list))
+        print(f"Pages loaded by the browser: {loaded_urls}")
+        self.assertListEqual([f"{self.base_url}/injected", f"{self.base_url}/document.pdf"], loaded_urls)
+        self.assertTrue(all(map(lambda call: call.args[0] is headless_browser, search_in_browser.call_args_list)))
+        static_scripts, error = results[f"{self.base_url}/static"]
+        self.assertIsNone(error)
+        self.assertIn(MainFrameScript(f"{self.base_url}/assets/app.js", None), static_scripts)
+        self.assertSetEqual({MainFrameScript(f"{self.base_url}/injected/dynamic.js", None)}, results[f"{self.base_url}/injected"][0])
+        print(f"------- END TEST 3 -------")
+
+
+    def test_04_page_without_charset(self):
+        print(f"\n------- START TEST 4 -------")
+        with requests_utils.create_pooled_session() as session:
+            parser = requests_utils.parse_static_html(f"{self.base_url}/unicode", session, timeout=5)
+        print(f"Scripts: {list(map(lambda script: script.src, parser.scripts))}")
+        self.assertSetEqual({MainFrameScript(f"{self.base_url}/js/café-ü.js", None)}, parser.scripts)
+        print(f"------- END TEST 4 -------")
+
+if __name__ == '__main__':
+    unittest.main()
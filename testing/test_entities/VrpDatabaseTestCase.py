@@ -0,0 +1,102 @@
+import ipaddress
+import json
+import os
+import random
+import tempfile
+import unittest
+from entities.enums.ROVStates import ROVStates
+from entities.resolvers.VrpDatabase import VrpDatabase
+
+
+class VrpDatabaseTestCase(unittest.TestCase):
+    temp_directory = None
+    database = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # PARAMETER
+        roas = [
+            {'asn': 'AS13335', 'prefix': '1.0.0.0/24', 'maxLength': 24, 'ta': 'apnic'},
+            {'asn': 'AS15169', 'prefix': '8.8.0.0/16', 'maxLength': 16, 'ta': 'arin'},
+            {'asn': 'AS15169', 'prefix': '8.8.0.0/16', 'maxLength': 24, 'ta': 'arin'},
+            {'asn': 'AS0', 'prefix': '10.0.0.0/8', 'maxLength': 32, 'ta': 'iana'},
+            {'asn': 'AS137', 'prefix': '2001:760::/32', 'maxLength': 48, 'ta': 'ripe'},
+            {'asn': 'AS137', 'prefix': 'not a prefix', 'maxLength': 24, 'ta': 'ripe'},
+        ]
+        cls.temp_directory = tempfile.TemporaryDirectory()
+        filepath = f"{cls.temp_directory.name}{os.sep}vrps.json"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'metadata': {}, 'roas': roas}, f)
+        cls.database = VrpDatabase(filepath)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.temp_directory.cleanup()
+
+    def test_01_rfc_6811_states(self):
+        print(f"\n------- START TEST 1 -------")
+        # PARAMETER
+        routes = [
+            ('1.0.0.0/24', 13335, ROVStates.VLD),
+            ('1.0.0.0/24', 64500, ROVStates.INV),      # wrong origin
+            ('1.0.0.0/25', 13335, ROVStates.INV),      # longer than max length
+            ('8.8.8.0/24', 15169, ROVStates.VLD),      # max length of the second VRP
+            ('8.8.8.0/25', 15169, ROVStates.INV),
+            ('10.1.0.0/16', 0, ROVStates.INV),         # AS0 never matches
+            ('9.9.9.0/24', 19281, ROVStates.UNK),
+            ('0.0.0.0/0', 15169, ROVStates.UNK),       # not covered by longer prefixes
+        ]
+        self.assertEqual(4, len(self.database))
+        results = self.database.validate(list(map(lambda route: ipaddress.IPv4Network(route[0]), routes)), list(map(lambda route: route[1], routes)))
+        for route, (state, covering_vrps) in zip(routes, results):
+            print(f"{route[0]} AS{route[1]}: {state.to_string()} ({covering_vrps} covering VRPs)")
+            self.assertEqual(route[2], state)
+        self.assertEqual(2, results[3][1])
+        self.assertEqual([], self.database.validate([], []))
+        print(f"------- END TEST 1 -------")
+
+    def test_02_csv_export(self):
+        print(f"\n------- START TEST 2 -------")
+        filepath = f"{self.temp_directory.name}{os.sep}vrps.csv"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('ASN,IP Prefix,Max Length,Trust Anchor\n')
+            f.write('AS13335,1.0.0.0/24,24,apnic\n')
+            f.write('AS137,2001:760::/32,48,ripe\n')
+        database = VrpDatabase(filepath)
+        self.assertEqual(1, len(database))
+        self.assertEqual(ROVStates.VLD, database.validate_route(ipaddress.IPv4Network('1.0.0.0/24'), 13335))
+        print(f"------- END TEST 2 -------")
+
+    def test_03_vectorized_matches_definition(self):
+        print(f"\n------- START TEST 3 -------")
+        rnd = random.Random(6811)
+        vrps = list()
+        for i in range(300):
+            length = rnd.randint(8, 24)
+            network = ipaddress.IPv4Network((rnd.randint(0, 255) << 24 | rnd.randint(0, 3) << 16, length), strict=False)
+            vrps.append((network, rnd.randint(length, 28), rnd.choice([0, 1, 2, 3])))
+        filepath = f"{self.temp_directory.name}{os.sep}random_vrps.json"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'roas': list(map(lambda vrp: {'prefix': vrp[0].compressed, 'maxLength': vrp[1], 'asn': f"AS{vrp[2]}"}, vrps))}, f)
+        database = VrpDatabase(filepath)
+        routes = list()
+        for i in range(2000):
+            length = rnd.randint(8, 28)
+            routes.append((ipaddress.IPv4Network((rnd.randint(0, 255) << 24 | rnd.randint(0, 3) << 16 | rnd.randint(0, 65535), length), strict=False), rnd.choice([0, 1, 2, 3])))
+        results = database.validate(list(map(lambda route: route[0], routes)), list(map(lambda route: route[1], routes)))
+        for (network, origin), (state, covering_vrps) in zip(routes, results):
+            covering = list(filter(lambda vrp: network.subnet_of(vrp[0]), vrps))
+            if len(covering) == 0:
+                expected = ROVStates.UNK
+            elif any(map(lambda vrp: vrp[2] == origin and origin != 0 and network.prefixlen <= vrp[1], covering)):
+                expected = ROVStates.VLD
+            else:
+                expected = ROVStates.INV
+            self.assertEqual(expected, state)
+            self.assertEqual(len(covering), covering_vrps)
+        print(f"States: { {state.to_string(): list(map(lambda result: result[0], results)).count(state) for state in ROVStates} }")
+        print(f"------- END TEST 3 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
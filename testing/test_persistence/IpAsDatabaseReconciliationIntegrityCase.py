@@ -0,0 +1,138 @@
+import ipaddress
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from entities.resolvers.IpAsDatabase import IpAsDatabase
+from entities.resolvers.IpAsDatabaseDiff import IpAsDatabaseDiff
+from persistence import helper_application_results, helper_autonomous_system, helper_ip_address, helper_ip_network, \
+    helper_ip_range_tsv, helper_ip_range_rov, helper_ip_address_depends, helper_network_numbers
+from persistence.BaseModel import db, handle_tables_creation, IpAddressDependsAssociation, AutonomousSystemEntity, \
+    NetworkNumbersAssociation
+from static_variables import INPUT_FOLDER_NAME
+
+
+class IpAsDatabaseReconciliationIntegrityCase(unittest.TestCase):
+    """
+    Test class that stores the IP-AS results computed with a snapshot of the .tsv database in a temporary database, then
+    reconciles them with the differences from a newer snapshot and checks the stored rows.
+
+    """
+    temp_directory = None
+    results_database_file = None
+    database = None
+    previous_database = None
+    moved = None
+
+    @staticmethod
+    def write_tsv(project_root_directory: Path, rows: list) -> None:
+        filepath = f"{str(project_root_directory)}{os.sep}{INPUT_FOLDER_NAME}{os.sep}ip2asn-v4.tsv"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(rows) + '\n')
+        # the .tsv database has to look newer than the compiled one
+        os.utime(filepath, (os.path.getmtime(filepath) + 10, os.path.getmtime(filepath) + 10))
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # PARAMETERS
+        old_rows = [
+            '1.0.0.0\t1.0.0.255\t13335\tUS\tCLOUDFLARENET',
+            '8.8.8.0\t8.8.8.255\t15169\tUS\tGOOGLE',
+            '9.9.9.0\t9.9.9.255\t19281\tUS\tQUAD9-AS-1',
+            '193.205.128.0\t193.205.159.255\t137\tIT\tASGARR Consortium GARR',
+        ]
+        new_rows = [
+            '1.0.0.0\t1.0.0.255\t13335\tUS\tCLOUDFLARENET',
+            '8.8.8.0\t8.8.8.127\t15169\tUS\tGOOGLE',
+            '8.8.8.128\t8.8.8.255\t15169\tUS\tGOOGLE',
+            '9.9.9.0\t9.9.9.255\t19281\tCH\tQUAD9-AS-1',
+            '193.205.128.0\t193.205.159.255\t1299\tSE\tTWELVE99',
+            '200.0.0.0\t200.0.0.255\t64500\tZZ\tNEW',
+        ]
+        ips = list(map(ipaddress.IPv4Address, ['1.0.0.1', '8.8.8.8', '9.9.9.9', '193.205.130.1', '200.0.0.1', '10.0.0.1']))
+        # ELABORATION
+        cls.temp_directory = tempfile.TemporaryDirectory()
+        project_root_directory = Path(cls.temp_directory.name)
+        (project_root_directory / INPUT_FOLDER_NAME).mkdir()
+        cls.write_tsv(project_root_directory, old_rows)
+        IpAsDatabase(project_root_directory=project_root_directory)
+        cls.write_tsv(project_root_directory, new_rows)
+        cls.database = IpAsDatabase(project_root_directory=project_root_directory)
+        cls.previous_database = cls.database.get_previous()
+        # the results are stored in a temporary database
+        cls.results_database_file = db.database
+        db.close()
+        db.init(str(project_root_directory / 'results.sqlite'))
+        db.connect()
+        handle_tables_creation()
+        with db.atomic():
+            for ip, entry in zip(ips, cls.previous_database.resolve_ranges(ips)):
+                iae = helper_ip_address.insert(ip)
+                ine = helper_ip_network.insert_from_address_entity(iae)
+                if entry is None:
+                    helper_ip_address_depends.insert(iae, ine, None, None)
+                else:
+                    ip_range_tsv, networks = entry.get_network_of_ip(ip)
+                    ase = helper_autonomous_system.insert(entry)
+                    irte = helper_ip_range_tsv.insert(ip_range_tsv.compressed)
+                    helper_network_numbers.insert(irte, ase)
+                    irre = helper_ip_range_rov.insert(ip_range_tsv)
+                    helper_ip_address_depends.insert(iae, ine, irte, irre)
+        cls.moved = helper_application_results.update_ip_as_database_results(IpAsDatabaseDiff(cls.previous_database, cls.database))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        db.close()
+        db.init(cls.results_database_file)
+        db.connect()
+        cls.previous_database.close()
+        cls.database.close()
+        cls.temp_directory.cleanup()
+
+    @staticmethod
+    def get_depends(ip: str) -> IpAddressDependsAssociation:
+        return IpAddressDependsAssociation.get_by_id(ipaddress.IPv4Address(ip).exploded)
+
+    def test_01_moved_ip_addresses(self):
+        print(f"\n------- START TEST 1 -------")
+        for ip, (old_as_number, new_as_number) in self.moved.items():
+            print(f"{ip}: AS{old_as_number} -> AS{new_as_number}")
+        expected = {
+            ipaddress.IPv4Address('193.205.130.1'): (137, 1299),
+            ipaddress.IPv4Address('200.0.0.1'): (None, 64500),
+        }
+        self.assertDictEqual(expected, self.moved)
+        print(f"------- END TEST 1 -------")
+
+    def test_02_associations(self):
+        print(f"\n------- START TEST 2 -------")
+        for iada in IpAddressDependsAssociation.select():
+            print(f"{iada.ip_address_id}: ip_range_tsv={iada.ip_range_tsv_id}, ip_range_rov={iada.ip_range_rov_id}")
+        # not affected
+        self.assertEqual(('1.0.0.0/24', '1.0.0.0/24'), (self.get_depends('1.0.0.1').ip_range_tsv_id, self.get_depends('1.0.0.1').ip_range_rov_id))
+        self.assertEqual((None, None), (self.get_depends('10.0.0.1').ip_range_tsv_id, self.get_depends('10.0.0.1').ip_range_rov_id))
+        # split range, same AS: the ROV range is kept
+        self.assertEqual(('8.8.8.0/25', '8.8.8.0/24'), (self.get_depends('8.8.8.8').ip_range_tsv_id, self.get_depends('8.8.8.8').ip_range_rov_id))
+        # changed country code, same AS
+        self.assertEqual(('9.9.9.0/24', '9.9.9.0/24'), (self.get_depends('9.9.9.9').ip_range_tsv_id, self.get_depends('9.9.9.9').ip_range_rov_id))
+        # moved: the ROV range of the old AS is removed
+        self.assertEqual(('193.205.128.0/19', None), (self.get_depends('193.205.130.1').ip_range_tsv_id, self.get_depends('193.205.130.1').ip_range_rov_id))
+        self.assertEqual(('200.0.0.0/24', None), (self.get_depends('200.0.0.1').ip_range_tsv_id, self.get_depends('200.0.0.1').ip_range_rov_id))
+        print(f"------- END TEST 2 -------")
+
+    def test_03_network_numbers_and_autonomous_systems(self):
+        print(f"\n------- START TEST 3 -------")
+        network_numbers = {nna.ip_range_tsv_id: nna.autonomous_system_id for nna in NetworkNumbersAssociation.select()}
+        print(f"Network numbers: {network_numbers}")
+        # the removed range is not referenced anymore
+        expected = {'1.0.0.0/24': 13335, '8.8.8.0/25': 15169, '9.9.9.0/24': 19281, '193.205.128.0/19': 1299, '200.0.0.0/24': 64500}
+        self.assertDictEqual(expected, network_numbers)
+        self.assertEqual(expected, helper_network_numbers.get_as_numbers_of(set(expected.keys()) | {'8.8.8.0/24'}))
+        self.assertEqual('CH', AutonomousSystemEntity.get_by_id(19281).country_code)
+        self.assertEqual(('TWELVE99', 'SE'), (AutonomousSystemEntity.get_by_id(1299).description, AutonomousSystemEntity.get_by_id(1299).country_code))
+        self.assertEqual('ZZ', AutonomousSystemEntity.get_by_id(64500).country_code)
+        print(f"------- END TEST 3 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import ipaddress
+import time
+import unittest
+import requests
+from utils import requests_utils
+from testing.local_http_server import LocalSiteHandler, LocalHttpServer
+
+
+class RedirectingSiteHandler(LocalSiteHandler):
+    """
+    Local site with a redirection path: /start -> /middle (relative Location, sets a cookie) -> /landing
+    (absolute Location, requires the cookie). The landing page has the HSTS header and a body that is sent very slowly.
+    /loop redirects to itself.
+
+    """
+    body_delay = 2.0
+    cookies_received = list()
+    requests_served = list()
+
+    def do_GET(self):
+        RedirectingSiteHandler.requests_served.append((self.path, self.client_address[1], self.headers.get('Cookie'), self.headers.get('Host')))
+        if self.path == '/start':
+            self.send_empty_response(301, [('Location', 'middle')])
+        elif self.path == '/middle':
+            self.send_empty_response(302, [('Location', f"http://127.0.0.1:{self.server.server_port}/landing"), ('Set-Cookie', 'visited=1; Path=/')])
+        elif self.path == '/landing':
+            RedirectingSiteHandler.cookies_received.append(self.headers.get('Cookie'))
+            body = b'<html>' + b' ' * (1 << 20) + b'</html>'
+            self.send_response(200)
+            self.send_header('Strict-Transport-Security', 'max-age=31536000')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.flush()
+            time.sleep(RedirectingSiteHandler.body_delay)
+            try:
+                self.wfile.write(body)
+            except OSError:
+                self.close_connection = True
+        elif self.path == '/loop':
+            self.send_empty_response(307, [('Location', '/loop')])
+        else:
+            self.send_empty_response(404)
+
+
+class RedirectionProbeTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.local_server = LocalHttpServer(RedirectingSiteHandler)
+        cls.base_url = cls.local_server.base_url
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.local_server.close()
+
+    def test_01_every_hop_is_recorded(self):
+        print(f"\n------- START TEST 1 -------")
+        start = time.monotonic()
+        hops = requests_utils.follow_redirections(f"{self.base_url}/start", timeout=5)
+        elapsed = time.monotonic() - start
+        for i, hop in enumerate(hops):
+            print(f"hop[{i+1}/{len(hops)}]: {hop}")
+        self.assertListEqual([f"{self.base_url}/start", f"{self.base_url}/middle", f"{self.base_url}/landing"], list(map(lambda hop: hop.url, hops)))
+        self.assertListEqual([301, 302, 200], list(map(lambda hop: hop.status_code, hops)))
+        self.assertListEqual([ipaddress.IPv4Address('127.0.0.1')] * 3, list(map(lambda hop: hop.ip, hops)))
+        self.assertListEqual([None, None, 'max-age=31536000'], list(map(lambda hop: hop.hsts, hops)))
+        self.assertFalse(hops[-1].is_redirection())
+        self.assertEqual('visited=1', RedirectingSiteHandler.cookies_received[-1])
+        # the landing body is never waited for
+        print(f"Elapsed: {elapsed:.2f}s (body is sent after {RedirectingSiteHandler.body_delay}s)")
+        self.assertLess(elapsed, RedirectingSiteHandler.body_delay)
+        print(f"------- END TEST 1 -------")
+
+    def test_02_too_many_redirects(self):
+        print(f"\n------- START TEST 2 -------")
+        # PARAMETER
+        max_redirects = 5
+        with self.assertRaises(requests.exceptions.TooManyRedirects):
+            requests_utils.follow_redirections(f"{self.base_url}/loop", timeout=5, max_redirects=max_redirects)
+        print(f"------- END TEST 2 -------")
+
+
+    def test_03_pooled_connections(self):
+        print(f"\n------- START TEST 3 -------")
+        # PARAMETER
+        probes = 3
+        RedirectingSiteHandler.requests_served.clear()
+        with requests_utils.create_pooled_session() as session:
+            for i in range(probes):
+                hops = requests_utils.follow_redirections(f"{self.base_url}/start", timeout=5, session=session)
+                self.assertEqual(3, len(hops))
+                self.assertTrue(all(map(lambda hop: hop.ip == ipaddress.IPv4Address('127.0.0.1'), hops)))
+        connections = set(map(lambda request: request[1], RedirectingSiteHandler.requests_served))
+        print(f"{len(RedirectingSiteHandler.requests_served)} requests through {len(connections)} connections")
+        # the redirections reuse the connection, which is closed only because the landing body is not downloaded
+        self.assertEqual(probes, len(connections))
+        # cookies of a probe aren't sent by the following ones
+        for path, port, cookie, host in RedirectingSiteHandler.requests_served:
+            if path == '/start':
+                self.assertIsNone(cookie)
+        self.assertEqual(0, len(session.cookies))
+        print(f"------- END TEST 3 -------")
+
+    def test_04_host_resolver(self):
+        print(f"\n------- START TEST 4 -------")
+        # PARAMETER
+        addresses = {'landing.test': ['127.0.0.2', '127.0.0.1']}       # nothing listens on the first one
+        RedirectingSiteHandler.requests_served.clear()
+        with requests_utils.create_pooled_session(host_resolver=lambda host: addresses.get(host, list())) as session:
+            hops = requests_utils.follow_redirections(f"http://landing.test:{self.local_server.port}/start", timeout=5, session=session)
+        for i, hop in enumerate(hops):
+            print(f"hop[{i+1}/{len(hops)}]: {hop}")
+        self.assertListEqual([ipaddress.IPv4Address('127.0.0.1')] * 3, list(map(lambda hop: hop.ip, hops)))
+        # the host name is still the one of the URL
+        self.assertEqual(f"landing.test:{self.local_server.port}", RedirectingSiteHandler.requests_served[0][3])
+        # the landing URL (with an IP address) is left to the OS resolver
+        self.assertEqual(f"{self.base_url}/landing", hops[-1].url)
+        print(f"------- END TEST 4 -------")
+
+if __name__ == '__main__':
+    unittest.main()
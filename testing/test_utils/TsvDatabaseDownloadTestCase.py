@@ -0,0 +1,97 @@
+import gzip
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from static_variables import INPUT_FOLDER_NAME, IP_ASN_DATABASE_NAME, IP_ASN_METADATA_NAME
+from utils import requests_utils, file_utils
+from testing.local_http_server import LocalSiteHandler, LocalHttpServer
+
+
+class TsvDatabaseHandler(LocalSiteHandler):
+    """
+    Local copy of https://iptoasn.com/ that serves a small .gz database and honours the ETag validator.
+
+    """
+    content = b'1.0.0.0\t1.0.0.255\t13335\tUS\tCLOUDFLARENET\n' * 1000
+    etag = '"v1"'
+    requests_served = list()
+
+    def do_GET(self):
+        TsvDatabaseHandler.requests_served.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == TsvDatabaseHandler.etag:
+            self.send_empty_response(304)
+            return
+        body = gzip.compress(TsvDatabaseHandler.content)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', TsvDatabaseHandler.etag)
+        self.send_header('Last-Modified', 'Mon, 19 Oct 2026 10:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TsvDatabaseDownloadTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.local_server = LocalHttpServer(TsvDatabaseHandler)
+        cls.url = f"{cls.local_server.base_url}/data/ip2asn-v4.tsv.gz"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.local_server.close()
+
+    def setUp(self) -> None:
+        self.temp_directory = tempfile.TemporaryDirectory()
+        self.project_root_directory = Path(self.temp_directory.name)
+        (self.project_root_directory / INPUT_FOLDER_NAME).mkdir()
+        self.database_file = self.project_root_directory / INPUT_FOLDER_NAME / IP_ASN_DATABASE_NAME
+        TsvDatabaseHandler.requests_served.clear()
+
+    def tearDown(self) -> None:
+        self.temp_directory.cleanup()
+
+    def test_01_download_and_conditional_request(self):
+        print(f"\n------- START TEST 1 -------")
+        self.assertFalse(file_utils.is_tsv_database_updated(project_root_directory=self.project_root_directory))
+        is_modified = requests_utils.download_latest_tsv_database(project_root_directory=self.project_root_directory, url=self.url)
+        self.assertTrue(is_modified)
+        with open(str(self.database_file), 'rb') as f:
+            self.assertEqual(TsvDatabaseHandler.content, f.read())
+        self.assertEqual(sorted([IP_ASN_DATABASE_NAME, IP_ASN_METADATA_NAME]), sorted(os.listdir(str(self.database_file.parent))))
+        self.assertTrue(file_utils.is_tsv_database_updated(project_root_directory=self.project_root_directory))
+        # second download: not modified
+        is_modified = requests_utils.download_latest_tsv_database(project_root_directory=self.project_root_directory, url=self.url)
+        self.assertFalse(is_modified)
+        self.assertEqual('"v1"', TsvDatabaseHandler.requests_served[-1].get('If-None-Match'))
+        print(f"Requests served: {len(TsvDatabaseHandler.requests_served)}")
+        print(f"------- END TEST 1 -------")
+
+    def test_02_freshness(self):
+        print(f"\n------- START TEST 2 -------")
+        requests_utils.download_latest_tsv_database(project_root_directory=self.project_root_directory, url=self.url)
+        metadata = file_utils.read_tsv_database_metadata(project_root_directory=self.project_root_directory)
+        metadata['last_checked'] = time.time() - 59 * 60
+        file_utils.write_tsv_database_metadata(metadata, project_root_directory=self.project_root_directory)
+        self.assertTrue(file_utils.is_tsv_database_updated(project_root_directory=self.project_root_directory))
+        metadata['last_checked'] = time.time() - 61 * 60
+        file_utils.write_tsv_database_metadata(metadata, project_root_directory=self.project_root_directory)
+        self.assertFalse(file_utils.is_tsv_database_updated(project_root_directory=self.project_root_directory))
+        print(f"------- END TEST 2 -------")
+
+    def test_03_background_refresh(self):
+        print(f"\n------- START TEST 3 -------")
+        with open(str(self.database_file), 'wb') as f:
+            f.write(b'previous content\n')
+        thread = requests_utils.refresh_tsv_database_in_background(project_root_directory=self.project_root_directory, url=self.url)
+        thread.join(timeout=30)
+        self.assertFalse(thread.is_alive())
+        with open(str(self.database_file), 'rb') as f:
+            self.assertEqual(TsvDatabaseHandler.content, f.read())
+        print(f"------- END TEST 3 -------")
+
+
+if __name__ == '__main__':
+    unittest.main()
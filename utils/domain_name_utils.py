@@ -41,3 +41,43 @@ def insert_trailing_point(domain_name: str) -> str:
     else:
         return domain_name+"."
 
+
+
+def canonicalize(string: str) -> str:
+    """
+    This method returns the canonical version of a string that represents a domain name in the project, which is the
+    standardized version (see standardize_for_application) with a single trailing point. Two strings that represent the
+    same domain name have the same canonical version.
+
+    :param string: A string.
+    :type string: str
+    :return: The result string.
+    :rtype: str
+    """
+    return insert_trailing_point(eliminate_trailing_point(string.strip().casefold()))
+
+
+def is_tld(string: str) -> bool:
+    """
+    This method computes if a standardized string that represents a domain name is a TLD (or the root).
+
+    :param string: A standardized string.
+    :type string: str
+    :return: True or False.
+    :rtype: bool
+    """
+    if string == '.':
+        return True
+    point_count = string.count('.')
+    if point_count == 0:
+        return True
+    elif point_count == 1:
+        split_domain_name = string.split('.')
+        if split_domain_name[0] != '' and split_domain_name[1] == '':
+            return True
+        elif split_domain_name[0] == '' and split_domain_name[1] != '':
+            return True
+        else:
+            return False
+    else:
+        return False
@@ -1,10 +1,11 @@
+import json
 import os
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import List
 from exceptions.FileWithExtensionNotFoundError import FileWithExtensionNotFoundError
 from exceptions.FilenameNotFoundError import FilenameNotFoundError
-from static_variables import INPUT_FOLDER_NAME
+from static_variables import INPUT_FOLDER_NAME, IP_ASN_METADATA_NAME
 
 
 def get_project_root_directory() -> Path:
@@ -125,12 +126,17 @@ def last_modified(path_to_file: str) -> float:
     return stat.st_mtime
 
 
-def is_tsv_database_updated(project_root_directory=Path.cwd()) -> bool:
+def is_tsv_database_updated(project_root_directory=Path.cwd(), max_age_seconds=3600) -> bool:
     """
     This method checks if the .tsv database downloaded in the input folder is updated: we consider the database
-    'updated' if it was downloaded at most one hour ago; this because in https://iptoasn.com/ it is said that the
-    database is updated hourly. It returns False even in the case that the file is absent.
+    'updated' if it was downloaded (or confirmed as not modified by the server) at most one hour ago; this because in
+    https://iptoasn.com/ it is said that the database is updated hourly. It returns False even in the case that the file
+    is absent.
 
+    :param project_root_directory: The Path object pointing at the project root directory.
+    :type project_root_directory: Path
+    :param max_age_seconds: The number of seconds after which the database is not considered updated.
+    :type max_age_seconds: int
     :return: A boolean saying if it is updated or not (or there is no file).
     :rtype: bool
     """
@@ -139,14 +145,85 @@ def is_tsv_database_updated(project_root_directory=Path.cwd()) -> bool:
     except FileWithExtensionNotFoundError:
         return False
     file = paths[0]
+    metadata = read_tsv_database_metadata(project_root_directory=project_root_directory)
+    try:
+        last_checked = float(metadata['last_checked'])
+    except (KeyError, TypeError, ValueError):
+        try:
+            last_checked = last_modified(str(file))
+        except OSError:
+            return False
+    return time.time() - last_checked < max_age_seconds
+
+
+def read_tsv_database_metadata(project_root_directory=Path.cwd()) -> dict:
+    """
+    This method reads the metadata of the .tsv database saved in the input folder: the validators sent by the server
+    (ETag and Last-Modified headers) and the last time (seconds since epoch) that the database was checked against the
+    server. It returns an empty dictionary if there are no metadata or they are not readable.
+
+    :param project_root_directory: The Path object pointing at the project root directory.
+    :type project_root_directory: Path
+    :return: The metadata.
+    :rtype: dict
+    """
+    file = set_file_in_folder(INPUT_FOLDER_NAME, IP_ASN_METADATA_NAME, project_root_directory=project_root_directory)
+    return read_json(str(file))
+
+
+def write_tsv_database_metadata(metadata: dict, project_root_directory=Path.cwd()) -> None:
+    """
+    This method writes (atomically) the metadata of the .tsv database in the input folder. See
+    read_tsv_database_metadata.
+
+    :param metadata: The metadata.
+    :type metadata: dict
+    :param project_root_directory: The Path object pointing at the project root directory.
+    :type project_root_directory: Path
+    :raise OSError: If something happened.
+    """
+    file = set_file_in_folder(INPUT_FOLDER_NAME, IP_ASN_METADATA_NAME, project_root_directory=project_root_directory)
     try:
-        ct = last_modified(str(file))
+        write_json_atomically(metadata, str(file))
     except OSError:
-        return False
-    dt = datetime.fromtimestamp(ct)
-    now = datetime.now()
-    diff_sec = (now - dt).seconds
-    if diff_sec / (60*24) >= 1:  # more than 1 hour is passed
-        return False
+        raise
+
+
+def read_json(filepath: str) -> dict:
+    """
+    This method reads a JSON object from a file. It returns an empty dictionary if the file doesn't exist, is not
+    readable or doesn't contain a JSON object.
+
+    :param filepath: The filepath.
+    :type filepath: str
+    :return: The JSON object.
+    :rtype: dict
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+            f.close()
+    except (OSError, ValueError):
+        return dict()
+    if isinstance(result, dict):
+        return result
     else:
-        return True
+        return dict()
+
+
+def write_json_atomically(data: dict, filepath: str) -> None:
+    """
+    This method writes a JSON object in a temporary file which then replaces atomically the file, so readers never see
+    a partially written file.
+
+    :param data: The JSON object.
+    :type data: dict
+    :param filepath: The filepath.
+    :type filepath: str
+    :raise OSError: If something happened.
+    """
+    temp_file = f"{filepath}.part"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.close()
+    os.replace(temp_file, filepath)
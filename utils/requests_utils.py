@@ -1,25 +1,41 @@
+import codecs
+import email.message
+import http.cookiejar
 import ipaddress
-from typing import Tuple, List
+from typing import Tuple, List, Optional
+from urllib.parse import urljoin
+from entities.PeerAddressHTTPAdapter import PeerAddressHTTPAdapter
+from entities.RedirectionHop import RedirectionHop
 from entities.SchemeUrl import SchemeUrl
+from entities.StaticScriptParser import StaticScriptParser
 from entities.Url import Url
 import os
+import shutil
+import threading
+import time
+import zlib
 from pathlib import Path
 import requests
+import urllib3
 import gzip
 from exceptions.FileWithExtensionNotFoundError import FileWithExtensionNotFoundError
-from static_variables import INPUT_FOLDER_NAME, IP_ASN_ARCHIVE_NAME
+from static_variables import INPUT_FOLDER_NAME, IP_ASN_ARCHIVE_NAME, IP_ASN_DATABASE_NAME, IP_ASN_DATABASE_URL
 from utils import file_utils
 
 
-def resolve_landing_page(url: Url, as_https=True) -> Tuple[SchemeUrl, List[str], bool, ipaddress.IPv4Address]:
+def resolve_landing_page(url: Url, as_https=True, timeout=None, session=None) -> Tuple[SchemeUrl, List[str], bool, ipaddress.IPv4Address]:
     """
     This method returns the landing page, the redirection path, the Strict Transport Security validity from an HTTP URL.
-    In particular tries a GET HTTP method from the url parameter.
+    In particular follows the redirections starting from the url parameter, see follow_redirections.
 
     :param url: An URL.
     :type url: Url
     :param as_https: A boolean setting if the url constructed from the domain name parameter uses HTTPS or HTTP.
     :type as_https: bool
+    :param timeout: The timeout (in seconds) for connecting and for each read. None means no timeout.
+    :type timeout: float or None
+    :param session: The session whose connections are reused (see create_pooled_session), or None.
+    :type session: requests.Session or None
     :raise requests.exceptions.ConnectTimeout: The request timed out while trying to connect to the remote server.
     Requests that produced this error are safe to retry.
     :raise requests.exceptions.ConnectionError: A Connection error occurred. This occurs if https is not supported by
@@ -30,61 +46,235 @@ def resolve_landing_page(url: Url, as_https=True) -> Tuple[SchemeUrl, List[str],
     :raise requests.exceptions.Timeout: The request timed out. Catching this error will catch both ConnectTimeout and
     ReadTimeout errors.
     :raise requests.exceptions.RequestException: There was an ambiguous exception that occurred while handling your
-    :return: A tuple containing the landing url, all the url redirection and the HSTS validity.
+    :return: A tuple containing the landing url, all the urls of the redirection path (landing url included), the HSTS
+    validity of the landing page and the IP address of the landing server (None if not known).
     :rtype: Tuple[SchemeUrl, List[str], bool, ipaddress.IPv4Address]
     """
-    redirection_path = list()
     if as_https:
         url_string = url.https().string
     else:
         url_string = url.http().string
     try:
-        response = requests.get(url_string, headers={'Connection': 'close'}, stream=True)
-        # tmp = response.raw._connection.sock.getsockname()
-        # tmp = response.raw._connection.sock.getpeername()
-        tmp = response.raw._fp.fp.raw._sock.getpeername()
-        ip_string = response.raw._fp.fp.raw._sock.getpeername()[0]
-        port_string = response.raw._fp.fp.raw._sock.getpeername()[1]
-        ip = ipaddress.IPv4Address(ip_string)
-    except requests.exceptions.ConnectTimeout:
-        # The request timed out while trying to connect to the remote server.
-        # Requests that produced this error are safe to retry.
-        raise
-    except requests.exceptions.ConnectionError:
-        # A Connection error occurred. This occurs if https is not supported by the server
-        raise
-    except requests.exceptions.HTTPError:
-        # An HTTP error occurred.
-        raise
-    except requests.exceptions.URLRequired:
-        # A valid URL is required to make a request.
-        raise
-    except requests.exceptions.InvalidURL:
-        raise
-    except requests.exceptions.TooManyRedirects:
-        # Too many redirects.
-        raise
-    except requests.exceptions.ReadTimeout:
-        # The server did not send any data in the allotted amount of time.
+        hops = follow_redirections(url_string, timeout=timeout, session=session)
+    except requests.exceptions.RequestException:
         raise
-    except requests.exceptions.Timeout:
-        # The request timed out. Catching this error will catch both ConnectTimeout and ReadTimeout errors.
+    landing_hop = hops[-1]
+    return SchemeUrl(landing_hop.url), list(map(lambda hop: hop.url, hops)), landing_hop.hsts is not None, landing_hop.ip
+
+
+def create_pooled_session(pool_connections=256, pool_maxsize=8, host_resolver=None) -> requests.Session:
+    """
+    This method creates a session whose connections are kept alive and pooled by host (scheme, host and port): the
+    requests towards a host already contacted reuse an idle connection, without a new TCP and TLS handshake. The
+    session records the IP address of the server of every response (see PeerAddressHTTPAdapter) and it never saves
+    cookies, so it can be shared by unrelated requests (and threads). If a host resolver is set, connections are opened
+    towards the addresses it returns instead of the ones of the OS resolver.
+
+    :param pool_connections: The number of hosts whose pool is kept (the least recently used ones are discarded).
+    :type pool_connections: int
+    :param pool_maxsize: The maximum number of idle connections kept for each host.
+    :type pool_maxsize: int
+    :param host_resolver: The function that returns the IP addresses of a host name (an empty list to use the OS
+    resolver), or None.
+    :type host_resolver: Callable[[str], List[str]] or None
+    :return: The session.
+    :rtype: requests.Session
+    """
+    session = requests.Session()
+    adapter = PeerAddressHTTPAdapter(host_resolver=host_resolver, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def follow_redirections(url_string: str, timeout=None, max_redirects=30, session=None, max_drained_body_length=8192) -> List[RedirectionHop]:
+    """
+    This method follows the redirections starting from the url parameter, one request (HTTP GET) at a time, and records
+    every hop: URL, status code, IP address of the server and Strict-Transport-Security header. Responses are streamed
+    and released as soon as the headers are received: the connection goes back to the pool of the session if the
+    response has no body or it is a redirection with a short body (which is read and discarded), otherwise it is
+    closed, so bodies of the pages are never downloaded. Cookies set during the path are sent to the following hops, as
+    a browser does, but they aren't kept after the path.
+
+    :param url_string: The starting URL (with scheme).
+    :type url_string: str
+    :param timeout: The timeout (in seconds) for connecting and for each read. None means no timeout.
+    :type timeout: float or None
+    :param max_redirects: The maximum number of redirections followed.
+    :type max_redirects: int
+    :param session: The session (see create_pooled_session) whose connections are reused. If None, a new session is
+    used only for this path.
+    :type session: requests.Session or None
+    :param max_drained_body_length: The maximum length (in bytes) of the body of a redirection that is read to keep the
+    connection alive.
+    :type max_drained_body_length: int
+    :raise requests.exceptions.TooManyRedirects: If the redirections are more than max_redirects.
+    :raise requests.exceptions.RequestException: If a request fails (see resolve_landing_page).
+    :return: The hops, from the starting URL to the landing one.
+    :rtype: List[RedirectionHop]
+    """
+    if session is None:
+        with create_pooled_session(pool_connections=1, pool_maxsize=1) as temporary_session:
+            return follow_redirections(url_string, timeout=timeout, max_redirects=max_redirects, session=temporary_session, max_drained_body_length=max_drained_body_length)
+    hops = list()
+    cookies = requests.cookies.RequestsCookieJar()
+    current_url = url_string
+    while True:
+        try:
+            hop = probe_hop(current_url, session, timeout=timeout, cookies=cookies, max_drained_body_length=max_drained_body_length)
+        except requests.exceptions.RequestException:
+            raise
+        hops.append(hop)
+        if not hop.is_redirection():
+            return hops
+        if len(hops) > max_redirects:
+            raise requests.exceptions.TooManyRedirects(f"Exceeded {max_redirects} redirects.")
+        current_url = hop.location
+
+
+def probe_hop(url_string: str, session: requests.Session, timeout=None, cookies=None, max_drained_body_length=8192) -> RedirectionHop:
+    """
+    This method executes a single HTTP GET request, without following its redirection, and returns the hop. The body
+    is never downloaded (see release_without_body).
+
+    :param url_string: The URL (with scheme).
+    :type url_string: str
+    :param session: The session (see create_pooled_session) whose connections are reused.
+    :type session: requests.Session
+    :param timeout: The timeout (in seconds) for connecting and for each read. None means no timeout.
+    :type timeout: float or None
+    :param cookies: The cookies sent with the request, which is updated with the ones set by the response.
+    :type cookies: requests.cookies.RequestsCookieJar or None
+    :param max_drained_body_length: The maximum length (in bytes) of the body of a redirection that is read to keep the
+    connection alive.
+    :type max_drained_body_length: int
+    :raise requests.exceptions.RequestException: If the request fails (see resolve_landing_page).
+    :return: The hop.
+    :rtype: RedirectionHop
+    """
+    try:
+        response = session.get(url_string, cookies=cookies, stream=True, allow_redirects=False, timeout=timeout)
+    except requests.exceptions.RequestException:
         raise
+    location = None
+    try:
+        target = session.get_redirect_target(response)
+        location = requests.utils.requote_uri(urljoin(url_string, target)) if target is not None else None
+        if cookies is not None:
+            cookies.update(response.cookies)
+        return RedirectionHop(url_string, response.status_code, get_peer_ip(response), response.headers.get('strict-transport-security'), location)
+    finally:
+        release_without_body(response, max_drained_body_length=max_drained_body_length if location is not None else 0)
+
+
+def release_without_body(response: requests.Response, max_drained_body_length=0) -> None:
+    """
+    This method releases the connection of a streamed response whose body is not wanted. If the body is already
+    complete (e.g. there's no body) or its declared length is at most max_drained_body_length bytes, the body is read
+    and discarded and the connection goes back to the pool to be reused; otherwise the connection is closed.
+
+    :param response: A streamed response.
+    :type response: requests.Response
+    :param max_drained_body_length: The maximum length (in bytes) of the body that is read to keep the connection.
+    :type max_drained_body_length: int
+    """
+    raw = response.raw
+    try:
+        content_length = int(response.headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        content_length = None
+    if content_length is not None and content_length <= max_drained_body_length:
+        try:
+            raw.read(decode_content=False)
+            raw.release_conn()
+            return
+        except (urllib3.exceptions.HTTPError, OSError):
+            pass
+    response.close()
+
+
+def parse_static_html(url_string: str, session: requests.Session, timeout=None, max_body_length=1 << 22, chunk_size=1 << 16) -> StaticScriptParser:
+    """
+    This method downloads the HTML of a page (without following redirections) and parses it while it is received, so
+    the page is never kept in memory as a whole (see StaticScriptParser). The page is decoded with the charset of the
+    Content-Type header, UTF-8 if there is none.
+
+    :param url_string: The URL (with scheme) of the page.
+    :type url_string: str
+    :param session: The session (see create_pooled_session) whose connections are reused.
+    :type session: requests.Session
+    :param timeout: The timeout (in seconds) for connecting and for each read. None means no timeout.
+    :type timeout: float or None
+    :param max_body_length: The maximum length (in bytes) of the page.
+    :type max_body_length: int
+    :param chunk_size: The size (in bytes) of every chunk read.
+    :type chunk_size: int
+    :raise requests.exceptions.RequestException: If the request fails (see resolve_landing_page).
+    :raise ValueError: If the response is not a page (status code other than 200 or not an HTML content) or the page
+    is longer than max_body_length.
+    :return: The parser, after the whole page is parsed.
+    :rtype: StaticScriptParser
+    """
+    try:
+        response = session.get(url_string, headers={'Accept': 'text/html'}, stream=True, allow_redirects=False, timeout=timeout)
     except requests.exceptions.RequestException:
-        # There was an ambiguous exception that occurred while handling your request.
         raise
-    if response.headers.get('strict-transport-security') is not None:
-        hsts = True
-    else:
-        hsts = False
-    redirection_path.append(response.url)  # final page
-    landing_url = SchemeUrl(response.url)
-    return landing_url, redirection_path, hsts, ip
+    with response:
+        if response.status_code != 200:
+            raise ValueError(f"Status code {response.status_code} for page: {url_string}")
+        content_type = response.headers.get('Content-Type', '')
+        if 'html' not in content_type.lower():
+            raise ValueError(f"Content type '{content_type}' for page: {url_string}")
+        parser = StaticScriptParser(url_string)
+        # requests falls back to ISO-8859-1 for text types without charset, while HTML pages are mostly UTF-8
+        headers = email.message.Message()
+        headers['Content-Type'] = content_type
+        try:
+            decoder = codecs.getincrementaldecoder(headers.get_content_charset() or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        body_length = 0
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                body_length = body_length + len(chunk)
+                if body_length > max_body_length:
+                    raise ValueError(f"Page longer than {max_body_length} bytes: {url_string}")
+                parser.feed(decoder.decode(chunk))
+        except requests.exceptions.RequestException:
+            raise
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+        return parser
+
 
+def get_peer_ip(response: requests.Response) -> Optional[ipaddress.IPv4Address]:
+    """
+    This method returns the IP address of the server that sent the response parameter. The response must be obtained
+    through a session that mounts a PeerAddressHTTPAdapter.
 
-def download_latest_tsv_database(project_root_directory=Path.cwd()) -> None:
+    :param response: A response.
+    :type response: requests.Response
+    :return: The IP address of the server, or None if it is not known (or it is an IPv6 address).
+    :rtype: Optional[ipaddress.IPv4Address]
     """
-    Download the .tsv database from the site, extract it and finally delete the archive. Everything in the input folder.
+    peer_address = getattr(response.raw, 'peer_address', None)
+    if peer_address is None:
+        return None
+    try:
+        return ipaddress.IPv4Address(peer_address[0])
+    except ValueError:
+        return None
+
+
+def download_latest_tsv_database(project_root_directory=Path.cwd(), url=IP_ASN_DATABASE_URL, timeout=60, chunk_size=1 << 16) -> bool:
+    """
+    Download the .tsv database from the site and extract it in the input folder. The archive is streamed and
+    decompressed chunk by chunk in a temporary file, which then replaces atomically the current database: the archive is
+    never saved and the content is never entirely in memory.
+    The request is conditional: if the validators (ETag and Last-Modified headers) of the previous download are known
+    and the server answers that the database is not modified, nothing is downloaded. In both cases the last check time
+    is saved in the metadata of the database (see file_utils.read_tsv_database_metadata).
     Path.cwd() returns the current working directory which depends upon the entry point of the application; in
     particular, if we start the application from the main.py file in the PRD, every time Path.cwd() is encountered
     (even in methods belonging to files that are in sub-folders with respect to PRD) then the actual PRD is
@@ -94,19 +284,87 @@ def download_latest_tsv_database(project_root_directory=Path.cwd()) -> None:
 
     :param project_root_directory: The Path object pointing at the project root directory.
     :type project_root_directory: Path
+    :param url: The URL of the .gz archive of the database.
+    :type url: str
+    :param timeout: The timeout (seconds) for connecting and for each read.
+    :type timeout: int
+    :param chunk_size: The number of bytes of each chunk read.
+    :type chunk_size: int
+    :raise requests.exceptions.RequestException: If the download went wrong.
+    :raise zlib.error: If the archive is corrupted.
+    :raise OSError: If the files can't be written.
+    :return: True if a new database was downloaded, False if the current one is not modified.
+    :rtype: bool
     """
-    url = 'https://iptoasn.com/data/ip2asn-v4.tsv.gz'
-    r = requests.get(url, allow_redirects=True)
-    with open(f"{str(project_root_directory)}{os.sep}{INPUT_FOLDER_NAME}{os.sep}{IP_ASN_ARCHIVE_NAME}", 'wb') as d:
-        d.write(r.content)
-        d.close()
-        extract_gz_archive(project_root_directory=project_root_directory)
+    file = file_utils.set_file_in_folder(INPUT_FOLDER_NAME, IP_ASN_DATABASE_NAME, project_root_directory=project_root_directory)
+    metadata = file_utils.read_tsv_database_metadata(project_root_directory=project_root_directory)
+    headers = dict()
+    if file.exists():
+        if metadata.get('etag') is not None:
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified') is not None:
+            headers['If-Modified-Since'] = metadata['last_modified']
+    with requests.get(url, headers=headers, stream=True, allow_redirects=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            metadata['last_checked'] = time.time()
+            file_utils.write_tsv_database_metadata(metadata, project_root_directory=project_root_directory)
+            return False
+        response.raise_for_status()
+        temp_file = f"{str(file)}.part"
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)     # gzip header
+        try:
+            with open(temp_file, 'wb') as f:
+                for chunk in response.raw.stream(chunk_size, decode_content=False):
+                    f.write(decompressor.decompress(chunk))
+                f.write(decompressor.flush())
+                f.close()
+            if not decompressor.eof:
+                raise zlib.error('Truncated .gz archive.')
+            os.replace(temp_file, str(file))
+        except BaseException:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+        metadata = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'last_checked': time.time()
+        }
+    file_utils.write_tsv_database_metadata(metadata, project_root_directory=project_root_directory)
+    return True
+
+
+def refresh_tsv_database_in_background(project_root_directory=Path.cwd(), url=IP_ASN_DATABASE_URL) -> threading.Thread:
+    """
+    Starts (in a daemon thread) the download of the .tsv database, see download_latest_tsv_database. Meanwhile the
+    current database can be used: it is replaced atomically only at the end of the download. Errors are printed and
+    otherwise ignored.
+
+    :param project_root_directory: The Path object pointing at the project root directory.
+    :type project_root_directory: Path
+    :param url: The URL of the .gz archive of the database.
+    :type url: str
+    :return: The started thread.
+    :rtype: threading.Thread
+    """
+    def refresh():
+        try:
+            download_latest_tsv_database(project_root_directory=project_root_directory, url=url)
+        except (requests.exceptions.RequestException, zlib.error, OSError) as e:
+            print(f"!!! Background refresh of the .tsv database failed: {str(e)} !!!")
+
+    thread = threading.Thread(target=refresh, name='tsv-database-refresh', daemon=True)
+    thread.start()
+    return thread
 
 
 def extract_gz_archive(project_root_directory=Path.cwd()) -> None:
     """
     Extract the first .gz archive found in the input folder.
-    Then it deletes the archive.
+    Then it deletes the archive. The archive is extracted chunk by chunk in a temporary file, which then replaces
+    atomically the extracted file.
     Path.cwd() returns the current working directory which depends upon the entry point of the application; in
     particular, if we start the application from the main.py file in the PRD, every time Path.cwd() is encountered
     (even in methods belonging to files that are in sub-folders with respect to PRD) then the actual PRD is
@@ -124,11 +382,11 @@ def extract_gz_archive(project_root_directory=Path.cwd()) -> None:
         raise
     archive = result[0]
     file = file_utils.set_file_in_folder(INPUT_FOLDER_NAME, file_archive_extracted_name, project_root_directory=project_root_directory)
-    file_content = None
+    temp_file = f"{str(file)}.part"
     with gzip.open(f"{str(archive)}", 'rb') as ar:
-        file_content = ar.read()        # if content is very large, lots of RAM is occupied
+        with open(temp_file, 'wb') as f:
+            shutil.copyfileobj(ar, f)
+            f.close()
         ar.close()
-    with open(f"{str(file)}", 'wb') as f:
-        f.write(file_content)
-        f.close()
-        archive.unlink()
+    os.replace(temp_file, str(file))
+    archive.unlink()